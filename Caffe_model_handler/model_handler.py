@@ -7,9 +7,13 @@ openCV version: 4.7.12
 """
 import argparse
 import logging
+import os
 
 import cv2
 
+from Caffe_model_handler.model_tuner import DEFAULT_DNN_SETTINGS, \
+    DNN_BACKENDS, DNN_TARGETS, load_tuning
+
 
 # pylint: disable=R0903, W0703, I1101
 class CaffeModelHandler:
@@ -32,6 +36,9 @@ class CaffeModelHandler:
             # protected attribute in which will be loaded serialized
             # model from disk
             self._net: cv2.dnn_Net = cv2.dnn_Net()
+            # protected attribute holding network settings - backend,
+            # target, thread count and input size
+            self._dnn_settings: dict = dict(DEFAULT_DNN_SETTINGS)
             # protected attribute which initializes list of class labels
             # MobileNet was trained to detect
             self._classes_of_interest: list = ["background", "aeroplane",
@@ -46,13 +53,16 @@ class CaffeModelHandler:
             logging.error("Error occurred during CaffeModelHandler"
                           " object instantiation")
 
-    def _add_parsers(self) -> None:
+    def _add_parsers(self, argv: list = None) -> None:
         """
+            :param argv: list, command line arguments, sys.argv is
+            used when they are not given
             :return None
 
             @brief
-            Protected class method in which command line arguments are added and
-            parsed. They are added to arguments dictionary as well.
+            Protected class method in which command line arguments are
+            added and parsed. They are added to arguments dictionary as
+            well.
         """
         try:
             # constructing the argument parse and parse arguments
@@ -73,13 +83,279 @@ class CaffeModelHandler:
                                                              " probability"
                                                              " to filter weak "
                                                              "detections")
-            self.__arg_parser.add_argument('-s', '--source',
+            self.__arg_parser.add_argument('-s', '--source', nargs='+',
                                            help="Source of video stream "
-                                                "(webcam/host)")
-            self._arguments = vars(self.__arg_parser.parse_args())
+                                                "(webcam/host), several "
+                                                "sources share one loaded "
+                                                "network")
+            self.__arg_parser.add_argument('--classes', nargs='+',
+                                           help="class names to be "
+                                                "reported, all classes "
+                                                "are reported by default")
+            self.__arg_parser.add_argument('--batch-size', type=int,
+                                           default=1,
+                                           help="number of frames passed "
+                                                "through the network in "
+                                                "a single forward pass")
+            self.__arg_parser.add_argument('--detect-every', type=int,
+                                           default=1,
+                                           help="pass every N-th frame "
+                                                "through the network and "
+                                                "track objects in between")
+            self.__arg_parser.add_argument('--adaptive-detection',
+                                           action='store_true',
+                                           help="adapt detection interval "
+                                                "to inference time, "
+                                                "--detect-every is the "
+                                                "maximum interval")
+            self.__arg_parser.add_argument('--target-fps', type=float,
+                                           default=20.0,
+                                           help="frame rate the adaptive "
+                                                "detection interval "
+                                                "aims for")
+            self.__arg_parser.add_argument('--motion-gate',
+                                           action='store_true',
+                                           help="reuse previous detections "
+                                                "for frames without "
+                                                "activity")
+            self.__arg_parser.add_argument('--motion-threshold', type=float,
+                                           default=0.01,
+                                           help="minimum fraction of "
+                                                "changed pixels for a "
+                                                "frame with activity")
+            self.__arg_parser.add_argument('--latency-export-interval',
+                                           type=float, default=5.0,
+                                           help="seconds between exports "
+                                                "of stage latency "
+                                                "percentiles, 0 exports "
+                                                "only at the end")
+            self.__arg_parser.add_argument('--headless', action='store_true',
+                                           help="do not show frames, stop "
+                                                "on SIGINT/SIGTERM or "
+                                                "frame/duration limit")
+            self.__arg_parser.add_argument('--max-frames', type=int,
+                                           help="stop after given number "
+                                                "of processed frames")
+            self.__arg_parser.add_argument('--max-duration', type=float,
+                                           help="stop after given number "
+                                                "of seconds")
+            self.__arg_parser.add_argument('--no-blur', action='store_true',
+                                           help="do not blur network input "
+                                                "before inference")
+            self.__arg_parser.add_argument('--annotation-width', type=int,
+                                           help="width of annotated and "
+                                                "saved frames, frames keep "
+                                                "full resolution by default")
+            self.__arg_parser.add_argument('--schedule',
+                                           choices=('round-robin',
+                                                    'deadline'),
+                                           default='round-robin',
+                                           help="order in which frames of "
+                                                "several sources are "
+                                                "batched for inference")
+            self.__arg_parser.add_argument('--deadline', type=float,
+                                           default=0.1,
+                                           help="seconds in which frames "
+                                                "of several sources should "
+                                                "be passed through the "
+                                                "network")
+            self.__arg_parser.add_argument('--latency-budget', type=float,
+                                           help="maximum age in seconds of "
+                                                "a frame of live source "
+                                                "passed through the "
+                                                "network, older frames are "
+                                                "dropped and cameras keep "
+                                                "only the latest frame")
+            self.__arg_parser.add_argument('--segment-duration',
+                                           type=float,
+                                           help="maximum duration of saved "
+                                                "video segment in seconds")
+            self.__arg_parser.add_argument('--segment-size', type=float,
+                                           help="maximum size of saved "
+                                                "video segment in MB")
+            self.__arg_parser.add_argument('--record-detections-only',
+                                           action='store_true',
+                                           help="save video only around "
+                                                "frames with detections")
+            self.__arg_parser.add_argument('--pre-roll', type=float,
+                                           default=2.0,
+                                           help="seconds of video saved "
+                                                "before the first frame "
+                                                "with detections")
+            self.__arg_parser.add_argument('--post-roll', type=float,
+                                           default=2.0,
+                                           help="seconds of video saved "
+                                                "after the last frame "
+                                                "with detections")
+            self.__arg_parser.add_argument('--start-frame', type=int,
+                                           default=0,
+                                           help="index of the first "
+                                                "processed frame of video "
+                                                "file or image files")
+            self.__arg_parser.add_argument('--end-frame', type=int,
+                                           help="index after the last "
+                                                "processed frame of video "
+                                                "file or image files")
+            self.__arg_parser.add_argument('--capture-process', type=int,
+                                           default=0, metavar='RING_SLOTS',
+                                           help="capture frames in a "
+                                                "separate process passing "
+                                                "them through shared memory "
+                                                "ring with given number of "
+                                                "slots")
+            self.__arg_parser.add_argument('--no-histograms',
+                                           action='store_true',
+                                           help="do not store RGB "
+                                                "histograms of frames with "
+                                                "detections")
+            self.__arg_parser.add_argument('--backend',
+                                           choices=sorted(DNN_BACKENDS),
+                                           help="DNN backend, tuned or "
+                                                "default backend is used "
+                                                "when it is not given")
+            self.__arg_parser.add_argument('--target',
+                                           choices=sorted(DNN_TARGETS),
+                                           help="DNN target device, tuned "
+                                                "or CPU target is used "
+                                                "when it is not given")
+            self.__arg_parser.add_argument('--threads', type=int,
+                                           help="number of OpenCV threads")
+            self.__arg_parser.add_argument('--input-size', type=int,
+                                           nargs=2,
+                                           metavar=('WIDTH', 'HEIGHT'),
+                                           help="network input size, "
+                                                "300 x 300 by default")
+            self.__arg_parser.add_argument('--autotune', action='store_true',
+                                           help="benchmark available "
+                                                "backends, targets and "
+                                                "thread counts on sample "
+                                                "frames and save the "
+                                                "fastest settings")
+            self.__arg_parser.add_argument('--autotune-frames', type=int,
+                                           default=30,
+                                           help="number of sample frames "
+                                                "used by --autotune")
+            self.__arg_parser.add_argument('--tuning-file',
+                                           help="file tuned network "
+                                                "settings are saved in "
+                                                "and loaded from, "
+                                                "dnn_tuning.json next to "
+                                                "the model by default")
+            self.__arg_parser.add_argument('--tiles', type=int, nargs=2,
+                                           metavar=('COLUMNS', 'ROWS'),
+                                           help="detect also in given "
+                                                "number of overlapping "
+                                                "tiles of every frame")
+            self.__arg_parser.add_argument('--tile-overlap', type=float,
+                                           default=0.2,
+                                           help="overlap of neighbouring "
+                                                "tiles as fraction of "
+                                                "tile size")
+            self.__arg_parser.add_argument('--nms-threshold', type=float,
+                                           default=0.45,
+                                           help="IoU above which boxes of "
+                                                "the same class found in "
+                                                "several tiles are merged")
+            self.__arg_parser.add_argument('--roi-file',
+                                           help="JSON file with regions "
+                                                "of interest of sources, "
+                                                "only they are passed "
+                                                "through the network")
+            self.__arg_parser.add_argument('--no-video', action='store_true',
+                                           help="do not save annotated "
+                                                "video")
+            self.__arg_parser.add_argument('--serve-port', type=int,
+                                           metavar='PORT',
+                                           help="serve annotated frames as "
+                                                "MJPEG and detections as "
+                                                "NDJSON or server-sent "
+                                                "events over HTTP on given "
+                                                "port")
+            self.__arg_parser.add_argument('--serve-host',
+                                           default='127.0.0.1',
+                                           help="address the result server "
+                                                "listens on")
+            self.__arg_parser.add_argument('--jpeg-quality', type=int,
+                                           default=80,
+                                           help="JPEG quality of served "
+                                                "frames 0-100")
+            self.__arg_parser.add_argument('--pipelined', action='store_true',
+                                           help="run grabbing, inference, "
+                                                "annotation and output "
+                                                "stages in separate threads")
+            self.__arg_parser.add_argument('--queue-size', type=int,
+                                           default=4,
+                                           help="maximum number of frames "
+                                                "waiting between two "
+                                                "pipeline stages")
+            self._arguments = vars(self.__arg_parser.parse_args(argv))
+            self.__check_ring_slots()
+            self.__resolve_dnn_settings()
         except Exception:
             logging.error("Error occurred during parsing arguments")
 
+    def __check_ring_slots(self) -> None:
+        """
+            :return None
+
+            @brief
+            Private class method in which number of shared frame ring
+            slots is raised to hold a batch, the frames queued between
+            pipeline stages and the frame being recorded, so capture
+            process does not wait for free slots every batch
+        """
+        ring_slots: int = self._arguments.get("capture_process", 0)
+        minimum_slots: int = max(1, self._arguments.get("batch_size", 1)) + \
+            max(1, self._arguments.get("queue_size", 4)) + 1
+        if 0 < ring_slots < minimum_slots:
+            logging.warning("--capture-process %d is raised to %d ring "
+                            "slots for --batch-size and --queue-size",
+                            ring_slots, minimum_slots)
+            self._arguments["capture_process"] = minimum_slots
+
+    def __resolve_dnn_settings(self) -> None:
+        """
+            :return None
+
+            @brief
+            Private class method in which network settings are resolved,
+            settings given on command line take precedence over settings
+            saved by --autotune, which take precedence over defaults
+        """
+        self._dnn_settings = dict(DEFAULT_DNN_SETTINGS)
+        if not self._arguments.get("tuning_file"):
+            # tuning file belongs to the model, not to working directory
+            self._arguments["tuning_file"] = os.path.join(
+                os.path.dirname(os.path.abspath(self._arguments["model"])),
+                'dnn_tuning.json')
+        if not self._arguments.get("autotune"):
+            tuned_settings: dict = load_tuning(
+                self._arguments["tuning_file"], self._arguments["model"])
+            if tuned_settings:
+                logging.info("Using tuned network settings %s from %s",
+                             tuned_settings, self._arguments["tuning_file"])
+                self._dnn_settings.update(tuned_settings)
+        for key in DEFAULT_DNN_SETTINGS:
+            if self._arguments.get(key) is not None:
+                self._dnn_settings[key] = self._arguments[key]
+
+    def _apply_dnn_settings(self, settings: dict) -> None:
+        """
+            :param settings: dict, network settings
+            :return None
+
+            @brief
+            Protected class method in which backend and target of loaded
+            network and number of OpenCV threads are set
+        """
+        self._dnn_settings = dict(self._dnn_settings, **settings)
+        self._net.setPreferableBackend(
+            DNN_BACKENDS[self._dnn_settings["backend"]])
+        self._net.setPreferableTarget(
+            DNN_TARGETS[self._dnn_settings["target"]])
+        if self._dnn_settings["threads"]:
+            cv2.setNumThreads(self._dnn_settings["threads"])
+
     def _load_serial_model(self) -> bool:
         """
             :return bool
@@ -92,6 +368,7 @@ class CaffeModelHandler:
         try:
             self._net: cv2.dnn_Net = cv2.dnn.readNetFromCaffe \
                 (self._arguments["prototxt"], self._arguments["model"])
+            self._apply_dnn_settings(self._dnn_settings)
             return True
         except cv2.error:
             logging.error("Error occurred during loading serial model")
@@ -0,0 +1,181 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import json
+import logging
+import os
+import time
+
+import cv2
+import numpy
+
+# DNN backends selectable by name
+DNN_BACKENDS: dict = {
+    "default": cv2.dnn.DNN_BACKEND_DEFAULT,
+    "opencv": cv2.dnn.DNN_BACKEND_OPENCV,
+    "openvino": cv2.dnn.DNN_BACKEND_INFERENCE_ENGINE,
+    "cuda": cv2.dnn.DNN_BACKEND_CUDA,
+    "vulkan": cv2.dnn.DNN_BACKEND_VKCOM,
+}
+
+# DNN targets selectable by name
+DNN_TARGETS: dict = {
+    "cpu": cv2.dnn.DNN_TARGET_CPU,
+    "opencl": cv2.dnn.DNN_TARGET_OPENCL,
+    "opencl-fp16": cv2.dnn.DNN_TARGET_OPENCL_FP16,
+    "myriad": cv2.dnn.DNN_TARGET_MYRIAD,
+    "vulkan": cv2.dnn.DNN_TARGET_VULKAN,
+    "cuda": cv2.dnn.DNN_TARGET_CUDA,
+    "cuda-fp16": cv2.dnn.DNN_TARGET_CUDA_FP16,
+}
+
+# network settings used when they are neither given nor tuned
+DEFAULT_DNN_SETTINGS: dict = {"backend": "default", "target": "cpu",
+                              "threads": None, "input_size": [300, 300]}
+
+
+def candidate_settings(input_size: list) -> list:
+    """"
+        :param input_size: list, network input width and height
+        :return list of dict
+
+        @brief Public function which returns network settings worth
+        benchmarking on this machine - every backend and target pair
+        reported as available by OpenCV combined with thread counts
+        of powers of two up to the number of CPUs. Input size is kept,
+        it trades accuracy for speed, so the smallest one would always
+        win.
+    """
+    cpu_count: int = os.cpu_count() or 1
+    thread_counts: list = sorted({min(2 ** power, cpu_count)
+                                  for power in range(cpu_count.bit_length())}
+                                 | {cpu_count})
+    target_names: dict = {target: name
+                          for name, target in DNN_TARGETS.items()}
+
+    candidates: list = []
+    for backend_name, backend in DNN_BACKENDS.items():
+        if backend_name == "default":
+            # default backend is one of the listed backends
+            continue
+        try:
+            targets: tuple = tuple(cv2.dnn.getAvailableTargets(backend))
+        except cv2.error:
+            continue
+        for target in targets:
+            if target not in target_names:
+                continue
+            candidates.extend({"backend": backend_name,
+                               "target": target_names[target],
+                               "threads": threads,
+                               "input_size": list(input_size)}
+                              for threads in thread_counts)
+
+    return candidates
+
+
+def tune_model(model, frames: list, candidates: list, batch_size: int = 1,
+               repeat: int = 3) -> tuple:
+    """"
+        :param model: ImageProcessing, object with loaded network ;
+        :param frames: list, sample frames ;
+        :param candidates: list, network settings to be benchmarked ;
+        :param batch_size: int, number of frames in one forward pass ;
+        :param repeat: int, number of passes over sample frames
+        :return tuple of the fastest settings dict and list of timings
+
+        @brief Public function in which sample frames are passed through
+        the network with every candidate settings after a warm-up pass,
+        median time per frame of the passes is compared. Settings which
+        fail are skipped. The fastest settings are left applied.
+    """
+    timings: list = []
+    for settings in candidates:
+        try:
+            model._apply_dnn_settings(settings)
+            model._warm_up_model(batch_size)
+            pass_times: list = []
+            for _ in range(max(1, repeat)):
+                start_time: float = time.perf_counter()
+                for start in range(0, len(frames), batch_size):
+                    detections: list = model._get_batch_detections(
+                        frames[start:start + batch_size])
+                    if any(item is None for item in detections):
+                        raise RuntimeError("forward pass failed")
+                pass_times.append((time.perf_counter() - start_time) /
+                                  len(frames))
+            timings.append(dict(settings, frame_ms=round(
+                float(numpy.median(pass_times)) * 1000, 3)))
+            logging.info("Tuning %s: %.3f ms per frame", settings,
+                         timings[-1]["frame_ms"])
+        except Exception:
+            logging.warning("Network settings %s are not usable", settings)
+
+    if not timings:
+        return None, timings
+
+    fastest: dict = min(timings, key=lambda timing: timing["frame_ms"])
+    best: dict = {key: fastest[key] for key in DEFAULT_DNN_SETTINGS}
+    model._apply_dnn_settings(best)
+
+    return best, timings
+
+
+def save_tuning(file_name: str, settings: dict, timings: list,
+                model_file: str = None) -> None:
+    """"
+        :param file_name: str, path of tuning file ;
+        :param settings: dict, the fastest network settings ;
+        :param timings: list, benchmarked settings with their timings ;
+        :param model_file: str, path of the tuned model
+        :return None
+
+        @brief Public function in which tuned settings are saved together
+        with the model, OpenCV version and number of CPUs they were
+        measured with
+    """
+    try:
+        with open(file_name, 'w') as tuning_file:
+            json.dump({"model": None if model_file is None else
+                       os.path.abspath(model_file),
+                       "opencv_version": cv2.__version__,
+                       "cpu_count": os.cpu_count(),
+                       "settings": settings,
+                       "timings": timings}, tuning_file, indent=2)
+    except IOError:
+        logging.error("IOError occurred during saving tuning file")
+
+
+def load_tuning(file_name: str, model_file: str = None) -> dict:
+    """"
+        :param file_name: str, path of tuning file ;
+        :param model_file: str, path of the loaded model
+        :return dict
+
+        @brief Public function which returns tuned network settings, None
+        is returned when file does not exist or it was measured with
+        another model, OpenCV version or number of CPUs
+    """
+    if not file_name or not os.path.isfile(file_name):
+        return None
+
+    try:
+        with open(file_name) as tuning_file:
+            tuning: dict = json.load(tuning_file)
+    except (IOError, ValueError):
+        logging.error("Error occurred during reading tuning file")
+        return None
+
+    if (model_file is not None and
+            tuning.get("model") != os.path.abspath(model_file)) or \
+            tuning.get("opencv_version") != cv2.__version__ or \
+            tuning.get("cpu_count") != os.cpu_count():
+        logging.warning("Tuning file %s was measured on another setup, "
+                        "run --autotune again", file_name)
+        return None
+
+    return tuning.get("settings")
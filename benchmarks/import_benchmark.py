@@ -0,0 +1,118 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# measured entry points: name -> imported module
+ENTRY_POINTS: dict = {
+    "cv2_numpy": "cv2, numpy",
+    "detect_only": "detect_run",
+    "object_recognition": "rt_object_recognition_run",
+}
+
+# modules the detect only entry point must not import
+FORBIDDEN_MODULES: tuple = ('matplotlib', 'imutils', 'multiprocessing',
+                            'report_handlers.histogram_handler',
+                            'report_handlers.csv_report_handler',
+                            'image_and_video_prosessors.result_server')
+
+# code run in a fresh interpreter, it prints import time in
+# milliseconds and names of imported forbidden modules as JSON
+MEASUREMENT_CODE: str = """
+import json, sys, time
+start_time = time.perf_counter()
+import {modules}
+import_ms = (time.perf_counter() - start_time) * 1000
+print(json.dumps({{"import_ms": import_ms, "forbidden": sorted(
+    name for name in sys.modules
+    if name.split('.')[0] in {forbidden} or name in {forbidden})}}))
+"""
+
+
+def measure_import(modules: str, repeat: int) -> dict:
+    """"
+        :param modules: str, comma separated imported modules ;
+        :param repeat: int, number of measurements
+        :return dict
+
+        @brief Public function in which modules are imported in fresh
+        interpreters, every measurement pays the whole import cost, and
+        median import time is returned together with imported forbidden
+        modules
+    """
+    code: str = MEASUREMENT_CODE.format(modules=modules,
+                                        forbidden=repr(FORBIDDEN_MODULES))
+    root_dir: str = os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__)))
+    measurements: list = []
+    for _ in range(max(1, repeat)):
+        output: str = subprocess.run(
+            [sys.executable, '-c', code], cwd=root_dir, check=True,
+            stdout=subprocess.PIPE, universal_newlines=True).stdout
+        measurements.append(json.loads(output.splitlines()[-1]))
+
+    return {"import_ms": round(statistics.median(
+                measurement["import_ms"] for measurement in measurements), 1),
+            "forbidden_modules": measurements[-1]["forbidden"]}
+
+
+def import_benchmark_main() -> int:
+    """"
+        :return int, exit code
+
+        @ brief
+        Public method in which import time of entry points is measured
+        and detect only entry point is checked against import time
+        budget above the cost of cv2 and numpy, which every entry point
+        pays, and against importing modules it does not need
+    """
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    arg_parser.add_argument('--repeat', type=int, default=5,
+                            help="number of measurements of every "
+                                 "entry point")
+    arg_parser.add_argument('--budget', type=float, default=50.0,
+                            help="allowed import time of detect only "
+                                 "entry point in ms above cv2 and numpy")
+    arg_parser.add_argument('-o', '--output',
+                            help="path of results JSON file")
+    arguments: dict = vars(arg_parser.parse_args())
+
+    results: dict = {}
+    for name, modules in ENTRY_POINTS.items():
+        results[name] = measure_import(modules, arguments["repeat"])
+        print("{:<20} {:>8.1f} ms".format(name, results[name]["import_ms"]))
+
+    overhead: float = results["detect_only"]["import_ms"] - \
+        results["cv2_numpy"]["import_ms"]
+    violations: list = []
+    if overhead > arguments["budget"]:
+        violations.append("detect_only imports {:.1f} ms above cv2 and "
+                          "numpy, budget {:.1f} ms".format(
+                              overhead, arguments["budget"]))
+    if results["detect_only"]["forbidden_modules"]:
+        violations.append("detect_only imports " + ", ".join(
+            results["detect_only"]["forbidden_modules"]))
+
+    if arguments["output"]:
+        with open(arguments["output"], 'w') as output_json:
+            json.dump({"budget_ms": arguments["budget"],
+                       "entry_points": results,
+                       "violations": violations}, output_json, indent=2)
+
+    for violation in violations:
+        print("Budget exceeded: " + violation)
+
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(import_benchmark_main())
@@ -0,0 +1,271 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy
+
+from benchmarks.stand_in_network import StandInNetwork
+from object_recognition_processing.object_recognition_processor import \
+    ObjectRecognition
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# benchmarked configurations: name -> additional command line arguments
+CONFIGURATIONS: dict = {
+    "sequential": [],
+    "pipelined": ["--pipelined"],
+    "batch_4": ["--batch-size", "4"],
+    "pipelined_batch_4": ["--pipelined", "--batch-size", "4"],
+    "detect_every_3": ["--detect-every", "3"],
+    "motion_gate": ["--motion-gate"],
+}
+
+
+# pylint: disable=R0903, W0703, I1101
+class BenchmarkRecognition(ObjectRecognition):
+    """"
+        @brief Class in which object recognition workflow is run with
+        the stand-in network when MobileNet-SSD model files are missing
+    """
+
+    def __init__(self, forward_time: float):
+        """"
+            :param forward_time: float, emulated forward pass time of
+            the stand-in network
+
+            @brief Class instantiation: setup of class attributes
+        """
+        ObjectRecognition.__init__(self)
+        # private attribute for emulated forward pass time
+        self.__forward_time: float = forward_time
+        # public attribute which is True when stand-in network is used
+        self.stand_in: bool = False
+
+    def _load_serial_model(self) -> bool:
+        """"
+            :return bool
+
+            @brief
+            Protected class method in which real model is loaded when
+            its files exist, stand-in network is used otherwise
+        """
+        if os.path.isfile(self._arguments["prototxt"]) and \
+                os.path.isfile(self._arguments["model"]):
+            return ObjectRecognition._load_serial_model(self)
+
+        self.stand_in = True
+        self._net = StandInNetwork(self.__forward_time)
+        return True
+
+    def results(self) -> dict:
+        """"
+            :return dict
+
+            @brief Public class method which returns throughput and
+            per-stage latency of the finished run
+        """
+        return {"stand_in_network": self.stand_in,
+                "frames": self.processed_frames(),
+                "elapsed_s": round(self._fps.elapsed(), 3),
+                "fps": round(self._fps.fps(), 3),
+                "stages": self._stage_timer.summary()}
+
+
+def generate_frames(directory: str, frames: int, width: int,
+                    height: int) -> str:
+    """"
+        :param directory: str, directory for generated frames, it is
+        created when it does not exist ;
+        :param frames: int, number of frames ;
+        :param width: int, frame width ;
+        :param height: int, frame height
+        :return str, directory with frames
+
+        @brief Public function in which deterministic synthetic frames
+        with moving rectangles over a static background are written
+        as png images
+    """
+    os.makedirs(directory, exist_ok=True)
+    generator: numpy.random.RandomState = numpy.random.RandomState(0)
+    background: numpy.ndarray = cv2.resize(
+        generator.randint(0, 255, (12, 16, 3)).astype(numpy.uint8),
+        (width, height))
+    for index in range(frames):
+        frame: numpy.ndarray = background.copy()
+        for shape in range(3):
+            x_position: int = (index * (4 + 3 * shape) + 97 * shape) % \
+                max(1, width - width // 6)
+            y_position: int = (height // 4) * (shape + 1) - height // 12
+            cv2.rectangle(frame, (x_position, y_position),
+                          (x_position + width // 6,
+                           y_position + height // 6),
+                          (60 * shape, 255 - 60 * shape, 128), -1)
+        cv2.imwrite(os.path.join(directory, '{:06d}.png'.format(index)),
+                    frame)
+
+    return directory
+
+
+def run_configuration(argv: list, forward_time: float,
+                      working_dir: str) -> dict:
+    """"
+        :param argv: list, command line arguments of the run ;
+        :param forward_time: float, emulated forward pass time of the
+        stand-in network ;
+        :param working_dir: str, directory in which results are written
+        :return dict
+
+        @brief Public function in which one configuration is run, it is
+        executed in a separate process so peak memory is measured for
+        the configuration only
+    """
+    os.chdir(working_dir)
+    logging.disable(logging.WARNING)
+    recognition: BenchmarkRecognition = BenchmarkRecognition(forward_time)
+    recognition.real_time_object_recognition(argv)
+    results: dict = recognition.results()
+    results["peak_memory_mb"] = None
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        scale: float = 1.0 if sys.platform == 'darwin' else 1024.0
+        results["peak_memory_mb"] = round(resource.getrusage(
+            resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20, 1)
+
+    return results
+
+
+def compare_with_baseline(results: dict, baseline_file: str,
+                          tolerance: float) -> list:
+    """"
+        :param results: dict, configuration name -> results ;
+        :param baseline_file: str, path of results JSON of a previous run ;
+        :param tolerance: float, allowed relative throughput decrease
+        :return list, descriptions of regressions
+
+        @brief Public function in which throughput of configurations is
+        compared with the baseline run
+    """
+    with open(baseline_file) as baseline_json:
+        baseline: dict = json.load(baseline_json)["configurations"]
+
+    regressions: list = []
+    for name, values in results.items():
+        if name not in baseline or not baseline[name]["fps"]:
+            continue
+        change: float = values["fps"] / baseline[name]["fps"] - 1
+        if change < -tolerance:
+            regressions.append("{}: {:.2f} FPS, baseline {:.2f} FPS "
+                               "({:+.1%})".format(name, values["fps"],
+                                                  baseline[name]["fps"],
+                                                  change))
+
+    return regressions
+
+
+def pipeline_benchmark_main() -> int:
+    """"
+        :return int, exit code
+
+        @ brief
+        Public method in which the benchmark is configured from command
+        line, all selected configurations are run over the same frames
+        and results are saved as JSON
+    """
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    arg_parser.add_argument('-s', '--source',
+                            help="recorded video file, image directory or "
+                                 "glob pattern, synthetic frames are "
+                                 "generated by default")
+    arg_parser.add_argument('--frames', type=int, default=200,
+                            help="number of synthetic frames")
+    arg_parser.add_argument('--width', type=int, default=640,
+                            help="width of synthetic frames")
+    arg_parser.add_argument('--height', type=int, default=480,
+                            help="height of synthetic frames")
+    arg_parser.add_argument('--configurations', nargs='+',
+                            choices=sorted(CONFIGURATIONS),
+                            default=sorted(CONFIGURATIONS),
+                            help="configurations to be benchmarked")
+    arg_parser.add_argument('-p', '--prototxt',
+                            default=os.path.abspath(
+                                "MobileNetSSD_deploy.prototxt.txt"),
+                            help="path to Caffe 'deploy' prototxt file")
+    arg_parser.add_argument('-m', '--model',
+                            default=os.path.abspath(
+                                "MobileNetSSD_deploy.caffemodel"),
+                            help="path to Caffe pre-trained model")
+    arg_parser.add_argument('--forward-time', type=float, default=0.02,
+                            help="emulated forward pass time of the "
+                                 "stand-in network per image")
+    arg_parser.add_argument('-o', '--output',
+                            default='benchmark_results.json',
+                            help="path of results JSON file")
+    arg_parser.add_argument('--baseline',
+                            help="results JSON of a previous run to "
+                                 "compare throughput with")
+    arg_parser.add_argument('--tolerance', type=float, default=0.1,
+                            help="allowed relative throughput decrease "
+                                 "against the baseline")
+    arguments: dict = vars(arg_parser.parse_args())
+
+    results: dict = {}
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if arguments["source"]:
+            source: str = os.path.abspath(arguments["source"])
+        else:
+            source: str = generate_frames(os.path.join(temp_dir, 'frames'),
+                                          arguments["frames"],
+                                          arguments["width"],
+                                          arguments["height"])
+        for name in arguments["configurations"]:
+            working_dir: str = os.path.join(temp_dir, name)
+            os.mkdir(working_dir)
+            argv: list = ['-s', source, '-p', arguments["prototxt"],
+                          '-m', arguments["model"],
+                          '--latency-export-interval', '0'] + \
+                CONFIGURATIONS[name]
+            with context.Pool(1) as pool:
+                results[name] = pool.apply(run_configuration,
+                                           (argv, arguments["forward_time"],
+                                            working_dir))
+            print("{:<20} {:>8.2f} FPS {:>8} MB".format(
+                name, results[name]["fps"],
+                str(results[name]["peak_memory_mb"])))
+
+    with open(arguments["output"], 'w') as output_json:
+        json.dump({"timestamp": time.time(),
+                   "platform": sys.platform,
+                   "opencv_version": cv2.__version__,
+                   "configurations": results}, output_json, indent=2)
+
+    if arguments["baseline"]:
+        regressions: list = compare_with_baseline(results,
+                                                  arguments["baseline"],
+                                                  arguments["tolerance"])
+        for regression in regressions:
+            print("Regression: " + regression)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(pipeline_benchmark_main())
@@ -0,0 +1,99 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import time
+
+import numpy
+
+
+# pylint: disable=R0903
+class StandInNetwork:
+    """"
+        @brief Class which stands in for the MobileNet-SSD cv2.dnn_Net
+        when the model files are not available. It has the setInput and
+        forward interface of the network and returns deterministic
+        detections of the same (1, 1, N * 100, 7) shape. Forward pass cost
+        is emulated with a sleep, which, like the real forward pass,
+        releases the GIL.
+    """
+
+    def __init__(self, forward_time: float = 0.02, detections: int = 100,
+                 classes: int = 21, seed: int = 0):
+        """"
+            :param forward_time: float, emulated forward pass time of a
+            single image in seconds ;
+            :param detections: int, number of detection rows per image ;
+            :param classes: int, number of classes including background ;
+            :param seed: int, seed of generated detections
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # private attribute for emulated forward pass time per image
+        self.__forward_time: float = forward_time
+        # private attribute for number of detection rows per image
+        self.__detections: int = detections
+        # private attribute for number of classes
+        self.__classes: int = classes
+        # private attribute for seed of generated detections
+        self.__seed: int = seed
+        # private attribute for number of forward passes
+        self.__calls: int = 0
+        # private attribute for number of images in the input blob
+        self.__images: int = 1
+
+    def setInput(self, blob: numpy.ndarray, *_) -> None:
+        """"
+            :param blob: numpy.ndarray, 4D input blob
+            :return None
+
+            @brief Public class method in which input blob is set
+        """
+        # pylint: disable=C0103
+        self.__images = blob.shape[0]
+
+    def setPreferableBackend(self, *_) -> None:
+        """"
+            :return None
+
+            @brief Public class method kept for interface compatibility
+        """
+        # pylint: disable=C0103
+
+    def setPreferableTarget(self, *_) -> None:
+        """"
+            :return None
+
+            @brief Public class method kept for interface compatibility
+        """
+        # pylint: disable=C0103
+
+    def forward(self, *_) -> numpy.ndarray:
+        """"
+            :return numpy.ndarray
+
+            @brief Public class method which returns detections of all
+            images in the input blob, roughly ten per image are above
+            the default confidence threshold
+        """
+        time.sleep(self.__forward_time * self.__images)
+        generator: numpy.random.RandomState = numpy.random.RandomState(
+            self.__seed + self.__calls)
+        self.__calls += 1
+
+        rows: int = self.__detections * self.__images
+        detections: numpy.ndarray = numpy.zeros((1, 1, rows, 7),
+                                                dtype=numpy.float32)
+        detections[0, 0, :, 0] = numpy.repeat(numpy.arange(self.__images),
+                                              self.__detections)
+        detections[0, 0, :, 1] = generator.randint(1, self.__classes, rows)
+        detections[0, 0, :, 2] = generator.random_sample(rows) ** 16
+        start: numpy.ndarray = generator.random_sample((rows, 2)) * 0.8
+        detections[0, 0, :, 3:5] = start
+        detections[0, 0, :, 5:7] = start + \
+            generator.random_sample((rows, 2)) * 0.2
+
+        return detections
@@ -0,0 +1,53 @@
+"""
+author: Monika Marinova
+version: 1.0
+date:
+python version: 3.6
+openCV version: 4.7.12
+"""
+import argparse
+import json
+import logging
+import sys
+
+from image_and_video_prosessors.frame_sources import image_file_paths
+from object_recognition_processing.object_detector import ObjectDetector
+
+
+def detect_main() -> int:
+    """"
+        :return int, exit code
+
+        @ brief
+        Public method in which objects are detected in image files and
+        detections of every image are printed as one JSON line. Only the
+        network is loaded, no report, histograms or video are saved.
+        Arguments which are not listed here are passed to the detector.
+    """
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    arg_parser.add_argument('-s', '--source', nargs='+', required=True,
+                            help="image files, image directories or glob "
+                                 "patterns of image files")
+    (arguments, detector_argv) = arg_parser.parse_known_args()
+
+    paths: list = []
+    for source in arguments.source:
+        paths.extend(image_file_paths(source) or [source])
+
+    detector: ObjectDetector = ObjectDetector()
+    if not detector.prepare(detector_argv):
+        logging.error("Model can not be loaded")
+        return 1
+
+    for start in range(0, len(paths), detector.batch_size()):
+        batch: list = paths[start:start + detector.batch_size()]
+        for path, detections in zip(batch, detector.detect_files(batch)):
+            if detections is not None:
+                print(json.dumps({"file": path,
+                                  "objects": detector.to_dict(detections)}))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(detect_main())
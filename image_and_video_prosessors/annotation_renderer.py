@@ -0,0 +1,170 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import threading
+
+import cv2
+import numpy
+
+
+# pylint: disable=R0903, W0703, I1101
+class AnnotationRenderer:
+    """"
+        @brief Class in which all detections of a frame are drawn at once
+        into a separate output buffer, the grabbed frame stays unchanged.
+        Every class has a fixed color of a deterministic palette. Label
+        images - text on class colored background - are rendered once
+        per class and confidence percent and copied onto frames. Output
+        buffers are reused once their consumers release them.
+    """
+
+    def __init__(self, class_names: list, font_scale: float = 0.5,
+                 thickness: int = 2):
+        """"
+            :param class_names: list, class labels indexed by class id ;
+            :param font_scale: float, scale of label font ;
+            :param thickness: int, thickness of boxes and label text
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # private attribute for class labels
+        self.__class_names: list = class_names
+        # private attribute for scale of label font
+        self.__font_scale: float = font_scale
+        # private attribute for thickness of boxes and label text
+        self.__thickness: int = thickness
+        # private attribute holding BGR color of every class
+        self.__palette: list = AnnotationRenderer.palette(len(class_names))
+        # private attribute holding label images for class id and
+        # confidence percent
+        self.__labels: dict = {}
+        # private attribute holding released output buffers
+        self.__free_buffers: list = []
+        # private attribute guarding released output buffers, they are
+        # released by encoder thread
+        self.__lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def palette(colors: int) -> list:
+        """"
+            :param colors: int, number of colors
+            :return list of tuples
+
+            @brief Public static method which returns distinct BGR colors
+            of hues spread by the golden ratio, they are the same in
+            every run
+        """
+        hues: numpy.ndarray = (numpy.arange(colors) * 0.618033988749895
+                               % 1.0 * 180).astype(numpy.uint8)
+        hsv: numpy.ndarray = numpy.stack(
+            (hues, numpy.full(colors, 200, dtype=numpy.uint8),
+             numpy.full(colors, 255, dtype=numpy.uint8)), axis=1)
+        bgr: numpy.ndarray = cv2.cvtColor(hsv[numpy.newaxis],
+                                          cv2.COLOR_HSV2BGR)[0]
+
+        return [tuple(int(channel) for channel in color) for color in bgr]
+
+    def __label(self, class_id: int, percent: int) -> numpy.ndarray:
+        """"
+            :param class_id: int, class index ;
+            :param percent: int, confidence in percent
+            :return numpy.ndarray
+
+            @brief Private class method which returns label image of the
+            class and confidence, it is rendered on first use
+        """
+        label: numpy.ndarray = self.__labels.get((class_id, percent))
+        if label is not None:
+            return label
+
+        text: str = "{}: {}%".format(self.__class_names[class_id], percent)
+        ((text_width, text_height), baseline) = cv2.getTextSize(
+            text, cv2.FONT_HERSHEY_SIMPLEX, self.__font_scale, 1)
+        color: tuple = self.__palette[class_id]
+        label = numpy.empty((text_height + baseline + 4, text_width + 4, 3),
+                            dtype=numpy.uint8)
+        label[:] = color
+        # dark text on light colors, light text on dark colors
+        text_color: tuple = (0, 0, 0) if \
+            0.114 * color[0] + 0.587 * color[1] + 0.299 * color[2] > 128 \
+            else (255, 255, 255)
+        cv2.putText(label, text, (2, text_height + 2),
+                    cv2.FONT_HERSHEY_SIMPLEX, self.__font_scale, text_color,
+                    1, cv2.LINE_AA)
+        self.__labels[(class_id, percent)] = label
+
+        return label
+
+    def __acquire_buffer(self, image: numpy.ndarray) -> numpy.ndarray:
+        """"
+            :param image: numpy.ndarray, frame image
+            :return numpy.ndarray
+
+            @brief Private class method which returns released output
+            buffer of the frame shape or a new one
+        """
+        with self.__lock:
+            for index, buffer in enumerate(self.__free_buffers):
+                if buffer.shape == image.shape:
+                    return self.__free_buffers.pop(index)
+            if len(self.__free_buffers) > 8:
+                # buffers of another frame shape are not used anymore
+                self.__free_buffers.clear()
+
+        return numpy.empty_like(image)
+
+    def release(self, buffer: numpy.ndarray) -> None:
+        """"
+            :param buffer: numpy.ndarray, output buffer returned by render
+            :return None
+
+            @brief Public class method in which output buffer is returned
+            for reuse, it is called when the annotated frame is not used
+            anymore
+        """
+        with self.__lock:
+            self.__free_buffers.append(buffer)
+
+    def render(self, image: numpy.ndarray,
+               objects: numpy.ndarray) -> numpy.ndarray:
+        """"
+            :param image: numpy.ndarray, frame image ;
+            :param objects: numpy.ndarray of DETECTION_DTYPE, filtered
+            detections of the frame
+            :return numpy.ndarray
+
+            @brief Public class method in which frame is copied into an
+            output buffer and all boxes and labels are drawn into it.
+            The frame itself is returned when there are no detections.
+        """
+        if not len(objects):
+            return image
+
+        output: numpy.ndarray = self.__acquire_buffer(image)
+        numpy.copyto(output, image)
+        (image_height, image_width) = image.shape[:2]
+        boxes: list = objects['box'].tolist()
+        class_ids: list = objects['class_id'].tolist()
+        percents: list = numpy.round(
+            objects['confidence'] * 100).astype(numpy.int32).tolist()
+        for (start_x, start_y, end_x, end_y), class_id, percent in zip(
+                boxes, class_ids, percents):
+            cv2.rectangle(output, (start_x, start_y), (end_x, end_y),
+                          self.__palette[class_id], self.__thickness)
+
+            # label is placed above the box, inside of it at the top edge
+            label: numpy.ndarray = self.__label(class_id, percent)
+            label_y: int = start_y - label.shape[0] \
+                if start_y >= label.shape[0] else start_y
+            label_height: int = min(label.shape[0], image_height - label_y)
+            label_width: int = min(label.shape[1], image_width - start_x)
+            if label_height > 0 and label_width > 0:
+                output[label_y:label_y + label_height,
+                       start_x:start_x + label_width] = \
+                    label[:label_height, :label_width]
+
+        return output
@@ -0,0 +1,51 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import numpy
+
+
+# pylint: disable=R0903
+class FrameRecord:
+    """"
+        @brief Class which holds a single grabbed frame together
+        with everything computed for it, so frames can be passed
+        between processing stages without sharing object state
+    """
+
+    __slots__ = ('frame_number', 'image', 'detections', 'objects', 'gated',
+                 'capture_time', 'release', 'annotated_image')
+
+    def __init__(self, frame_number: int, image: numpy.ndarray,
+                 capture_time: float = None, release=None):
+        """"
+            :param frame_number: int, number of frame in video sequence ;
+            :param image: numpy.ndarray, grabbed frame image ;
+            :param capture_time: float, time.perf_counter() time at which
+            frame was captured ;
+            :param release: callable, function releasing shared buffer of
+            frame image, None when image is not shared
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # public attribute for number of frame in video sequence
+        self.frame_number: int = frame_number
+        # public attribute to be used as frame image holder
+        self.image: numpy.ndarray = image
+        # public attribute to be used as detections array holder
+        self.detections: numpy.ndarray = None
+        # public attribute to be used as filtered detections holder
+        self.objects: numpy.ndarray = None
+        # public attribute which is True when frame had no activity
+        # and reuses detections of the previous frame
+        self.gated: bool = False
+        # public attribute for time at which frame was captured
+        self.capture_time: float = capture_time
+        # public attribute for function releasing shared image buffer
+        self.release = release
+        # public attribute to be used as annotated frame holder, it is
+        # the frame image itself when nothing is drawn
+        self.annotated_image: numpy.ndarray = None
@@ -0,0 +1,465 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import abc
+import glob
+import logging
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy
+
+# file extensions of images read from directories
+IMAGE_EXTENSIONS: tuple = ('.bmp', '.jpeg', '.jpg', '.png', '.tif', '.tiff')
+
+# value returned by read() of sources when no frame arrived in time,
+# unlike None it does not mean the end of source
+READ_TIMEOUT: object = object()
+
+
+# pylint: disable=R0903, W0703, I1101
+class QueuedFrameSource(abc.ABC):
+    """"
+        @brief Base class for offline frame sources. Frames are decoded
+        ahead by a reader thread into a bounded queue. The reader blocks
+        while the queue is full, so no frame is ever dropped. The class
+        has the start/read/stop interface of imutils video streams,
+        decoding time of the last read frame is its capture time.
+    """
+
+    # private class attribute used as end of stream marker
+    __END_OF_STREAM: object = object()
+
+    def __init__(self, queue_size: int = 32):
+        """"
+            :param queue_size: int, maximum number of decoded frames
+            waiting to be read
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # private attribute to be used as decoded frames queue
+        self.__frames: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        # private attribute used to signal reader thread to stop
+        self.__stop_event: threading.Event = threading.Event()
+        # private attribute to be used as reader thread holder
+        self.__reader_thread: threading.Thread = None
+        # private attribute set when all frames were read
+        self.__exhausted: bool = False
+        # public attribute for time.perf_counter() time at which the
+        # last read frame was decoded
+        self.capture_time: float = None
+
+    @abc.abstractmethod
+    def _read_next(self) -> numpy.ndarray:
+        """"
+            :return numpy.ndarray
+
+            @brief Protected class method returning next decoded frame
+            or None at the end of source, implemented by subclasses
+        """
+
+    def _release(self) -> None:
+        """"
+            :return None
+
+            @brief Protected class method in which source resources
+            are released, implemented by subclasses when needed
+        """
+
+    def __put(self, item) -> bool:
+        """"
+            :param item: decoded frame with its time or end of stream
+            marker
+            :return bool
+
+            @brief Private class method which blocks while the queue is
+            full, but gives up once the source is stopped
+        """
+        while not self.__stop_event.is_set():
+            try:
+                self.__frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def __reader(self) -> None:
+        """"
+            :return None
+
+            @brief Private class method run by the reader thread, end of
+            stream marker is queued however the thread ends
+        """
+        try:
+            while not self.__stop_event.is_set():
+                try:
+                    frame: numpy.ndarray = self._read_next()
+                except Exception:
+                    logging.error("Error occurred during reading frame "
+                                  "source")
+                    frame = None
+
+                if frame is None or \
+                        not self.__put((frame, time.perf_counter())):
+                    break
+        finally:
+            self.__put(QueuedFrameSource.__END_OF_STREAM)
+            self._release()
+
+    def start(self):
+        """"
+            :return QueuedFrameSource
+
+            @brief Public class method in which reader thread is started
+        """
+        self.__reader_thread = threading.Thread(target=self.__reader,
+                                                name="frame-reader",
+                                                daemon=True)
+        self.__reader_thread.start()
+
+        return self
+
+    def read(self) -> numpy.ndarray:
+        """"
+            :return numpy.ndarray
+
+            @brief Public class method which returns next frame, it waits
+            until the frame is decoded. None is returned at the end
+            of source and once the source is stopped or its reader
+            thread is gone.
+        """
+        if self.__exhausted:
+            return None
+
+        while True:
+            try:
+                item = self.__frames.get(timeout=0.1)
+                break
+            except queue.Empty:
+                if (self.__stop_event.is_set() or
+                        self.__reader_thread is None or
+                        not self.__reader_thread.is_alive()) and \
+                        self.__frames.empty():
+                    self.__exhausted = True
+                    return None
+        if item is QueuedFrameSource.__END_OF_STREAM:
+            self.__exhausted = True
+            return None
+
+        (frame, self.capture_time) = item
+
+        return frame
+
+    def stop(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which reader thread is stopped
+        """
+        self.__stop_event.set()
+        if self.__reader_thread is not None:
+            self.__reader_thread.join(timeout=2.0)
+
+
+class VideoFileSource(QueuedFrameSource):
+    """"
+        @brief Class in which frames are decoded from a video file
+    """
+
+    def __init__(self, path: str, queue_size: int = 32,
+                 start_frame: int = 0, end_frame: int = None):
+        """"
+            :param path: str, path of video file ;
+            :param queue_size: int, maximum number of decoded frames
+            waiting to be read ;
+            :param start_frame: int, index of the first decoded frame ;
+            :param end_frame: int, index after the last decoded frame,
+            frames are decoded until the end of file when it is not given
+
+            @brief Class instantiation: setup of class attributes
+        """
+        QueuedFrameSource.__init__(self, queue_size)
+        # private attribute to be used as video capture holder
+        self.__capture: cv2.VideoCapture = cv2.VideoCapture(path)
+        if not self.__capture.isOpened():
+            logging.error("Video file %s can not be opened", path)
+        if start_frame > 0:
+            self.__capture.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        # private attribute for number of frames left to be decoded,
+        # None when file is decoded until its end
+        self.__frames_left: int = None if end_frame is None \
+            else max(0, end_frame - start_frame)
+        # public attribute for frame rate of video file, None when
+        # it is not known
+        self.fps: float = self.__capture.get(cv2.CAP_PROP_FPS) or None
+
+    def _read_next(self) -> numpy.ndarray:
+        """"
+            :return numpy.ndarray
+
+            @brief Protected class method in which next frame is decoded
+        """
+        if self.__frames_left is not None:
+            if self.__frames_left <= 0:
+                return None
+            self.__frames_left -= 1
+        (grabbed, frame) = self.__capture.read()
+
+        return frame if grabbed else None
+
+    def _release(self) -> None:
+        """"
+            :return None
+
+            @brief Protected class method in which video capture
+            is released
+        """
+        self.__capture.release()
+
+
+class ImageFilesSource(QueuedFrameSource):
+    """"
+        @brief Class in which frames are read from a list of image files
+    """
+
+    def __init__(self, paths: list, queue_size: int = 32):
+        """"
+            :param paths: list, paths of image files in processing order ;
+            :param queue_size: int, maximum number of decoded frames
+            waiting to be read
+
+            @brief Class instantiation: setup of class attributes
+        """
+        QueuedFrameSource.__init__(self, queue_size)
+        # private attribute for image files to be read
+        self.__paths: list = list(paths)
+        # private attribute for position of next image file
+        self.__position: int = 0
+
+    def _read_next(self) -> numpy.ndarray:
+        """"
+            :return numpy.ndarray
+
+            @brief Protected class method in which next readable
+            image file is decoded
+        """
+        while self.__position < len(self.__paths):
+            path: str = self.__paths[self.__position]
+            self.__position += 1
+            frame: numpy.ndarray = cv2.imread(path)
+            if frame is not None:
+                return frame
+            logging.warning("Image file %s can not be read", path)
+
+        return None
+
+
+# pylint: disable=R0903, W0703, I1101
+class LatestFrameSource:
+    """"
+        @brief Class in which frames of a camera or a network stream are
+        captured by a reader thread which keeps only the latest frame.
+        Frames which are not read before the next one is captured are
+        dropped, so a slow consumer always gets the freshest frame
+        together with its capture time. The class has the
+        start/read/stop interface of imutils video streams.
+    """
+
+    def __init__(self, address, read_timeout: float = 1.0):
+        """"
+            :param address: int camera index or str network stream
+            address ;
+            :param read_timeout: float, maximum time in seconds read
+            waits for a new frame
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # private attribute to be used as video capture holder
+        self.__capture: cv2.VideoCapture = cv2.VideoCapture(address)
+        if not self.__capture.isOpened():
+            logging.error("Video stream %s can not be opened", address)
+        # private attribute for maximum wait for a new frame
+        self.__read_timeout: float = read_timeout
+        # private attribute holding the latest frame and its capture
+        # time, None when it was already read
+        self.__latest: tuple = None
+        # private attribute guarding the latest frame and waking up
+        # waiting reader
+        self.__condition: threading.Condition = threading.Condition()
+        # private attribute used to signal reader thread to stop
+        self.__stop_event: threading.Event = threading.Event()
+        # private attribute to be used as reader thread holder
+        self.__reader_thread: threading.Thread = None
+        # public attribute for number of captured frames which were
+        # replaced by a newer frame before they were read
+        self.dropped_frames: int = 0
+        # public attribute for time.perf_counter() time at which the
+        # last read frame was captured
+        self.capture_time: float = None
+
+    def __reader(self) -> None:
+        """"
+            :return None
+
+            @brief Private class method run by the reader thread
+        """
+        while not self.__stop_event.is_set():
+            try:
+                (grabbed, frame) = self.__capture.read()
+            except cv2.error:
+                logging.error("Error occurred during reading video stream")
+                grabbed = False
+            if not grabbed:
+                # camera or network stream is waited for
+                self.__stop_event.wait(0.01)
+                continue
+
+            with self.__condition:
+                if self.__latest is not None:
+                    self.dropped_frames += 1
+                self.__latest = (frame, time.perf_counter())
+                self.__condition.notify()
+
+        self.__capture.release()
+
+    def start(self):
+        """"
+            :return LatestFrameSource
+
+            @brief Public class method in which reader thread is started
+        """
+        self.__reader_thread = threading.Thread(target=self.__reader,
+                                                name="latest-frame-reader",
+                                                daemon=True)
+        self.__reader_thread.start()
+
+        return self
+
+    def read(self) -> numpy.ndarray:
+        """"
+            :return numpy.ndarray
+
+            @brief Public class method which returns the latest frame which
+            was not read yet, it waits for it at most read timeout. None
+            is returned when no new frame was captured.
+        """
+        with self.__condition:
+            if self.__latest is None:
+                self.__condition.wait(self.__read_timeout)
+            if self.__latest is None:
+                return None
+
+            (frame, self.capture_time) = self.__latest
+            self.__latest = None
+
+        return frame
+
+    def stop(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which reader thread is stopped
+        """
+        self.__stop_event.set()
+        if self.__reader_thread is not None:
+            self.__reader_thread.join(timeout=2.0)
+
+
+def is_live_source(source: str) -> bool:
+    """"
+        :param source: str, value of --source argument
+        :return bool
+
+        @brief Public function which tells whether source is a camera
+        index, a network stream address or is not given, in which case
+        the webcam is used
+    """
+    return source is None or source == 'webcam' or \
+        str(source).isdigit() or '://' in str(source)
+
+
+def live_source_address(source: str):
+    """"
+        :param source: str, value of --source argument
+        :return int camera index or str network stream address
+
+        @brief Public function which converts live source into the
+        src argument of imutils.video.VideoStream
+    """
+    if source is None or source == 'webcam':
+        return 0
+
+    return int(source) if str(source).isdigit() else source
+
+
+def image_file_paths(source: str) -> list:
+    """"
+        :param source: str, path of video file, image directory or
+        glob pattern of image files
+        :return list
+
+        @brief Public function which returns sorted paths of image files
+        in the directory or matching the glob pattern, None is returned
+        for video files
+    """
+    if os.path.isdir(source):
+        return sorted(os.path.join(source, name)
+                      for name in os.listdir(source)
+                      if name.lower().endswith(IMAGE_EXTENSIONS))
+
+    if any(character in source for character in '*?['):
+        return sorted(glob.glob(source))
+
+    return None
+
+
+def count_frames(source: str) -> int:
+    """"
+        :param source: str, path of video file, image directory or
+        glob pattern of image files
+        :return int
+
+        @brief Public function which returns number of frames of offline
+        source, number of video file frames is taken from its header
+    """
+    paths: list = image_file_paths(source)
+    if paths is not None:
+        return len(paths)
+
+    capture: cv2.VideoCapture = cv2.VideoCapture(source)
+    try:
+        return max(0, int(capture.get(cv2.CAP_PROP_FRAME_COUNT)))
+    finally:
+        capture.release()
+
+
+def create_frame_source(source: str, queue_size: int = 32,
+                        start_frame: int = 0, end_frame: int = None) \
+        -> QueuedFrameSource:
+    """"
+        :param source: str, path of video file, image directory or
+        glob pattern of image files ;
+        :param queue_size: int, maximum number of decoded frames
+        waiting to be read ;
+        :param start_frame: int, index of the first read frame ;
+        :param end_frame: int, index after the last read frame, frames
+        are read until the end of source when it is not given
+        :return QueuedFrameSource
+
+        @brief Public function in which offline frame source is created
+        for the given path. Paths which are neither a directory nor a
+        glob pattern are opened as video files.
+    """
+    paths: list = image_file_paths(source)
+    if paths is not None:
+        return ImageFilesSource(paths[start_frame:end_frame], queue_size)
+
+    return VideoFileSource(source, queue_size, start_frame, end_frame)
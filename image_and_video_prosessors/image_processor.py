@@ -6,11 +6,23 @@ python version: 3.6
 openCV version: 4.7.12
 """
 import logging
+import os
 
 import cv2
 import numpy
 
 from Caffe_model_handler.model_handler import CaffeModelHandler
+from image_and_video_prosessors.region_of_interest import RegionsOfInterest
+from report_handlers.latency_handler import StageTimer
+
+# structured type of a single filtered detection: class index, confidence,
+# bounding box (start_x, start_y, end_x, end_y) in frame pixels, track ID
+# (-1 when tracking is not used) and whether box was tracked or detected
+DETECTION_DTYPE: numpy.dtype = numpy.dtype([('class_id', numpy.int32),
+                                            ('confidence', numpy.float32),
+                                            ('box', numpy.int32, (4,)),
+                                            ('track_id', numpy.int32),
+                                            ('tracked', numpy.bool_)])
 
 
 # pylint: disable=R0903, W0703, I1101
@@ -27,10 +39,6 @@ class ImageProcessing(CaffeModelHandler):
         """
         try:
             CaffeModelHandler.__init__(self)
-            # private attribute which generates a set of bounding box
-            # colors for each class
-            self.__colors: numpy.ndarray = numpy.random.uniform \
-                (0, 255, size=(len(self._classes_of_interest), 3))
             # protected attribute to be used as detections array holder
             self._detections: numpy.ndarray = None
             # protected attribute to be used az detection confidence holder
@@ -41,12 +49,48 @@ class ImageProcessing(CaffeModelHandler):
             self._image_height: int = None
             # protected attribute for frame width
             self._image_width: int = None
+            # protected attribute holding indexes of classes which are
+            # reported, None when all classes are reported
+            self._allowed_class_ids: numpy.ndarray = None
+            # protected attribute to be used for measuring latency
+            # of processing stages
+            self._stage_timer: StageTimer = StageTimer()
+            # protected attribute for directory results are saved in
+            self._results_dir: str = 'results'
+            # private attribute for network input size (width, height)
+            self.__input_size: tuple = None
+            # private attribute which is True when network input is blurred
+            self.__blur_input: bool = True
+            # private attribute for reusable resized network input
+            self.__input_buffer: numpy.ndarray = None
+            # private attribute for reusable blurred network input
+            self.__blurred_buffer: numpy.ndarray = None
+            # private attribute for reusable 4D blob, it grows with
+            # the largest batch and its leading part is passed to network
+            self.__blob_buffer: numpy.ndarray = None
+            self.__set_input_size((300, 300))
+            # private attribute for number of tile columns and rows,
+            # None when frames are not tiled
+            self.__tiles: tuple = None
+            # private attribute for overlap of neighbouring tiles as
+            # fraction of tile size
+            self.__tile_overlap: float = 0.2
+            # private attribute for IoU above which overlapping boxes of
+            # the same class are merged
+            self.__nms_threshold: float = 0.45
+            # private attribute to be initialized as RegionsOfInterest
+            # object when only parts of frames are passed through network
+            self.__regions: RegionsOfInterest = None
+            # private attribute holding crop rectangles for frame shapes
+            self.__crop_rectangles: dict = {}
         except Exception:
             logging.error("Error occurred during ImageProcessing"
                           " object instantiation")
 
-    def _prepare_model(self) -> None:
+    def _prepare_model(self, argv: list = None) -> None:
         """"
+            :param argv: list, command line arguments, sys.argv is
+            used when they are not given
             :return None
 
             @brief
@@ -54,90 +98,491 @@ class ImageProcessing(CaffeModelHandler):
             and model is loaded. For both are used CaffeModelHandler
             methods.
         """
-        self._add_parsers()
+        self._prepare_arguments(argv)
+        self._load_model()
+
+    def _prepare_arguments(self, argv: list = None) -> None:
+        """"
+            :param argv: list, command line arguments, sys.argv is
+            used when they are not given
+            :return None
+
+            @brief
+            Protected class method in which parsers are added and
+            everything depending only on arguments is set up, so the
+            model can be loaded later, e.g. while video stream is opened
+        """
+        self._add_parsers(argv)
+        self._allowed_class_ids = self.__get_allowed_class_ids()
+        self.__blur_input = not self._arguments.get("no_blur", False)
+        self.__set_input_size(tuple(self._dnn_settings["input_size"]))
+        tiles: list = self._arguments.get("tiles")
+        self.__tiles = tuple(tiles) if tiles else None
+        self.__tile_overlap = min(max(
+            self._arguments.get("tile_overlap", 0.2), 0.0), 0.9)
+        self.__nms_threshold = self._arguments.get("nms_threshold", 0.45)
+        self._stage_timer = StageTimer(
+            os.path.join(self._results_dir, 'stage_latency.jsonl'),
+            export_interval=self._arguments.get("latency_export_interval",
+                                                5.0))
+
+    def _load_model(self) -> bool:
+        """"
+            :return bool
+
+            @brief
+            Protected class method in which serialized model is loaded
+        """
         if self._load_serial_model():
             logging.info("Model is loaded!")
+            return True
+
+        return False
+
+    def _warm_up_model(self, batch_size: int = 1) -> None:
+        """"
+            :param batch_size: int, number of images in the warm-up batch
+            :return None
+
+            @brief
+            Protected class method in which a blob of zeros is passed
+            through the network once, so one-time initialization of
+            network layers is not paid by the first processed frame.
+            Warm-up is not measured by stage timer.
+        """
+        try:
+            self._net.setInput(numpy.zeros(
+                (max(1, batch_size), 3, self.__input_size[1],
+                 self.__input_size[0]), dtype=numpy.float32))
+            self._net.forward()
+        except Exception:
+            logging.error("Error occurred during model warm-up")
 
-    def __image_to_blob(self) -> numpy.ndarray:
+    def _share_model(self, model_owner: 'ImageProcessing') -> None:
+        """"
+            :param model_owner: ImageProcessing, object with parsed
+            arguments and loaded model
+            :return None
+
+            @brief
+            Protected class method in which parsed arguments, class
+            filter and network of another object are taken over, so the
+            model is not loaded again
+        """
+        self._arguments = dict(model_owner._arguments)
+        self._allowed_class_ids = model_owner._allowed_class_ids
+        self.__blur_input = model_owner.__blur_input
+        self._dnn_settings = dict(model_owner._dnn_settings)
+        self.__set_input_size(model_owner.__input_size)
+        self.__tiles = model_owner.__tiles
+        self.__tile_overlap = model_owner.__tile_overlap
+        self.__nms_threshold = model_owner.__nms_threshold
+        self._net = model_owner._net
+        self._stage_timer = StageTimer(
+            os.path.join(self._results_dir, 'stage_latency.jsonl'),
+            export_interval=self._arguments.get("latency_export_interval",
+                                                5.0))
+
+    def __set_input_size(self, input_size: tuple) -> None:
+        """"
+            :param input_size: tuple, network input width and height
+            :return None
+
+            @brief
+            Private class method in which network input size is set and
+            reusable input and blob buffers are allocated for it
+        """
+        if input_size == self.__input_size:
+            return
+
+        self.__input_size = input_size
+        self.__input_buffer = numpy.zeros(
+            (input_size[1], input_size[0], 3), dtype=numpy.uint8)
+        self.__blurred_buffer = numpy.zeros_like(self.__input_buffer)
+        self.__blob_buffer = numpy.zeros(
+            (1, 3, input_size[1], input_size[0]), dtype=numpy.float32)
+
+    def __get_allowed_class_ids(self) -> numpy.ndarray:
         """"
             :return numpy.ndarray
 
+            @brief
+            Private class method in which class names given with
+            --classes argument are converted into class indexes
+        """
+        class_names: list = self._arguments.get("classes")
+        if not class_names:
+            return None
+
+        unknown_names: list = [name for name in class_names
+                               if name not in self._classes_of_interest]
+        if unknown_names:
+            logging.warning("Unknown classes are ignored: %s",
+                            ", ".join(unknown_names))
+
+        return numpy.array([self._classes_of_interest.index(name)
+                            for name in class_names
+                            if name in self._classes_of_interest],
+                           dtype=numpy.int32)
+
+    def __image_to_blob(self, image: numpy.ndarray) -> numpy.ndarray:
+        """"
+            :param image: numpy.ndarray, frame image
+            :return numpy.ndarray
+
             @brief
             Private method in which the frame dimensions are get
             and converted into a blob
         """
-        (self._image_height, self._image_width) = self.image.shape[:2]
+        (self._image_height, self._image_width) = image.shape[:2]
+
+        return self.__images_to_blob([image])
+
+    def __images_to_blob(self, images: list) -> numpy.ndarray:
+        """"
+            :param images: list, frame images
+            :return numpy.ndarray
+
+            @brief
+            Private method in which several frames are converted into
+            a single 4D blob. Every frame is first downsized into the
+            reusable network input buffer, only this small copy is
+            blurred, and its mean subtracted and scaled planes are
+            written in place into the reusable blob buffer. Returned
+            blob is a view of the buffer, it is valid until the next call.
+        """
         try:
-            src_blob: numpy.ndarray = cv2.dnn.blobFromImage(
-                cv2.resize(src=self.image, dsize=(300, 300)),
-                scalefactor=0.007843, size=(300, 300), mean=127.5)
+            if self.__blob_buffer.shape[0] < len(images):
+                self.__blob_buffer = numpy.zeros(
+                    (len(images),) + self.__blob_buffer.shape[1:],
+                    dtype=numpy.float32)
+
+            for position, image in enumerate(images):
+                network_input: numpy.ndarray = cv2.resize(
+                    src=image, dsize=self.__input_size,
+                    dst=self.__input_buffer)
+                if self.__blur_input:
+                    with self._stage_timer.measure("blur"):
+                        network_input = ImageProcessing._filter_image(
+                            network_input, self.__blurred_buffer)
+                # HWC -> CHW, (pixel - 127.5) * 0.007843 as blobFromImage
+                numpy.subtract(network_input.transpose(2, 0, 1),
+                               numpy.float32(127.5),
+                               out=self.__blob_buffer[position],
+                               dtype=numpy.float32)
+            src_blob: numpy.ndarray = self.__blob_buffer[:len(images)]
+            numpy.multiply(src_blob, numpy.float32(0.007843), out=src_blob)
 
             return src_blob
         except cv2.error:
-            logging.error("Error occurred during converting image to blob")
+            logging.error("Error occurred during converting images to blob")
             return None
 
-    def _get_detections(self) -> numpy.ndarray:
+    def _get_batch_detections(self, images: list) -> list:
+        """"
+            :param images: list, frame images
+            :return list of numpy.ndarray
+
+            @ brief
+            Protected method in which all images are passed through the
+            network in a single forward pass. Network output is split
+            back per image with the image id column, every item of the
+            returned list has the (1, 1, K, 7) shape of _get_detections.
+        """
+        if len(images) == 1:
+            return [self._get_detections(images[0])]
+
+        try:
+            with self._stage_timer.measure("blob"):
+                blob: numpy.ndarray = self.__images_to_blob(images)
+            if blob is None:
+                return [None] * len(images)
+
+            self._net.setInput(blob)
+            with self._stage_timer.measure("forward"):
+                self._detections = self._net.forward()
+            rows: numpy.ndarray = self._detections.reshape(
+                -1, self._detections.shape[-1])
+            image_ids: numpy.ndarray = rows[:, 0].astype(numpy.int32)
+
+            return [rows[image_ids == image_id].reshape(1, 1, -1,
+                                                        rows.shape[-1])
+                    for image_id in range(len(images))]
+        except Exception:
+            logging.error("Error occurred during getting batch detections")
+            return [None] * len(images)
+
+    def _set_regions_of_interest(self, regions: RegionsOfInterest) -> None:
+        """"
+            :param regions: RegionsOfInterest, regions of the source,
+            None when whole frames are used
+            :return None
+
+            @ brief
+            Protected method in which static regions of the source are
+            set, only their bounding rectangles are passed through the
+            network and detections outside of them are discarded
+        """
+        self.__regions = regions
+        self.__crop_rectangles = {}
+
+    def _detect_images(self, images: list, detect_function=None) -> list:
+        """"
+            :param images: list, frame images ;
+            :param detect_function: callable, function passing list of
+            images through the network, _get_batch_detections is used
+            when it is not given
+            :return list of numpy.ndarray
+
+            @ brief
+            Protected method in which images are passed through the
+            network, cropped to regions of interest when they are set
+            and tiled when --tiles argument is given
+        """
+        if detect_function is None:
+            detect_function = self._get_batch_detections
+        if self.__tiles is None and self.__regions is None:
+            return detect_function(images)
+
+        return self._get_region_detections(images, detect_function)
+
+    def __get_crop_rectangles(self, image_shape: tuple) -> numpy.ndarray:
         """"
+            :param image_shape: tuple, shape of the frame
+            :return numpy.ndarray of (start_x, start_y, end_x, end_y) rows
+
+            @ brief
+            Private method which returns rectangles of frame parts passed
+            through the network - bounding rectangles of regions of
+            interest or the whole frame, each followed by its overlapping
+            tiles when frames are tiled, so objects larger than a tile
+            are detected as well. Rectangles are computed once per frame
+            shape.
+        """
+        (image_height, image_width) = image_shape[:2]
+        rectangles: numpy.ndarray = self.__crop_rectangles.get(
+            (image_height, image_width))
+        if rectangles is not None:
+            return rectangles
+
+        regions: numpy.ndarray = numpy.array(
+            [[0, 0, image_width, image_height]], dtype=numpy.int32) \
+            if self.__regions is None else \
+            self.__regions.rectangles(image_shape)
+        crops: list = []
+        for region in regions:
+            crops.append(region[numpy.newaxis])
+            if self.__tiles is not None:
+                crops.append(self.__get_tile_rectangles(region))
+        rectangles = numpy.concatenate(crops).astype(numpy.int32) \
+            if crops else numpy.empty((0, 4), dtype=numpy.int32)
+        self.__crop_rectangles[(image_height, image_width)] = rectangles
+
+        return rectangles
+
+    def __get_tile_rectangles(self, region: numpy.ndarray) -> numpy.ndarray:
+        """"
+            :param region: numpy.ndarray, (start_x, start_y, end_x, end_y)
+            rectangle to be tiled
+            :return numpy.ndarray of (start_x, start_y, end_x, end_y) rows
+
+            @ brief
+            Private method which returns rectangles of overlapping tiles
+            covering the region
+        """
+        edges: list = []
+        for (tiles, start, end) in zip(self.__tiles, region[:2],
+                                       region[2:]):
+            # tiles overlapping by given fraction cover the whole length
+            tile_length: float = (end - start) / (
+                tiles - (tiles - 1) * self.__tile_overlap)
+            starts: numpy.ndarray = start + numpy.round(
+                numpy.arange(tiles) * tile_length *
+                (1 - self.__tile_overlap)).astype(numpy.int32)
+            edges.append(numpy.stack(
+                (starts, numpy.minimum(
+                    numpy.round(starts + tile_length).astype(numpy.int32),
+                    end)), axis=1))
+        (columns, rows) = edges
+
+        return numpy.array([[column[0], row[0], column[1], row[1]]
+                            for row in rows for column in columns],
+                           dtype=numpy.int32)
+
+    def __suppress_duplicates(self, rows: numpy.ndarray,
+                              image_shape: tuple) -> numpy.ndarray:
+        """"
+            :param rows: numpy.ndarray, detection rows of a frame in
+            relative frame coordinates ;
+            :param image_shape: tuple, shape of the frame
+            :return numpy.ndarray
+
+            @ brief
+            Private method in which detections found in several crops
+            are merged by a single non-maximum suppression of all
+            classes, boxes of every class are shifted apart so boxes of
+            different classes never overlap
+        """
+        if not len(rows):
+            return rows
+
+        (image_height, image_width) = image_shape[:2]
+        boxes: numpy.ndarray = rows[:, 3:7] * numpy.array(
+            [image_width, image_height, image_width, image_height],
+            dtype=numpy.float32)
+        class_offsets: numpy.ndarray = rows[:, 1:2] * \
+            (max(image_width, image_height) + 1)
+        keep: numpy.ndarray = numpy.array(cv2.dnn.NMSBoxes(
+            numpy.hstack((boxes[:, :2] + class_offsets,
+                          boxes[:, 2:] - boxes[:, :2])).astype(numpy.float64),
+            rows[:, 2].astype(numpy.float32), 0.0, self.__nms_threshold),
+            dtype=numpy.int64).reshape(-1)
+
+        return rows[numpy.sort(keep)]
+
+    def _get_region_detections(self, images: list,
+                               detect_function) -> list:
+        """"
+            :param images: list, frame images ;
+            :param detect_function: callable, function passing list of
+            images through the network
+            :return list of numpy.ndarray
+
+            @ brief
+            Protected method in which every frame is cropped to regions
+            of interest and cut into overlapping tiles, crops of all
+            frames are passed through the network in a single batch and
+            crop boxes are mapped back to relative frame coordinates.
+            Duplicates of objects found in several crops are merged.
+            Returned items have the (1, 1, K, 7) shape of _get_detections.
+        """
+        crops: list = []
+        crop_rectangles: list = []
+        for image in images:
+            rectangles: numpy.ndarray = self.__get_crop_rectangles(
+                image.shape)
+            crops.extend(image[start_y:end_y, start_x:end_x]
+                         for (start_x, start_y, end_x, end_y) in rectangles)
+            crop_rectangles.append(rectangles)
+
+        crop_detections: list = detect_function(crops) if crops else []
+        detections: list = []
+        position: int = 0
+        confidence: float = self._arguments.get("confidence", 0.2)
+        for image_id, (image, rectangles) in enumerate(
+                zip(images, crop_rectangles)):
+            frame_rows: list = [numpy.empty((0, 7), dtype=numpy.float32)]
+            (image_height, image_width) = image.shape[:2]
+            for rectangle, rows in zip(
+                    rectangles,
+                    crop_detections[position:position + len(rectangles)]):
+                if rows is None:
+                    continue
+                rows = rows.reshape(-1, rows.shape[-1])
+                rows = rows[rows[:, 2] > confidence].copy()
+                # crop relative -> frame relative coordinates
+                scale: numpy.ndarray = (rectangle[2:] - rectangle[:2]) / \
+                    numpy.array([image_width, image_height])
+                offset: numpy.ndarray = rectangle[:2] / \
+                    numpy.array([image_width, image_height])
+                rows[:, 3:7] = rows[:, 3:7] * numpy.tile(scale, 2) + \
+                    numpy.tile(offset, 2)
+                rows[:, 0] = image_id
+                frame_rows.append(rows)
+            position += len(rectangles)
+
+            with self._stage_timer.measure("nms"):
+                rows = self.__suppress_duplicates(
+                    numpy.concatenate(frame_rows), image.shape)
+            detections.append(rows.reshape(1, 1, -1, 7))
+
+        return detections
+
+    def _get_detections(self, image: numpy.ndarray = None) -> numpy.ndarray:
+        """"
+            :param image: numpy.ndarray, frame image, self.image is used
+            when it is not given
             :return numpy.ndarray
 
             @ brief
             Protected method in which blob is passed through the network
             and the detections and predictions are obtained
         """
+        if image is None:
+            image = self.image
+
         try:
-            if self.__image_to_blob() is not None:
-                blob: numpy.ndarray = self.__image_to_blob()
+            with self._stage_timer.measure("blob"):
+                blob: numpy.ndarray = self.__image_to_blob(image)
+            if blob is not None:
                 self._net.setInput(blob)
-                self._detections = self._net.forward()
+                with self._stage_timer.measure("forward"):
+                    self._detections = self._net.forward()
 
             return self._detections
         except Exception:
             logging.error("Error occurred during getting detections")
 
-    def _create_prediction_frame(self, src_box: numpy.ndarray, index: int) \
-            -> None:
+    def _filter_detections(self, detections: numpy.ndarray,
+                           image_shape: tuple) -> numpy.ndarray:
         """"
-            :param src_box: numpy.ndarray, bounding box for detected object ;
-            :param index: int, index of value in self.detections array
-            :return None
+            :param detections: numpy.ndarray, network output of shape
+            (1, 1, N, 7) ;
+            :param image_shape: tuple, shape of the frame detections
+            belong to
+            :return numpy.ndarray of DETECTION_DTYPE
 
             @brief
-            Protected class method in which detected object is labeled
-            and rectangle frame for it is visualized.
+            Protected class method in which weak detections and classes
+            which are not of interest are filtered out and bounding boxes
+            are scaled to frame size and clipped, all in one pass.
+            Detections with box center outside of regions of interest
+            are filtered out as well.
         """
-        # unpacking both four  vertices of a square box
-        # start_x, start_y, end_x, end_y are of type numpy.int32
-        (start_x, start_y, end_x, end_y) = src_box.astype("int")
+        if detections is None:
+            return numpy.empty(0, dtype=DETECTION_DTYPE)
 
-        # labeling
-        label: str = "{}: {:.2f}%".format(
-            self._classes_of_interest[index], self._detection_confidence)
+        rows: numpy.ndarray = detections.reshape(-1, detections.shape[-1])
+        class_ids: numpy.ndarray = rows[:, 1].astype(numpy.int32)
 
-        try:
-            # drawing rectangle for detection frame
-            cv2.rectangle(img=self.image, pt1=(start_x, start_y),
-                          pt2=(end_x, end_y), color=self.__colors[index],
-                          thickness=2)
-
-            # variable used for correcting the y coordinate
-            y_coordinate: numpy.int32 = ImageProcessing \
-                .__coordinate_correction(numpy.int32(15), start_y)
-
-            # visualizing label string as text on the frame
-            cv2.putText(img=self.image, text=label,
-                        org=(start_x, y_coordinate),
-                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                        fontScale=0.5,
-                        color=self.__colors[index], thickness=2)
-        except cv2.error:
-            logging.error("Error occurred during creating region of interest "
-                          "frame borders ")
+        # filter out weak detections and unknown class indexes
+        keep: numpy.ndarray = (rows[:, 2] > self._arguments["confidence"]) & \
+            (class_ids >= 0) & (class_ids < len(self._classes_of_interest))
+        if self._allowed_class_ids is not None:
+            keep &= numpy.isin(class_ids, self._allowed_class_ids)
+
+        rows = rows[keep]
+        (image_height, image_width) = image_shape[:2]
+        boxes: numpy.ndarray = rows[:, 3:7] * numpy.array(
+            [image_width, image_height, image_width, image_height],
+            dtype=numpy.float32)
+        numpy.clip(boxes, 0, [image_width - 1, image_height - 1,
+                              image_width - 1, image_height - 1], out=boxes)
+        if self.__regions is not None:
+            inside: numpy.ndarray = self.__regions.contains(
+                (boxes[:, :2] + boxes[:, 2:]) / 2, image_shape)
+            rows = rows[inside]
+            boxes = boxes[inside]
+            keep[keep] = inside
+
+        filtered: numpy.ndarray = numpy.empty(rows.shape[0],
+                                              dtype=DETECTION_DTYPE)
+        filtered['class_id'] = class_ids[keep]
+        filtered['confidence'] = rows[:, 2]
+        filtered['box'] = boxes
+        filtered['track_id'] = -1
+        filtered['tracked'] = False
+
+        return filtered
 
     @staticmethod
-    def _filter_image(input_img: numpy.ndarray) -> numpy.ndarray:
+    def _filter_image(input_img: numpy.ndarray,
+                      output_img: numpy.ndarray = None) -> numpy.ndarray:
         """"
-            :param input_img: numpy.ndarray, input image
+            :param input_img: numpy.ndarray, input image ;
+            :param output_img: numpy.ndarray, preallocated image of the
+            same shape the result is written into, new image is created
+            when it is not given
             :return numpy.ndarray
 
             @brief
@@ -146,30 +591,8 @@ class ImageProcessing(CaffeModelHandler):
         """
         try:
             img_gaussian_blur: numpy.ndarray = cv2.GaussianBlur(
-                src=input_img, ksize=(3, 3), sigmaX=1)
+                src=input_img, ksize=(3, 3), sigmaX=1, dst=output_img)
 
             return img_gaussian_blur
         except cv2.error:
             logging.error("Error occurred while applying Gaussian blur")
-
-    @staticmethod
-    def __coordinate_correction(coordinate_correction_val: numpy.int32,
-                                original_coordinate: numpy.int32) -> \
-            numpy.int32:
-        """"
-            :param coordinate_correction_val: numpy.int32, correction value ;
-            :param original_coordinate: numpy.int32, original coordinate value ;
-            :return numpy.int32
-
-            @brief
-            Private static method in which coordinate is corrected.
-        """
-        if original_coordinate - coordinate_correction_val > \
-                coordinate_correction_val:
-            corrected_coordinate: numpy.int32 = original_coordinate - \
-                                                coordinate_correction_val
-        else:
-            corrected_coordinate: numpy.int32 = original_coordinate + \
-                                                coordinate_correction_val
-
-        return corrected_coordinate
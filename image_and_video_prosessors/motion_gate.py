@@ -0,0 +1,88 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import logging
+
+import cv2
+import numpy
+
+
+# pylint: disable=R0903, W0703, I1101
+class MotionGate:
+    """"
+        @brief Class in which is implemented logic for detecting static
+        frames. Frames are compared with the last frame with activity
+        on a downscaled grayscale copy, so static frames can reuse
+        previous detections instead of being passed through the network.
+    """
+
+    def __init__(self, activity_threshold: float = 0.01,
+                 pixel_threshold: int = 25, width: int = 160):
+        """"
+            :param activity_threshold: float, minimum fraction of changed
+            pixels for a frame with activity ;
+            :param pixel_threshold: int, minimum intensity difference of
+            a changed pixel ;
+            :param width: int, width of downscaled frame copy
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # private attribute for fraction of changed pixels threshold
+        self.__activity_threshold: float = activity_threshold
+        # private attribute for changed pixel intensity threshold
+        self.__pixel_threshold: int = pixel_threshold
+        # private attribute for downscaled frame width
+        self.__width: int = width
+        # private attribute holding downscaled reference frame
+        self.__reference: numpy.ndarray = None
+        # private attribute holding reusable difference image
+        self.__difference: numpy.ndarray = None
+
+    def __downscale(self, image: numpy.ndarray) -> numpy.ndarray:
+        """"
+            :param image: numpy.ndarray, frame image
+            :return numpy.ndarray
+
+            @brief Private class method in which blurred, downscaled
+            grayscale copy of the frame is created
+        """
+        (height, width) = image.shape[:2]
+        small: numpy.ndarray = cv2.resize(
+            image, (self.__width, max(1, height * self.__width // width)),
+            interpolation=cv2.INTER_LINEAR)
+        gray: numpy.ndarray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def is_static(self, image: numpy.ndarray) -> bool:
+        """"
+            :param image: numpy.ndarray, frame image
+            :return bool
+
+            @brief Public class method which tells whether the frame has
+            no activity compared to the reference frame. Frames with
+            activity become the new reference frame.
+        """
+        try:
+            gray: numpy.ndarray = self.__downscale(image)
+            if self.__reference is None or \
+                    self.__reference.shape != gray.shape:
+                self.__reference = gray
+                return False
+
+            self.__difference = cv2.absdiff(gray, self.__reference,
+                                            self.__difference)
+            changed: int = int(numpy.count_nonzero(
+                self.__difference > self.__pixel_threshold))
+            if changed < self.__activity_threshold * gray.size:
+                return True
+
+            self.__reference = gray
+            return False
+        except cv2.error:
+            logging.error("Error occurred during detecting motion")
+            return False
@@ -0,0 +1,208 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import logging
+
+import cv2
+import numpy
+
+from image_and_video_prosessors.image_processor import DETECTION_DTYPE
+
+
+# pylint: disable=R0903, W0703, I1101
+class ObjectTracker:
+    """"
+        @brief Class in which is implemented logic for propagating
+        detections between frames in which the network is not run.
+        Detections are associated with existing tracks by IoU, which
+        keeps track IDs stable, and boxes are moved with sparse
+        Lucas-Kanade optical flow of corner points inside them.
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, max_corners: int = 400,
+                 min_points: int = 3):
+        """"
+            :param iou_threshold: float, minimum IoU of detection and track
+            to be associated ;
+            :param max_corners: int, maximum number of corner points
+            followed in a frame ;
+            :param min_points: int, minimum number of followed points
+            needed for moving a box
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # private attribute for association IoU threshold
+        self.__iou_threshold: float = iou_threshold
+        # private attribute for maximum number of followed points
+        self.__max_corners: int = max_corners
+        # private attribute for minimum number of points per box
+        self.__min_points: int = min_points
+        # private attribute for track ID given to next new object
+        self.__next_track_id: int = 1
+        # private attribute holding currently tracked objects
+        self.__objects: numpy.ndarray = numpy.empty(0, dtype=DETECTION_DTYPE)
+        # private attribute holding previous grayscale frame
+        self.__previous_gray: numpy.ndarray = None
+        # private attribute holding followed points of shape (P, 1, 2)
+        self.__points: numpy.ndarray = None
+        # private attribute holding index of object owning each point
+        self.__point_owners: numpy.ndarray = None
+
+    @staticmethod
+    def iou_matrix(boxes_a: numpy.ndarray, boxes_b: numpy.ndarray) \
+            -> numpy.ndarray:
+        """"
+            :param boxes_a: numpy.ndarray, A by 4 array of boxes ;
+            :param boxes_b: numpy.ndarray, B by 4 array of boxes
+            :return numpy.ndarray, A by B array of IoU values
+
+            @brief Public static method in which intersection over union
+            of all pairs of boxes is calculated
+        """
+        boxes_a = boxes_a.astype(numpy.float32)[:, None, :]
+        boxes_b = boxes_b.astype(numpy.float32)[None, :, :]
+        width: numpy.ndarray = numpy.clip(
+            numpy.minimum(boxes_a[..., 2], boxes_b[..., 2]) -
+            numpy.maximum(boxes_a[..., 0], boxes_b[..., 0]), 0, None)
+        height: numpy.ndarray = numpy.clip(
+            numpy.minimum(boxes_a[..., 3], boxes_b[..., 3]) -
+            numpy.maximum(boxes_a[..., 1], boxes_b[..., 1]), 0, None)
+        intersection: numpy.ndarray = width * height
+        area_a: numpy.ndarray = (boxes_a[..., 2] - boxes_a[..., 0]) * \
+            (boxes_a[..., 3] - boxes_a[..., 1])
+        area_b: numpy.ndarray = (boxes_b[..., 2] - boxes_b[..., 0]) * \
+            (boxes_b[..., 3] - boxes_b[..., 1])
+
+        return intersection / numpy.maximum(area_a + area_b - intersection,
+                                            1e-6)
+
+    def __associate(self, objects: numpy.ndarray) -> None:
+        """"
+            :param objects: numpy.ndarray of DETECTION_DTYPE, new detections
+            :return None
+
+            @brief Private class method in which detections get track IDs
+            of the best overlapping tracks of the same class, greedily by
+            descending IoU. Unmatched detections start new tracks.
+        """
+        objects['track_id'] = -1
+        if len(self.__objects) and len(objects):
+            iou: numpy.ndarray = ObjectTracker.iou_matrix(
+                self.__objects['box'], objects['box'])
+            iou[self.__objects['class_id'][:, None] !=
+                objects['class_id'][None, :]] = 0
+            matched_tracks: numpy.ndarray = numpy.zeros(len(self.__objects),
+                                                        dtype=bool)
+            for flat_index in numpy.argsort(iou, axis=None)[::-1]:
+                (track, detection) = numpy.unravel_index(flat_index,
+                                                         iou.shape)
+                if iou[track, detection] < self.__iou_threshold:
+                    break
+                if matched_tracks[track] or \
+                        objects['track_id'][detection] >= 0:
+                    continue
+                objects['track_id'][detection] = \
+                    self.__objects['track_id'][track]
+                matched_tracks[track] = True
+
+        new_tracks: numpy.ndarray = objects['track_id'] < 0
+        objects['track_id'][new_tracks] = numpy.arange(
+            self.__next_track_id, self.__next_track_id + new_tracks.sum())
+        self.__next_track_id += int(new_tracks.sum())
+
+    def __select_points(self, gray: numpy.ndarray) -> None:
+        """"
+            :param gray: numpy.ndarray, grayscale frame
+            :return None
+
+            @brief Private class method in which corner points of the
+            frame are found and assigned to the boxes containing them
+        """
+        self.__points = None
+        self.__point_owners = None
+        if not len(self.__objects):
+            return
+
+        try:
+            corners: numpy.ndarray = cv2.goodFeaturesToTrack(
+                gray, maxCorners=self.__max_corners, qualityLevel=0.01,
+                minDistance=5)
+        except cv2.error:
+            logging.error("Error occurred during selecting points to track")
+            return
+        if corners is None:
+            return
+
+        boxes: numpy.ndarray = self.__objects['box']
+        points_x: numpy.ndarray = corners[:, 0, 0][:, None]
+        points_y: numpy.ndarray = corners[:, 0, 1][:, None]
+        inside: numpy.ndarray = (points_x >= boxes[:, 0]) & \
+            (points_x <= boxes[:, 2]) & (points_y >= boxes[:, 1]) & \
+            (points_y <= boxes[:, 3])
+        owned: numpy.ndarray = inside.any(axis=1)
+        self.__points = corners[owned]
+        self.__point_owners = inside[owned].argmax(axis=1)
+
+    def update(self, objects: numpy.ndarray, image: numpy.ndarray) \
+            -> numpy.ndarray:
+        """"
+            :param objects: numpy.ndarray of DETECTION_DTYPE, detections
+            of the frame ;
+            :param image: numpy.ndarray, frame image
+            :return numpy.ndarray of DETECTION_DTYPE
+
+            @brief Public class method in which tracks are replaced with
+            new detections, which get their track IDs
+        """
+        self.__associate(objects)
+        objects['tracked'] = False
+        self.__objects = objects.copy()
+        self.__previous_gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        self.__select_points(self.__previous_gray)
+
+        return objects
+
+    def predict(self, image: numpy.ndarray) -> numpy.ndarray:
+        """"
+            :param image: numpy.ndarray, frame image
+            :return numpy.ndarray of DETECTION_DTYPE
+
+            @brief Public class method in which tracked boxes are moved
+            by the median optical flow of their points
+        """
+        gray: numpy.ndarray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if self.__points is not None and len(self.__points) and \
+                self.__previous_gray is not None:
+            try:
+                (next_points, status, _) = cv2.calcOpticalFlowPyrLK(
+                    self.__previous_gray, gray, self.__points, None)
+                found: numpy.ndarray = status.ravel() == 1
+                shifts: numpy.ndarray = \
+                    (next_points - self.__points)[found, 0]
+                owners: numpy.ndarray = self.__point_owners[found]
+                (height, width) = gray.shape[:2]
+                for index in range(len(self.__objects)):
+                    object_shifts: numpy.ndarray = shifts[owners == index]
+                    if len(object_shifts) < self.__min_points:
+                        continue
+                    (shift_x, shift_y) = numpy.median(object_shifts, axis=0)
+                    box: numpy.ndarray = self.__objects['box'][index] + \
+                        numpy.rint([shift_x, shift_y, shift_x, shift_y]) \
+                        .astype(numpy.int32)
+                    self.__objects['box'][index] = numpy.clip(
+                        box, 0, [width - 1, height - 1, width - 1,
+                                 height - 1])
+                self.__points = next_points[found]
+                self.__point_owners = owners
+            except cv2.error:
+                logging.error("Error occurred during tracking objects")
+
+        self.__previous_gray = gray
+        objects: numpy.ndarray = self.__objects.copy()
+        objects['tracked'] = True
+
+        return objects
@@ -0,0 +1,126 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import json
+import logging
+
+import cv2
+import numpy
+
+
+# pylint: disable=R0903, W0703, I1101
+class RegionsOfInterest:
+    """"
+        @brief Class which holds static regions of a source in which
+        objects can appear. Bounding rectangles of the regions are the
+        only parts of frames passed through the network and detections
+        with box center outside of all regions are discarded. Rectangles
+        and masks are computed once per frame shape.
+    """
+
+    def __init__(self, polygons: list):
+        """"
+            :param polygons: list, polygons of type numpy.ndarray with
+            (x, y) vertices in frame pixels
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # private attribute holding region polygons
+        self.__polygons: list = polygons
+        # private attribute holding bounding rectangles for frame shapes
+        self.__rectangles: dict = {}
+        # private attribute holding region masks for frame shapes
+        self.__masks: dict = {}
+
+    def rectangles(self, image_shape: tuple) -> numpy.ndarray:
+        """"
+            :param image_shape: tuple, shape of the frame
+            :return numpy.ndarray of (start_x, start_y, end_x, end_y) rows
+
+            @brief Public class method which returns bounding rectangles
+            of the regions clipped to the frame, empty ones are left out
+        """
+        (image_height, image_width) = image_shape[:2]
+        rectangles: numpy.ndarray = self.__rectangles.get(
+            (image_height, image_width))
+        if rectangles is None:
+            rectangles = numpy.array(
+                [numpy.concatenate((polygon.min(axis=0),
+                                    polygon.max(axis=0) + 1))
+                 for polygon in self.__polygons], dtype=numpy.int32)
+            numpy.clip(rectangles, 0, [image_width, image_height,
+                                       image_width, image_height],
+                       out=rectangles)
+            rectangles = rectangles[(rectangles[:, 2] > rectangles[:, 0]) &
+                                    (rectangles[:, 3] > rectangles[:, 1])]
+            self.__rectangles[(image_height, image_width)] = rectangles
+
+        return rectangles
+
+    def contains(self, points: numpy.ndarray,
+                 image_shape: tuple) -> numpy.ndarray:
+        """"
+            :param points: numpy.ndarray, (x, y) rows in frame pixels ;
+            :param image_shape: tuple, shape of the frame
+            :return numpy.ndarray of bool
+
+            @brief Public class method which tells for every point
+            whether it lies inside of any region
+        """
+        (image_height, image_width) = image_shape[:2]
+        mask: numpy.ndarray = self.__masks.get((image_height, image_width))
+        if mask is None:
+            mask = numpy.zeros((image_height, image_width), dtype=numpy.uint8)
+            cv2.fillPoly(mask, self.__polygons, 1)
+            self.__masks[(image_height, image_width)] = mask
+
+        columns: numpy.ndarray = numpy.clip(
+            points[:, 0].astype(numpy.int32), 0, image_width - 1)
+        rows: numpy.ndarray = numpy.clip(
+            points[:, 1].astype(numpy.int32), 0, image_height - 1)
+
+        return mask[rows, columns] > 0
+
+
+def load_regions(file_name: str, source: str) -> RegionsOfInterest:
+    """"
+        :param file_name: str, path of JSON file with regions of sources ;
+        :param source: str, source of video stream
+        :return RegionsOfInterest
+
+        @brief Public function which returns regions of the source from
+        JSON file mapping sources to lists of regions, "default" key holds
+        regions of sources which are not listed. A region is given either
+        as {"rectangle": [start_x, start_y, end_x, end_y]} or as
+        {"polygon": [[x, y], ...]} in frame pixels. None is returned when
+        the source has no regions.
+    """
+    try:
+        with open(file_name) as regions_file:
+            sources: dict = json.load(regions_file)
+    except (IOError, ValueError):
+        logging.error("Error occurred during reading regions file")
+        return None
+
+    regions: list = sources.get(str(source), sources.get("default"))
+    if not regions:
+        return None
+
+    polygons: list = []
+    for region in regions:
+        if "rectangle" in region:
+            (start_x, start_y, end_x, end_y) = region["rectangle"]
+            polygons.append(numpy.array(
+                [[start_x, start_y], [end_x, start_y], [end_x, end_y],
+                 [start_x, end_y]], dtype=numpy.int32))
+        elif "polygon" in region and len(region["polygon"]) > 2:
+            polygons.append(numpy.array(region["polygon"],
+                                        dtype=numpy.int32))
+        else:
+            logging.warning("Region %s is ignored", region)
+
+    return RegionsOfInterest(polygons) if polygons else None
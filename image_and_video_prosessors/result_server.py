@@ -0,0 +1,404 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import http.server
+import json
+import logging
+import queue
+import socket
+import socketserver
+import threading
+
+import cv2
+import numpy
+
+# page served on the root path, it shows the annotated stream
+INDEX_PAGE: bytes = b"""<!DOCTYPE html>
+<html><head><title>Recognized Objects</title></head>
+<body><img src="/video.mjpg" alt="Recognized Objects"/>
+<p><a href="/detections">detections (NDJSON)</a> |
+<a href="/events">detections (server-sent events)</a></p></body></html>
+"""
+
+# boundary separating JPEG frames of MJPEG stream
+MJPEG_BOUNDARY: str = "frame"
+
+
+# pylint: disable=R0903
+class StreamClient:
+    """"
+        @brief Class which holds bounded queue of data waiting to be
+        sent to a single connected client
+    """
+
+    __slots__ = ('kind', 'data', 'closed')
+
+    def __init__(self, kind: str, queue_size: int):
+        """"
+            :param kind: str, 'video', 'ndjson' or 'sse' ;
+            :param queue_size: int, maximum number of waiting items
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # public attribute for kind of the stream
+        self.kind: str = kind
+        # public attribute to be used as queue of data to be sent
+        self.data: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        # public attribute set when client is dropped or server stops
+        self.closed: threading.Event = threading.Event()
+
+
+# pylint: disable=R0903
+class ThreadingHTTPServer(socketserver.ThreadingMixIn,
+                          http.server.HTTPServer):
+    """"
+        @brief Class of HTTP server handling every connection in its own
+        daemon thread
+    """
+
+    daemon_threads = True
+
+
+# pylint: disable=R0903, W0703, I1101
+class ResultRequestHandler(http.server.BaseHTTPRequestHandler):
+    """"
+        @brief Class in which requests of result server are handled,
+        streams are written until the client disconnects, is dropped or
+        the server stops
+    """
+
+    # socket timeout in seconds, writes to stalled clients fail
+    timeout = 5.0
+
+    def do_GET(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which GET request is routed to
+            index page, MJPEG stream or detections stream
+        """
+        path: str = self.path.split('?')[0]
+        if path == '/':
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(INDEX_PAGE)))
+            self.end_headers()
+            self.wfile.write(INDEX_PAGE)
+        elif path == '/video.mjpg':
+            self.__stream('video', 'multipart/x-mixed-replace; boundary=' +
+                          MJPEG_BOUNDARY)
+        elif path == '/detections':
+            self.__stream('ndjson', 'application/x-ndjson')
+        elif path == '/events':
+            self.__stream('sse', 'text/event-stream')
+        else:
+            self.send_error(404)
+
+    def __stream(self, kind: str, content_type: str) -> None:
+        """"
+            :param kind: str, 'video', 'ndjson' or 'sse' ;
+            :param content_type: str, content type of the stream
+            :return None
+
+            @brief Private class method in which client is registered and
+            data published for it are written as they come
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+
+        client: StreamClient = self.server.result_server.add_client(kind)
+        try:
+            while not client.closed.is_set():
+                try:
+                    data: bytes = client.data.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                self.wfile.write(data)
+                self.wfile.flush()
+        except (OSError, socket.timeout):
+            # client disconnected or stalled
+            pass
+        finally:
+            self.server.result_server.remove_client(client)
+
+    def log_message(self, format: str, *args) -> None:
+        """"
+            :param format: str, message format ;
+            :param args: message arguments
+            :return None
+
+            @brief Public class method in which requests are logged with
+            debug level instead of being printed to stderr
+        """
+        logging.debug("Result server %s: %s", self.address_string(),
+                      format % args)
+
+
+# pylint: disable=R0902, R0903, W0703, I1101
+class ResultServer:
+    """"
+        @brief Class in which annotated frames are served as MJPEG stream
+        and detections of every frame as newline delimited JSON or
+        server-sent events over HTTP. The latest published frame is JPEG
+        encoded once by a background thread no matter how many clients
+        are connected, frames published while it is encoded are skipped.
+        Every client has a bounded queue, clients which do not keep up
+        are dropped, so publishing never waits for them.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8080,
+                 jpeg_quality: int = 80, client_queue_size: int = 8):
+        """"
+            :param host: str, address the server listens on ;
+            :param port: int, port the server listens on, 0 picks a free
+            port ;
+            :param jpeg_quality: int, JPEG quality of MJPEG frames 0-100 ;
+            :param client_queue_size: int, maximum number of frames or
+            detection records waiting for a client before it is dropped
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # private attribute for listened address
+        self.__address: tuple = (host, port)
+        # private attribute for JPEG encoding parameters
+        self.__jpeg_parameters: list = [int(cv2.IMWRITE_JPEG_QUALITY),
+                                        int(jpeg_quality)]
+        # private attribute for size of client queues
+        self.__client_queue_size: int = client_queue_size
+        # private attribute to be used as HTTP server holder
+        self.__http_server: ThreadingHTTPServer = None
+        # private attribute to be used as server thread holder
+        self.__server_thread: threading.Thread = None
+        # private attribute to be used as encoder thread holder
+        self.__encoder_thread: threading.Thread = None
+        # private attribute holding connected clients
+        self.__clients: list = []
+        # private attribute guarding connected clients
+        self.__clients_lock: threading.Lock = threading.Lock()
+        # private attribute holding the latest frame waiting for
+        # encoding, None when it was encoded
+        self.__latest_frame: numpy.ndarray = None
+        # private attribute used to wake up encoder thread
+        self.__frame_ready: threading.Condition = threading.Condition()
+        # private attribute set when server stops
+        self.__stopped: threading.Event = threading.Event()
+        # private attribute for number of encoded frames
+        self.__encoded_frames_counter: int = 0
+        # private attribute for number of frames replaced before encoding
+        self.__skipped_frames_counter: int = 0
+        # private attribute for number of dropped clients
+        self.__dropped_clients_counter: int = 0
+
+    def start(self) -> 'ResultServer':
+        """"
+            :return ResultServer
+
+            @brief Public class method in which HTTP server and encoder
+            threads are started
+        """
+        self.__http_server = ThreadingHTTPServer(self.__address,
+                                                 ResultRequestHandler)
+        self.__http_server.result_server = self
+        self.__address = self.__http_server.server_address[:2]
+        self.__server_thread = threading.Thread(
+            target=self.__http_server.serve_forever, name="result-server",
+            daemon=True)
+        self.__server_thread.start()
+        self.__encoder_thread = threading.Thread(
+            target=self.__encoder, name="result-encoder", daemon=True)
+        self.__encoder_thread.start()
+
+        return self
+
+    def url(self) -> str:
+        """"
+            :return str
+
+            @brief Public class method which returns URL of the server
+        """
+        return "http://{}:{}/".format(*self.__address)
+
+    def stop(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which clients are disconnected
+            and server and encoder threads are stopped
+        """
+        if self.__http_server is None:
+            return
+
+        self.__stopped.set()
+        with self.__frame_ready:
+            self.__frame_ready.notify()
+        with self.__clients_lock:
+            for client in self.__clients:
+                client.closed.set()
+        self.__http_server.shutdown()
+        self.__http_server.server_close()
+        self.__server_thread.join()
+        self.__encoder_thread.join()
+        self.__http_server = None
+
+    def add_client(self, kind: str) -> StreamClient:
+        """"
+            :param kind: str, 'video', 'ndjson' or 'sse'
+            :return StreamClient
+
+            @brief Public class method in which connected client is
+            registered, it is closed at once when server stops
+        """
+        client: StreamClient = StreamClient(kind, self.__client_queue_size)
+        with self.__clients_lock:
+            self.__clients.append(client)
+        if self.__stopped.is_set():
+            client.closed.set()
+
+        return client
+
+    def remove_client(self, client: StreamClient) -> None:
+        """"
+            :param client: StreamClient, disconnected client
+            :return None
+
+            @brief Public class method in which client is unregistered
+        """
+        with self.__clients_lock:
+            if client in self.__clients:
+                self.__clients.remove(client)
+
+    def video_clients(self) -> int:
+        """"
+            :return int
+
+            @brief Public class method which returns number of connected
+            MJPEG clients, frames need not be annotated without them
+        """
+        with self.__clients_lock:
+            return sum(client.kind == 'video' for client in self.__clients)
+
+    def detection_clients(self) -> int:
+        """"
+            :return int
+
+            @brief Public class method which returns number of connected
+            detection stream clients
+        """
+        with self.__clients_lock:
+            return sum(client.kind != 'video' for client in self.__clients)
+
+    def publish(self, frame_number: int, timestamp: float,
+                image: numpy.ndarray, objects: numpy.ndarray,
+                class_names: list) -> None:
+        """"
+            :param frame_number: int, index of frame in the source ;
+            :param timestamp: float, wall clock capture time in seconds
+            since the epoch ;
+            :param image: numpy.ndarray, annotated frame, it is copied,
+            None when frame is not streamed ;
+            :param objects: numpy.ndarray of DETECTION_DTYPE, filtered
+            detections of the frame ;
+            :param class_names: list, class labels indexed by class id
+            :return None
+
+            @brief Public class method in which frame is handed to encoder
+            thread and detections are sent to detection stream clients.
+            Nothing is done for streams without clients, it never waits
+            for clients.
+        """
+        if self.detection_clients():
+            record: str = json.dumps({
+                "frame_number": frame_number,
+                "timestamp": round(timestamp, 6),
+                "detections": [
+                    dict({"class": class_names[class_id],
+                          "confidence": round(confidence, 4),
+                          "box": box},
+                         **({"track_id": track_id} if track_id >= 0
+                            else {}))
+                    for class_id, confidence, box, track_id in zip(
+                        objects['class_id'].tolist(),
+                        objects['confidence'].tolist(),
+                        objects['box'].tolist(),
+                        objects['track_id'].tolist())]})
+            self.__send({'ndjson': (record + "\n").encode(),
+                         'sse': ("data: " + record + "\n\n").encode()})
+
+        if image is not None and self.video_clients():
+            with self.__frame_ready:
+                if self.__latest_frame is not None:
+                    self.__skipped_frames_counter += 1
+                self.__latest_frame = image.copy()
+                self.__frame_ready.notify()
+
+    def statistics(self) -> dict:
+        """"
+            :return dict
+
+            @brief Public class method which returns streaming statistics
+            as named rows
+        """
+        return {"Streamed frames": self.__encoded_frames_counter,
+                "Skipped stream frames": self.__skipped_frames_counter,
+                "Dropped stream clients": self.__dropped_clients_counter}
+
+    def __send(self, data: dict) -> None:
+        """"
+            :param data: dict, encoded data for kinds of clients
+            :return None
+
+            @brief Private class method in which data are queued for
+            clients of given kinds, clients with full queue are dropped
+        """
+        with self.__clients_lock:
+            for client in list(self.__clients):
+                if client.kind not in data:
+                    continue
+                try:
+                    client.data.put_nowait(data[client.kind])
+                except queue.Full:
+                    client.closed.set()
+                    self.__clients.remove(client)
+                    self.__dropped_clients_counter += 1
+                    logging.warning("Slow %s stream client is dropped",
+                                    client.kind)
+
+    def __encoder(self) -> None:
+        """"
+            :return None
+
+            @brief Private class method run by the encoder thread, the
+            latest frame is encoded once and sent to all MJPEG clients
+        """
+        while True:
+            with self.__frame_ready:
+                while self.__latest_frame is None and \
+                        not self.__stopped.is_set():
+                    self.__frame_ready.wait()
+                if self.__stopped.is_set():
+                    return
+                image: numpy.ndarray = self.__latest_frame
+                self.__latest_frame = None
+
+            try:
+                (encoded, jpeg) = cv2.imencode('.jpg', image,
+                                               self.__jpeg_parameters)
+            except cv2.error:
+                encoded = False
+            if not encoded:
+                logging.error("Error occurred during encoding stream frame")
+                continue
+
+            self.__encoded_frames_counter += 1
+            self.__send({'video': b"".join((
+                "--{}\r\nContent-Type: image/jpeg\r\n"
+                "Content-Length: {}\r\n\r\n".format(
+                    MJPEG_BOUNDARY, len(jpeg)).encode(),
+                jpeg.tobytes(), b"\r\n"))})
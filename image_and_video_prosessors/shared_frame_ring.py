@@ -0,0 +1,413 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.8
+openCV version: 4.7.12
+"""
+import functools
+import logging
+import multiprocessing
+import queue
+from multiprocessing import shared_memory
+
+import cv2
+import numpy
+
+from image_and_video_prosessors.frame_sources import READ_TIMEOUT, \
+    LatestFrameSource, create_frame_source, image_file_paths, \
+    is_live_source, live_source_address
+
+# structured type of metadata of a single ring slot: number and capture
+# time of the frame, its shape and number of readers which did not
+# release the slot yet
+SLOT_METADATA_DTYPE: numpy.dtype = numpy.dtype([
+    ('frame_number', numpy.int64), ('capture_time', numpy.float64),
+    ('height', numpy.int32), ('width', numpy.int32),
+    ('channels', numpy.int32), ('readers', numpy.int32)])
+
+
+# pylint: disable=R0903, W0703, I1101
+class SharedFrameRing:
+    """"
+        @brief Class in which frames are passed between processes through
+        a ring of fixed size slots in shared memory. Writer takes a free
+        slot, copies the frame into it once and publishes only the slot
+        index, readers get the frame as a view of the slot without
+        copying. Slot is returned to free slots when the last of its
+        readers releases it. Free slots are held in a process-safe queue
+        and reader counts are guarded by a process-safe lock. The ring
+        is passed to a process when it is started, it attaches to the
+        same shared memory.
+    """
+
+    def __init__(self, slots: int, slot_size: int):
+        """"
+            :param slots: int, number of slots ;
+            :param slot_size: int, maximum frame size in bytes
+
+            @brief Class instantiation: setup of class attributes, shared
+            memory is created
+        """
+        context = multiprocessing.get_context('spawn')
+        # private attribute for number of slots
+        self.__slots: int = max(1, slots)
+        # private attribute for slot size in bytes
+        self.__slot_size: int = slot_size
+        # private attribute to be used as shared memory holder
+        self.__memory: shared_memory.SharedMemory = \
+            shared_memory.SharedMemory(
+                create=True, size=self.__slots *
+                (slot_size + SLOT_METADATA_DTYPE.itemsize))
+        # private attribute guarding reader counts
+        self.__lock = context.Lock()
+        # private attribute holding indexes of free slots
+        self.__free_slots = context.Queue()
+        for slot in range(self.__slots):
+            self.__free_slots.put(slot)
+        # private attribute which is True in the process which created
+        # shared memory and removes it
+        self.__owner: bool = True
+        self.__attach_arrays()
+
+    def __attach_arrays(self) -> None:
+        """"
+            :return None
+
+            @brief Private class method in which slot and metadata arrays
+            are created over shared memory
+        """
+        # private attribute for slots as rows of bytes
+        self.__frames: numpy.ndarray = numpy.ndarray(
+            (self.__slots, self.__slot_size), dtype=numpy.uint8,
+            buffer=self.__memory.buf)
+        # private attribute for metadata of slots
+        self.__metadata: numpy.ndarray = numpy.ndarray(
+            self.__slots, dtype=SLOT_METADATA_DTYPE, buffer=self.__memory.buf,
+            offset=self.__frames.nbytes)
+
+    def __getstate__(self) -> dict:
+        """"
+            :return dict
+
+            @brief Class method which returns state passed to started
+            process, shared memory is passed by its name
+        """
+        return {"slots": self.__slots, "slot_size": self.__slot_size,
+                "name": self.__memory.name, "lock": self.__lock,
+                "free_slots": self.__free_slots}
+
+    def __setstate__(self, state: dict) -> None:
+        """"
+            :param state: dict, state returned by __getstate__
+            :return None
+
+            @brief Class method in which ring is attached to shared
+            memory in started process
+        """
+        self.__slots = state["slots"]
+        self.__slot_size = state["slot_size"]
+        self.__memory = shared_memory.SharedMemory(name=state["name"])
+        self.__lock = state["lock"]
+        self.__free_slots = state["free_slots"]
+        self.__owner = False
+        self.__attach_arrays()
+
+    @property
+    def slot_size(self) -> int:
+        """"
+            :return int
+
+            @brief Public property for maximum frame size in bytes
+        """
+        return self.__slot_size
+
+    def acquire(self, timeout: float = None) -> int:
+        """"
+            :param timeout: float, maximum wait for a free slot in seconds,
+            it is waited until a slot is released when it is not given
+            :return int
+
+            @brief Public class method which returns index of a free slot,
+            None is returned when no slot was released in time
+        """
+        try:
+            return self.__free_slots.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def write(self, slot: int, image: numpy.ndarray, frame_number: int,
+              capture_time: float, readers: int = 1) -> None:
+        """"
+            :param slot: int, index of acquired slot ;
+            :param image: numpy.ndarray, frame image which fits into slot ;
+            :param frame_number: int, number of frame ;
+            :param capture_time: float, time.perf_counter() time at which
+            frame was captured ;
+            :param readers: int, number of readers which release the slot
+            :return None
+
+            @brief Public class method in which frame is copied into the
+            slot and its metadata are set
+        """
+        view: numpy.ndarray = self.__frames[slot, :image.nbytes]
+        numpy.copyto(view, image.reshape(-1))
+        with self.__lock:
+            metadata: numpy.ndarray = self.__metadata[slot]
+            metadata['frame_number'] = frame_number
+            metadata['capture_time'] = capture_time
+            (metadata['height'], metadata['width']) = image.shape[:2]
+            metadata['channels'] = image.shape[2] if image.ndim > 2 else 1
+            metadata['readers'] = readers
+
+    def frame(self, slot: int) -> numpy.ndarray:
+        """"
+            :param slot: int, index of written slot
+            :return numpy.ndarray
+
+            @brief Public class method which returns frame of the slot as
+            a view of shared memory, it is valid until slot is released
+        """
+        metadata: numpy.ndarray = self.__metadata[slot]
+        shape: tuple = (int(metadata['height']), int(metadata['width']),
+                        int(metadata['channels']))
+
+        return self.__frames[slot, :numpy.prod(shape)].reshape(shape)
+
+    def metadata(self, slot: int) -> tuple:
+        """"
+            :param slot: int, index of written slot
+            :return tuple of int frame number and float capture time
+
+            @brief Public class method which returns metadata of the slot
+        """
+        return int(self.__metadata[slot]['frame_number']), \
+            float(self.__metadata[slot]['capture_time'])
+
+    def release(self, slot: int) -> None:
+        """"
+            :param slot: int, index of read slot
+            :return None
+
+            @brief Public class method in which reader releases the slot,
+            slot is free for writing after its last reader released it
+        """
+        with self.__lock:
+            self.__metadata[slot]['readers'] -= 1
+            free: bool = self.__metadata[slot]['readers'] <= 0
+        if free:
+            self.__free_slots.put(slot)
+
+    def close(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which shared memory is detached,
+            it is removed by the process which created it
+        """
+        del self.__frames
+        del self.__metadata
+        try:
+            self.__memory.close()
+        except BufferError:
+            # frames are still referenced, memory is detached at exit
+            logging.warning("Shared frame ring is still in use")
+        if self.__owner:
+            self.__memory.unlink()
+
+
+def estimate_slot_size(source: str) -> int:
+    """"
+        :param source: str, source of video stream
+        :return int
+
+        @brief Public function which returns size in bytes of frames of
+        the source - frame size from video file header, size of the first
+        image file or size of a 1080p frame for live sources
+    """
+    default_size: int = 1920 * 1080 * 3
+    if is_live_source(source):
+        return default_size
+
+    paths: list = image_file_paths(source)
+    if paths is not None:
+        image: numpy.ndarray = cv2.imread(paths[0]) if paths else None
+        return default_size if image is None else image.nbytes
+
+    capture: cv2.VideoCapture = cv2.VideoCapture(source)
+    try:
+        size: int = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH) *
+                        capture.get(cv2.CAP_PROP_FRAME_HEIGHT)) * 3
+    finally:
+        capture.release()
+
+    return size or default_size
+
+
+def capture_frames(source: str, ring: SharedFrameRing, ready_slots,
+                   stop_event, frame_range: tuple) -> None:
+    """"
+        :param source: str, source of video stream ;
+        :param ring: SharedFrameRing, ring frames are written into ;
+        :param ready_slots: multiprocessing.Queue, indexes of written
+        slots, None is put at the end of source ;
+        :param stop_event: multiprocessing.Event, event which stops
+        capturing ;
+        :param frame_range: tuple, index of the first frame and index
+        after the last frame read from offline source
+        :return None
+
+        @brief Public function run in capture process in which frames of
+        the source are written into the ring. Offline sources wait for a
+        free slot, frames of live sources are dropped when no slot is
+        free. Frames larger than a slot are downsized to fit.
+    """
+    live: bool = is_live_source(source)
+    stream = LatestFrameSource(live_source_address(source)).start() if live \
+        else create_frame_source(source, start_frame=frame_range[0],
+                                 end_frame=frame_range[1]).start()
+    frame_number: int = 0
+    try:
+        while not stop_event.is_set():
+            frame: numpy.ndarray = stream.read()
+            if frame is None:
+                if live:
+                    continue
+                break
+
+            if frame.nbytes > ring.slot_size:
+                scale: float = (ring.slot_size / frame.nbytes) ** 0.5
+                frame = cv2.resize(frame, (int(frame.shape[1] * scale),
+                                           int(frame.shape[0] * scale)),
+                                   interpolation=cv2.INTER_AREA)
+            slot: int = None
+            while slot is None and not stop_event.is_set():
+                slot = ring.acquire(timeout=0 if live else 0.1)
+                if live:
+                    break
+            if slot is None:
+                continue
+
+            frame_number += 1
+            ring.write(slot, frame, frame_number, stream.capture_time)
+            ready_slots.put(slot)
+    except Exception:
+        logging.error("Error occurred during capturing frames")
+    finally:
+        stream.stop()
+        ready_slots.put(None)
+        ring.close()
+
+
+# pylint: disable=R0903, W0703, I1101
+class CaptureProcessSource:
+    """"
+        @brief Class in which frames are captured or decoded by a separate
+        process and passed through shared frame ring. Read frames are
+        views of ring slots, they are released by the callable returned
+        by frame_release. The class has the start/read/stop interface of
+        imutils video streams.
+    """
+
+    def __init__(self, source: str, slot_size: int, slots: int = 16,
+                 frame_range: tuple = (0, None)):
+        """"
+            :param source: str, source of video stream ;
+            :param slot_size: int, maximum frame size in bytes ;
+            :param slots: int, number of ring slots ;
+            :param frame_range: tuple, index of the first frame and index
+            after the last frame read from offline source
+
+            @brief Class instantiation: setup of class attributes
+        """
+        context = multiprocessing.get_context('spawn')
+        # private attribute for source of video stream
+        self.__source: str = source
+        # private attribute for read frame range of offline source
+        self.__frame_range: tuple = frame_range
+        # private attribute to be used as shared frame ring
+        self.__ring: SharedFrameRing = SharedFrameRing(slots, slot_size)
+        # private attribute holding indexes of written slots
+        self.__ready_slots = context.Queue()
+        # private attribute used to signal capture process to stop
+        self.__stop_event = context.Event()
+        # private attribute to be used as capture process holder
+        self.__process = None
+        # private attribute set when all frames were read
+        self.__exhausted: bool = False
+        # private attribute for slot of the last read frame
+        self.__slot: int = None
+        # public attribute for time.perf_counter() time at which the
+        # last read frame was captured
+        self.capture_time: float = None
+
+    def start(self) -> 'CaptureProcessSource':
+        """"
+            :return CaptureProcessSource
+
+            @brief Public class method in which capture process is started
+        """
+        context = multiprocessing.get_context('spawn')
+        self.__process = context.Process(
+            target=capture_frames, name="frame-capture", daemon=True,
+            args=(self.__source, self.__ring, self.__ready_slots,
+                  self.__stop_event, self.__frame_range))
+        self.__process.start()
+
+        return self
+
+    def read(self) -> numpy.ndarray:
+        """"
+            :return numpy.ndarray
+
+            @brief Public class method which returns next frame as a view
+            of its ring slot. None is returned at the end of source and
+            READ_TIMEOUT when no frame was captured within one second,
+            e.g. while capture process starts or decoding is slow.
+        """
+        if self.__exhausted:
+            return None
+
+        try:
+            slot: int = self.__ready_slots.get(timeout=1.0)
+        except queue.Empty:
+            return READ_TIMEOUT
+        if slot is None:
+            self.__exhausted = True
+            return None
+
+        self.__slot = slot
+        self.capture_time = self.__ring.metadata(slot)[1]
+
+        return self.__ring.frame(slot)
+
+    def frame_release(self):
+        """"
+            :return callable
+
+            @brief Public class method which returns function releasing
+            ring slot of the last read frame
+        """
+        return functools.partial(self.__ring.release, self.__slot)
+
+    def stop(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which capture process is stopped
+            and shared frame ring is removed
+        """
+        self.__stop_event.set()
+        if self.__process is not None:
+            # unread slots are released, so capture process is not
+            # blocked on a full ring
+            while self.__process.is_alive():
+                try:
+                    slot: int = self.__ready_slots.get(timeout=0.1)
+                    if slot is not None:
+                        self.__ring.release(slot)
+                except queue.Empty:
+                    pass
+            self.__process.join()
+            self.__process = None
+        self.__ring.close()
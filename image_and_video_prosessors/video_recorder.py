@@ -0,0 +1,325 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import collections
+import logging
+import os
+import queue
+import threading
+
+import cv2
+import numpy
+
+from report_handlers.latency_handler import StageTimer
+
+
+# pylint: disable=R0902, R0903, W0703, I1101
+class VideoRecorder:
+    """"
+        @brief Class in which annotated frames are encoded into video
+        files by a background thread fed by a bounded queue. Video is
+        rotated into segments bounded by duration or file size. In
+        detections only mode frames are saved only around frames with
+        detections, with pre-roll frames kept in memory and post-roll
+        frames saved after the last detection.
+    """
+
+    # private class attribute used as end of stream marker
+    __END_OF_STREAM: object = object()
+
+    def __init__(self, directory: str, fourcc: int, fps: float = None,
+                 queue_size: int = 64, segment_duration: float = None,
+                 segment_size: float = None, detections_only: bool = False,
+                 pre_roll: float = 2.0, post_roll: float = 2.0,
+                 stage_timer: StageTimer = None):
+        """"
+            :param directory: str, directory video files are saved in ;
+            :param fourcc: int, video codec ;
+            :param fps: float, frame rate of saved video, it is measured
+            from capture times of frames when it is not given ;
+            :param queue_size: int, maximum number of frames waiting to
+            be encoded ;
+            :param segment_duration: float, maximum duration of a segment
+            in seconds ;
+            :param segment_size: float, maximum size of a segment in MB ;
+            :param detections_only: bool, True when only frames around
+            frames with detections are saved ;
+            :param pre_roll: float, seconds saved before the first frame
+            with detections ;
+            :param post_roll: float, seconds saved after the last frame
+            with detections ;
+            :param stage_timer: StageTimer, timer encoding latency is
+            recorded with
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # private attribute for directory of video files
+        self.__directory: str = directory
+        # private attribute for video codec
+        self.__fourcc: int = fourcc
+        # private attribute for frame rate given by the source
+        self.__fps: float = fps
+        # private attribute for maximum segment duration
+        self.__segment_duration: float = segment_duration
+        # private attribute for maximum segment size in bytes
+        self.__segment_size: float = None if segment_size is None \
+            else segment_size * 2 ** 20
+        # private attribute which is True in detections only mode
+        self.__detections_only: bool = detections_only
+        # private attribute for pre-roll and post-roll duration
+        self.__roll: tuple = (pre_roll, post_roll)
+        # private attribute for timer of encoding latency
+        self.__stage_timer: StageTimer = stage_timer
+        # private attribute to be used as queue of frames to be encoded
+        self.__frames: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        # private attribute to be used as encoder thread holder
+        self.__encoder_thread: threading.Thread = None
+        # private attribute holding capture times of the latest frames
+        # the frame rate is measured from
+        self.__capture_times: collections.deque = collections.deque(
+            maxlen=30)
+        # private attribute holding frames waiting for the first segment
+        # or kept as pre-roll
+        self.__pending: collections.deque = collections.deque()
+        # private attribute to be used as video writer of current segment
+        self.__video_writer: cv2.VideoWriter = None
+        # private attribute for path of current segment
+        self.__segment_path: str = None
+        # private attribute for frame rate of current segment
+        self.__segment_fps: float = None
+        # private attribute for number of frames in current segment
+        self.__segment_frames: int = 0
+        # private attribute for number of post-roll frames left
+        self.__post_roll_left: int = 0
+        # private attribute for number of saved segments
+        self.__segments_counter: int = 0
+        # private attribute for number of saved frames
+        self.__written_frames_counter: int = 0
+
+    def start(self) -> 'VideoRecorder':
+        """"
+            :return VideoRecorder
+
+            @brief Public class method in which encoder thread is started
+        """
+        self.__encoder_thread = threading.Thread(target=self.__encoder,
+                                                 name="video-encoder",
+                                                 daemon=True)
+        self.__encoder_thread.start()
+
+        return self
+
+    def write(self, image: numpy.ndarray, capture_time: float,
+              has_detections: bool = True, release=None) -> None:
+        """"
+            :param image: numpy.ndarray, annotated frame, it must not be
+            changed afterwards ;
+            :param capture_time: float, time.perf_counter() time at which
+            frame was captured ;
+            :param has_detections: bool, True when objects are detected
+            in the frame ;
+            :param release: callable, function called when frame buffer,
+            e.g. shared frame ring slot, is not used anymore, frames kept
+            in memory are copied
+            :return None
+
+            @brief Public class method in which frame is queued for
+            encoding, it waits while the queue is full
+        """
+        self.__frames.put((image, capture_time, has_detections, release))
+
+    def close(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which queued frames are encoded,
+            encoder thread is stopped and the last segment is closed
+        """
+        if self.__encoder_thread is None:
+            return
+
+        self.__frames.put(VideoRecorder.__END_OF_STREAM)
+        self.__encoder_thread.join()
+        self.__encoder_thread = None
+
+    def statistics(self) -> dict:
+        """"
+            :return dict
+
+            @brief Public class method which returns recording statistics
+            as named rows
+        """
+        return {"Recorded frames": self.__written_frames_counter,
+                "Video segments": self.__segments_counter}
+
+    def __measured_fps(self) -> float:
+        """"
+            :return float
+
+            @brief Private class method which returns frame rate given by
+            the source or measured from capture times of the latest
+            frames and limited to 1 - 120 FPS, 20 FPS is used until it
+            can be measured
+        """
+        if self.__fps:
+            return self.__fps
+        if len(self.__capture_times) > 1 and \
+                self.__capture_times[-1] > self.__capture_times[0]:
+            return min(max((len(self.__capture_times) - 1) /
+                           (self.__capture_times[-1] -
+                            self.__capture_times[0]), 1.0), 120.0)
+
+        return 20.0
+
+    def __open_segment(self, image: numpy.ndarray) -> None:
+        """"
+            :param image: numpy.ndarray, first frame of the segment
+            :return None
+
+            @brief Private class method in which video writer of the next
+            segment is created
+        """
+        self.__segment_fps = self.__measured_fps()
+        self.__segment_path = os.path.join(
+            self.__directory,
+            'annotated_video.avi' if not self.__is_segmented() else
+            'annotated_video_{:04d}.avi'.format(self.__segments_counter))
+        self.__video_writer = cv2.VideoWriter(
+            self.__segment_path, self.__fourcc, self.__segment_fps,
+            (image.shape[1], image.shape[0]))
+        self.__segment_frames = 0
+        self.__segments_counter += 1
+
+    def __close_segment(self) -> None:
+        """"
+            :return None
+
+            @brief Private class method in which video writer of current
+            segment is released
+        """
+        if self.__video_writer is not None:
+            self.__video_writer.release()
+            self.__video_writer = None
+
+    def __is_segmented(self) -> bool:
+        """"
+            :return bool
+
+            @brief Private class method which tells whether video is saved
+            in numbered segments instead of a single file
+        """
+        return self.__detections_only or \
+            self.__segment_duration is not None or \
+            self.__segment_size is not None
+
+    def __is_segment_full(self) -> bool:
+        """"
+            :return bool
+
+            @brief Private class method which tells whether current
+            segment reached its duration or size limit
+        """
+        if self.__segment_duration is not None and \
+                self.__segment_frames >= \
+                self.__segment_duration * self.__segment_fps:
+            return True
+
+        return self.__segment_size is not None and \
+            os.path.isfile(self.__segment_path) and \
+            os.path.getsize(self.__segment_path) >= self.__segment_size
+
+    def __write_frame(self, image: numpy.ndarray) -> None:
+        """"
+            :param image: numpy.ndarray, frame to be saved
+            :return None
+
+            @brief Private class method in which frame is encoded into
+            current segment, segment is rotated when it is full
+        """
+        if self.__video_writer is not None and self.__is_segment_full():
+            self.__close_segment()
+        if self.__video_writer is None:
+            self.__open_segment(image)
+
+        try:
+            if self.__stage_timer is None:
+                self.__video_writer.write(image)
+            else:
+                with self.__stage_timer.measure("encode"):
+                    self.__video_writer.write(image)
+            self.__segment_frames += 1
+            self.__written_frames_counter += 1
+        except cv2.error:
+            logging.error("Error occurred during saving video frame")
+
+    def __record(self, image: numpy.ndarray, has_detections: bool,
+                 borrowed: bool = False) -> None:
+        """"
+            :param image: numpy.ndarray, annotated frame ;
+            :param has_detections: bool, True when objects are detected
+            in the frame ;
+            :param borrowed: bool, True when frame buffer is released
+            after the call, so the frame is copied when it is kept
+            :return None
+
+            @brief Private class method in which frame is saved, kept
+            as pre-roll or skipped. Without detections only mode the
+            first frames are kept until frame rate can be measured.
+        """
+        if not self.__detections_only:
+            self.__pending.append(image.copy() if borrowed else image)
+            if self.__video_writer is None and not self.__fps and \
+                    len(self.__pending) < self.__capture_times.maxlen:
+                return
+            while self.__pending:
+                self.__write_frame(self.__pending.popleft())
+            return
+
+        fps: float = self.__measured_fps()
+        if has_detections:
+            while self.__pending:
+                self.__write_frame(self.__pending.popleft())
+            self.__write_frame(image)
+            self.__post_roll_left = int(round(self.__roll[1] * fps))
+        elif self.__post_roll_left > 0:
+            self.__write_frame(image)
+            self.__post_roll_left -= 1
+        else:
+            # event is over, next event is saved in a new segment
+            self.__close_segment()
+            self.__pending.append(image.copy() if borrowed else image)
+            while len(self.__pending) > int(round(self.__roll[0] * fps)):
+                self.__pending.popleft()
+
+    def __encoder(self) -> None:
+        """"
+            :return None
+
+            @brief Private class method run by the encoder thread
+        """
+        while True:
+            item = self.__frames.get()
+            if item is VideoRecorder.__END_OF_STREAM:
+                break
+
+            (image, capture_time, has_detections, release) = item
+            self.__capture_times.append(capture_time)
+            try:
+                self.__record(image, has_detections, release is not None)
+            except Exception:
+                logging.error("Error occurred during recording video")
+            finally:
+                if release is not None:
+                    release()
+
+        # frames waiting for frame rate measurement are saved, pre-roll
+        # without following detections is not
+        if not self.__detections_only:
+            while self.__pending:
+                self.__write_frame(self.__pending.popleft())
+        self.__pending.clear()
+        self.__close_segment()
@@ -11,6 +11,10 @@ import time
 import cv2
 import imutils
 import imutils.video
+import numpy
+
+from image_and_video_prosessors.frame_sources import LatestFrameSource, \
+    create_frame_source, is_live_source, live_source_address
 
 
 # pylint: disable=R0903, W0703, I1101
@@ -25,36 +29,142 @@ class VideoStreamHandler:
             @brief Class instantiation: setup of class attributes
         """
         try:
-            # protected attribute which will be used for starting video stream
+            # protected attribute which will be used for starting video
+            # stream, the camera is opened in _start_video_stream
             self._video_stream: imutils.video.webcamvideostream. \
-                WebcamVideoStream \
-                = imutils.video.webcamvideostream.WebcamVideoStream()
+                WebcamVideoStream = None
             # protected attribute to be used for FPS counter
             self._fps: imutils.video.fps.FPS = imutils.video.fps.FPS()
             # protected attribute to be used as video codec format holder
             self._fourcc: cv2.VideoWriter_fourcc = cv2. \
                 VideoWriter_fourcc(*'XVID')
+            # protected attribute which is True when frames are read from
+            # video file or image files instead of a camera
+            self._offline_source: bool = False
+            # protected attribute which is True when processed frames
+            # are shown in a window
+            self._display_enabled: bool = True
+            # protected attribute which is True when video stream returns
+            # the same frame array until a new frame is captured
+            self._shared_frames: bool = False
         except Exception:
             logging.error("Error occurred during VideoStreamHandler"
                           " object instantiation")
 
-    def _start_video_stream(self) -> None:
+    def _start_video_stream(self, source: str = None,
+                            headless: bool = False,
+                            latest_frame: bool = False,
+                            frame_range: tuple = (0, None),
+                            ring_slots: int = 0) -> None:
         """
+            :param source: str, camera index, network stream address, path
+            of video file, image directory or glob pattern of image files,
+            webcam is used when it is not given ;
+            :param headless: bool, True when no window is shown ;
+            :param latest_frame: bool, True when only the latest captured
+            frame of a live source is kept ;
+            :param frame_range: tuple, index of the first frame and index
+            after the last frame read from offline source, None end index
+            means the end of source ;
+            :param ring_slots: int, number of shared frame ring slots,
+            frames are captured by a separate process when it is positive
             :return None
 
             @brief
             Protected class method  in which is initialized real time video
-            stream, allowing the camera sensor to warm up and is
-             initialize the FPS counter.
+            stream, waiting until the camera sensor delivers valid frames.
+             Video files and image files are decoded ahead by a reader
+             thread instead. FPS counter is started separately.
         """
-        logging.info("Starting camera...")
+        self._offline_source = not is_live_source(source)
+        self._display_enabled = not (self._offline_source or headless)
+        self._shared_frames = not (self._offline_source or latest_frame or
+                                   ring_slots > 0)
         try:
-            self._video_stream: imutils.video.webcamvideostream. \
-                WebcamVideoStream = imutils.video.VideoStream(src=0).start()
-            time.sleep(2.0)
-            self._fps: imutils.video.fps.FPS = imutils.video.fps.FPS().start()
+            if ring_slots > 0:
+                # multiprocessing is imported only with capture process
+                from image_and_video_prosessors.shared_frame_ring import \
+                    CaptureProcessSource, estimate_slot_size
+                logging.info("Starting capture process for source %s...",
+                             source)
+                self._video_stream = CaptureProcessSource(
+                    source, estimate_slot_size(source), ring_slots,
+                    frame_range).start()
+            elif self._offline_source:
+                logging.info("Opening source %s...", source)
+                self._video_stream = create_frame_source(
+                    source, start_frame=frame_range[0],
+                    end_frame=frame_range[1]).start()
+            elif latest_frame:
+                logging.info("Starting camera...")
+                self._video_stream = LatestFrameSource(
+                    live_source_address(source)).start()
+            else:
+                logging.info("Starting camera...")
+                self._video_stream: imutils.video.webcamvideostream. \
+                    WebcamVideoStream = imutils.video.VideoStream(
+                        src=live_source_address(source)).start()
+                self.__wait_for_valid_frame()
         except Exception:
-            logging.error("Error occurred during starting web camera")
+            logging.error("Error occurred during starting video stream")
+
+    def __wait_for_valid_frame(self, timeout: float = 2.0) -> None:
+        """
+            :param timeout: float, maximum wait in seconds
+            :return None
+
+            @brief
+            Private class method in which camera stream is polled until
+            it delivers a frame which is not empty or black, as cameras
+            do while the sensor warms up. It waits at most the timeout.
+        """
+        deadline: float = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            frame: numpy.ndarray = self._video_stream.read()
+            if frame is not None and frame.size and frame.max() > 0:
+                return
+            time.sleep(0.01)
+        logging.warning("Camera delivered no valid frame in %.1f s", timeout)
+
+    def _start_fps_counter(self) -> None:
+        """
+            :return None
+
+            @brief
+            Protected class method in which FPS counter is started, it is
+            called when video stream and model are ready
+        """
+        self._fps: imutils.video.fps.FPS = imutils.video.fps.FPS().start()
+
+    def _read_frame(self) -> tuple:
+        """
+            :return tuple of numpy.ndarray frame and float capture time
+
+            @brief
+            Protected class method in which next frame is read from video
+            stream together with time.perf_counter() time it was captured
+            at. Read time is used when stream does not keep capture time.
+        """
+        frame: numpy.ndarray = self._video_stream.read()
+        capture_time: float = getattr(self._video_stream, 'capture_time',
+                                      None)
+        if capture_time is None:
+            capture_time = time.perf_counter()
+
+        return frame, capture_time
+
+    def _frame_release(self):
+        """
+            :return callable
+
+            @brief
+            Protected class method which returns function releasing shared
+            buffer of the last read frame, None is returned when frames
+            are not shared between processes
+        """
+        frame_release = getattr(self._video_stream, 'frame_release', None)
+
+        return frame_release() if frame_release is not None else None
 
     def _stop_video_stream_and_clean_up(self) -> None:
         """
@@ -72,6 +182,7 @@ class VideoStreamHandler:
 
             # clean up
             self._video_stream.stop()
-            cv2.destroyAllWindows()
+            if self._display_enabled:
+                cv2.destroyAllWindows()
         except Exception:
             logging.error("Error occurred during stopping web camera")
@@ -0,0 +1,232 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import functools
+import os
+import time
+
+import cv2
+
+from image_and_video_prosessors.annotation_renderer import \
+    AnnotationRenderer
+from image_and_video_prosessors.result_server import ResultServer
+from image_and_video_prosessors.video_recorder import VideoRecorder
+from report_handlers.csv_report_handler import ReportGenerator
+
+
+# pylint: disable=R0903, W0703, I1101
+class ReportSink:
+    """"
+        @brief Class in which detections of frames yielded by
+        ObjectDetector.stream are written into annotation report
+    """
+
+    def __init__(self, results_dir: str = 'results'):
+        """"
+            :param results_dir: str, directory report is saved in
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # private attribute initialized as ReportGenerator object
+        self.__report_generator: ReportGenerator = ReportGenerator(
+            results_dir=results_dir)
+        # histograms are not stored by the sink
+        self.__report_generator.create_results_dir(histograms=False)
+        self.__report_generator.create_report()
+        # private attribute for counting detections
+        self.__detections_counter: int = 0
+        # private attribute for counting frames
+        self.__frames_counter: int = 0
+        # private attribute for time when the first frame was written
+        self.__start_time: float = None
+
+    def write(self, frame) -> None:
+        """"
+            :param frame: FrameDetections, frame with its detections
+            :return None
+
+            @brief Public class method in which detections of the frame
+            are added in report file
+        """
+        if self.__start_time is None:
+            self.__start_time = time.perf_counter()
+        self.__frames_counter += 1
+        self.__detections_counter += len(frame.objects)
+        if len(frame.objects):
+            self.__report_generator.add_records(
+                frame.frame_number,
+                [frame.class_names[index]
+                 for index in frame.objects['class_id'].tolist()],
+                frame.objects['confidence'], frame.objects['box'])
+
+    def close(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which report overview is added
+            and report file is closed
+        """
+        elapsed_time: float = 0.0 if self.__start_time is None else \
+            time.perf_counter() - self.__start_time
+        self.__report_generator.add_report_overview(
+            self.__detections_counter, elapsed_time,
+            self.__frames_counter / max(elapsed_time, 1e-9))
+        self.__report_generator.close_file()
+
+
+# pylint: disable=R0903, W0703, I1101
+class VideoSink:
+    """"
+        @brief Class in which frames yielded by ObjectDetector.stream are
+        annotated and encoded into video by a background thread
+    """
+
+    def __init__(self, directory: str = 'results', fps: float = None,
+                 class_names: list = None, **recorder_options):
+        """"
+            :param directory: str, directory video files are saved in ;
+            :param fps: float, frame rate of saved video, it is measured
+            when it is not given ;
+            :param class_names: list, class labels indexed by class id,
+            labels of the first written frame are used when not given ;
+            :param recorder_options: additional VideoRecorder arguments,
+            e.g. segment_duration or detections_only
+
+            @brief Class instantiation: setup of class attributes
+        """
+        os.makedirs(directory, exist_ok=True)
+        # private attribute to be used as video recorder
+        self.__video_recorder: VideoRecorder = VideoRecorder(
+            directory, cv2.VideoWriter_fourcc(*'XVID'), fps,
+            **recorder_options).start()
+        # private attribute to be initialized as AnnotationRenderer object
+        self.__renderer: AnnotationRenderer = None if class_names is None \
+            else AnnotationRenderer(class_names)
+
+    def write(self, frame) -> None:
+        """"
+            :param frame: FrameDetections, frame with its detections
+            :return None
+
+            @brief Public class method in which detections are drawn into
+            a copy of the frame which is queued for encoding
+        """
+        if self.__renderer is None:
+            self.__renderer = AnnotationRenderer(frame.class_names)
+        annotated_image = self.__renderer.render(frame.image, frame.objects)
+        self.__video_recorder.write(
+            annotated_image, frame.capture_time, len(frame.objects) > 0,
+            functools.partial(self.__renderer.release, annotated_image)
+            if annotated_image is not frame.image else None)
+
+    def close(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which queued frames are encoded
+            and video file is closed
+        """
+        self.__video_recorder.close()
+
+
+# pylint: disable=R0903, W0703, I1101
+class DisplaySink:
+    """"
+        @brief Class in which frames yielded by ObjectDetector.stream are
+        annotated and shown in a window
+    """
+
+    def __init__(self, window_name: str = "Recognized Objects"):
+        """"
+            :param window_name: str, title of the window
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # private attribute for title of the window
+        self.__window_name: str = window_name
+        # private attribute to be initialized as AnnotationRenderer object
+        self.__renderer: AnnotationRenderer = None
+
+    def write(self, frame) -> None:
+        """"
+            :param frame: FrameDetections, frame with its detections
+            :return None
+
+            @brief Public class method in which annotated frame is shown
+        """
+        if self.__renderer is None:
+            self.__renderer = AnnotationRenderer(frame.class_names)
+        annotated_image = self.__renderer.render(frame.image, frame.objects)
+        cv2.imshow(self.__window_name, annotated_image)
+        cv2.waitKey(1)
+        if annotated_image is not frame.image:
+            self.__renderer.release(annotated_image)
+
+    def close(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which the window is closed
+        """
+        cv2.destroyWindow(self.__window_name)
+
+
+# pylint: disable=R0903, W0703, I1101
+class ServerSink:
+    """"
+        @brief Class in which frames yielded by ObjectDetector.stream are
+        served over HTTP as MJPEG stream and their detections as NDJSON
+        or server-sent events, frames are annotated only while MJPEG
+        clients are connected
+    """
+
+    def __init__(self, port: int = 8080, host: str = '127.0.0.1',
+                 jpeg_quality: int = 80):
+        """"
+            :param port: int, port the server listens on, 0 picks a free
+            port ;
+            :param host: str, address the server listens on ;
+            :param jpeg_quality: int, JPEG quality of MJPEG frames 0-100
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # public attribute holding started ResultServer object
+        self.server: ResultServer = ResultServer(host, port,
+                                                 jpeg_quality).start()
+        # private attribute to be initialized as AnnotationRenderer object
+        self.__renderer: AnnotationRenderer = None
+
+    def write(self, frame) -> None:
+        """"
+            :param frame: FrameDetections, frame with its detections
+            :return None
+
+            @brief Public class method in which annotated frame and its
+            detections are published to connected clients
+        """
+        annotated_image = None
+        if self.server.video_clients():
+            if self.__renderer is None:
+                self.__renderer = AnnotationRenderer(frame.class_names)
+            annotated_image = self.__renderer.render(frame.image,
+                                                     frame.objects)
+        self.server.publish(frame.frame_number, frame.timestamp,
+                            annotated_image, frame.objects,
+                            frame.class_names)
+        # published frame is copied by the server
+        if annotated_image is not None and \
+                annotated_image is not frame.image:
+            self.__renderer.release(annotated_image)
+
+    def close(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which clients are disconnected
+            and server is stopped
+        """
+        self.server.stop()
@@ -0,0 +1,238 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import logging
+import queue
+import threading
+
+
+# pylint: disable=R0903, W0703
+class FramePipeline:
+    """"
+        @brief Class in which is implemented logic for running
+        frame processing stages concurrently. Every stage works
+        in its own thread and stages are connected with bounded
+        queues, so a slow stage applies backpressure to the stages
+        before it. Each stage has a single worker, which keeps
+        frames in their original order. Batches dropped by a failing
+        stage or left in queues at stop are handed to release callable,
+        so their buffers are not leaked.
+    """
+
+    # private class attribute used as end of stream marker
+    __END_OF_STREAM: object = object()
+
+    def __init__(self, queue_size: int = 4):
+        """"
+            :param queue_size: int, maximum number of frame batches waiting
+            between two stages
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # private attribute for maximum size of inter-stage queues
+        self.__queue_size: int = max(1, queue_size)
+        # private attribute holding (name, function) of worker stages
+        self.__stages: list = []
+        # private attribute holding running worker threads
+        self.__threads: list = []
+        # private attribute holding queues between stages of current run
+        self.__queues: list = []
+        # private attribute for callable releasing dropped batches
+        self.__release = None
+        # private attribute used to signal all workers to stop
+        self.__stop_event: threading.Event = threading.Event()
+
+    def add_stage(self, name: str, function) -> None:
+        """"
+            :param name: str, stage name used for thread naming and logging ;
+            :param function: callable, receives a frame batch and returns
+            the processed batch or None to drop it
+            :return None
+
+            @brief Public class method in which worker stage is appended
+            to the pipeline
+        """
+        self.__stages.append((name, function))
+
+    def __put(self, out_queue: queue.Queue, item) -> bool:
+        """"
+            :param out_queue: queue.Queue, queue of the next stage ;
+            :param item: frame batch or end of stream marker
+            :return bool
+
+            @brief Private class method which blocks while the next
+            stage is busy, but gives up once the pipeline is stopped
+        """
+        while not self.__stop_event.is_set():
+            try:
+                out_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def __get(self, in_queue: queue.Queue):
+        """"
+            :param in_queue: queue.Queue, queue of the current stage
+            :return frame batch, end of stream marker or None when stopped
+
+            @brief Private class method which waits for the next item
+            until the pipeline is stopped
+        """
+        while not self.__stop_event.is_set():
+            try:
+                return in_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+        return None
+
+    def __release_batch(self, item) -> None:
+        """"
+            :param item: frame batch which is not processed further
+            :return None
+
+            @brief Private class method in which dropped frame batch is
+            handed to release callable
+        """
+        if self.__release is None:
+            return
+        try:
+            self.__release(item)
+        except Exception:
+            logging.error("Error occurred during releasing pipeline batch")
+
+    def __source_worker(self, source, out_queue: queue.Queue) -> None:
+        """"
+            :param source: callable, receives stop event of the pipeline
+            and returns next frame batch or None when the stream is
+            exhausted or the event is set ;
+            :param out_queue: queue.Queue, queue of the first stage
+            :return None
+
+            @brief Private class method in which frames are produced
+        """
+        while not self.__stop_event.is_set():
+            try:
+                item = source(self.__stop_event)
+            except Exception:
+                logging.error("Error occurred in pipeline source stage")
+                item = None
+
+            if item is None:
+                break
+            if not self.__put(out_queue, item):
+                self.__release_batch(item)
+                return
+
+        self.__put(out_queue, FramePipeline.__END_OF_STREAM)
+
+    def __stage_worker(self, name: str, function, in_queue: queue.Queue,
+                       out_queue: queue.Queue) -> None:
+        """"
+            :param name: str, stage name ;
+            :param function: callable, stage processing function ;
+            :param in_queue: queue.Queue, queue the stage reads from ;
+            :param out_queue: queue.Queue, queue the stage writes to
+            :return None
+
+            @brief Private class method in which a single stage
+            processes frames until end of stream
+        """
+        while True:
+            item = self.__get(in_queue)
+            if item is None:
+                return
+            if item is FramePipeline.__END_OF_STREAM:
+                self.__put(out_queue, item)
+                return
+
+            try:
+                processed = function(item)
+            except Exception:
+                logging.error("Error occurred in pipeline stage %s", name)
+                self.__release_batch(item)
+                processed = None
+
+            if processed is not None and \
+                    not self.__put(out_queue, processed):
+                self.__release_batch(processed)
+                return
+
+    def run(self, source, sink, release=None) -> None:
+        """"
+            :param source: callable, receives stop event of the pipeline
+            and returns next frame batch or None when the stream is
+            exhausted or the event is set ;
+            :param sink: callable, consumes processed batch and returns
+            False when processing should stop, batch handed to it is
+            owned by it even when it fails ;
+            :param release: callable, receives frame batch dropped by a
+            failing stage or left in queues at stop
+            :return None
+
+            @brief Public class method in which worker threads are started
+            and the sink is run in the calling thread, which keeps GUI
+            calls such as cv2.imshow on the main thread. All workers have
+            exited when it returns.
+        """
+        self.__stop_event.clear()
+        self.__release = release
+        queues: list = [queue.Queue(maxsize=self.__queue_size)
+                        for _ in range(len(self.__stages) + 1)]
+        self.__queues = queues
+
+        self.__threads = [threading.Thread(target=self.__source_worker,
+                                           args=(source, queues[0]),
+                                           name="pipeline-source",
+                                           daemon=True)]
+        for position, (name, function) in enumerate(self.__stages):
+            self.__threads.append(threading.Thread(
+                target=self.__stage_worker,
+                args=(name, function, queues[position], queues[position + 1]),
+                name="pipeline-" + name, daemon=True))
+
+        for thread in self.__threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self.__get(queues[-1])
+                if item is None or item is FramePipeline.__END_OF_STREAM:
+                    break
+                try:
+                    if sink(item) is False:
+                        break
+                except Exception:
+                    logging.error("Error occurred in pipeline sink stage")
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which all workers are
+            signalled to stop and joined, batches left in queues are
+            released afterwards. Workers finish their current batch, so
+            nothing is processed once it returns.
+        """
+        self.__stop_event.set()
+        for thread in self.__threads:
+            thread.join()
+        self.__threads = []
+
+        for stage_queue in self.__queues:
+            while True:
+                try:
+                    item = stage_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not FramePipeline.__END_OF_STREAM:
+                    self.__release_batch(item)
+        self.__queues = []
@@ -0,0 +1,283 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import collections
+import logging
+import threading
+import time
+
+
+# pylint: disable=R0903
+class InferenceRequest:
+    """"
+        @brief Class which holds frames of one source waiting to be
+        passed through the network, together with their detections
+        once the forward pass is done
+    """
+
+    __slots__ = ('images', 'deadline', 'detections', 'done')
+
+    def __init__(self, images: list, deadline: float):
+        """"
+            :param images: list, frame images ;
+            :param deadline: float, time.perf_counter() time until which
+            detections should be obtained
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # public attribute for frame images
+        self.images: list = images
+        # public attribute for requested completion time
+        self.deadline: float = deadline
+        # public attribute to be used as detections holder, one item
+        # per image
+        self.detections: list = None
+        # public attribute which is set when detections are obtained
+        self.done: threading.Event = threading.Event()
+
+
+# pylint: disable=R0903, W0703
+class InferenceScheduler:
+    """"
+        @brief Class in which frames of several sources are passed
+        through a single shared network. Sources submit frames from their
+        own threads and wait for detections, while scheduler thread
+        collects pending requests into batches - one request per source
+        in turn for round-robin policy, earliest deadlines first for
+        deadline policy - and runs one forward pass per batch.
+    """
+
+    def __init__(self, detect_function, sources: int,
+                 policy: str = 'round-robin', max_batch_size: int = 4,
+                 deadline: float = 0.1):
+        """"
+            :param detect_function: callable, function which takes list of
+            images and returns list of their detections ;
+            :param sources: int, number of sources ;
+            :param policy: str, 'round-robin' or 'deadline' ;
+            :param max_batch_size: int, maximum number of images in one
+            forward pass ;
+            :param deadline: float, time in seconds in which detections of
+            a request should be obtained, deadline policy waits for more
+            requests while the earliest deadline allows it
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # private attribute for function running the forward pass
+        self.__detect_function = detect_function
+        # private attribute for scheduling policy
+        self.__policy: str = policy
+        # private attribute for maximum number of images in a batch
+        self.__max_batch_size: int = max(1, max_batch_size)
+        # private attribute for request deadline
+        self.__deadline: float = deadline
+        # private attribute holding pending requests of every source
+        self.__pending: list = [collections.deque() for _ in range(sources)]
+        # private attribute guarding pending requests and waking up
+        # the scheduler thread
+        self.__condition: threading.Condition = threading.Condition()
+        # private attribute for source served first in the next batch
+        self.__next_source: int = 0
+        # private attribute for estimated forward pass time in seconds
+        self.__forward_time: float = 0.0
+        # private attribute for number of forward passes
+        self.__batches_counter: int = 0
+        # private attribute for number of scheduled images
+        self.__images_counter: int = 0
+        # private attribute for number of requests finished after
+        # their deadline
+        self.__missed_deadlines_counter: int = 0
+        # private attribute to be used as scheduler thread holder
+        self.__thread: threading.Thread = None
+        # private attribute used for stopping scheduler thread
+        self.__stopped: bool = False
+
+    def start(self) -> 'InferenceScheduler':
+        """"
+            :return InferenceScheduler
+
+            @brief Public class method in which scheduler thread is started
+        """
+        self.__stopped = False
+        self.__thread = threading.Thread(target=self.__schedule,
+                                         name="inference-scheduler",
+                                         daemon=True)
+        self.__thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which scheduler thread is
+            stopped, requests still waiting get no detections
+        """
+        with self.__condition:
+            self.__stopped = True
+            self.__condition.notify_all()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def detect(self, source_index: int, images: list) -> list:
+        """"
+            :param source_index: int, index of the source ;
+            :param images: list, frame images
+            :return list of numpy.ndarray
+
+            @brief Public class method in which frames of the source are
+            submitted and their detections are waited for. None is
+            returned for every image when scheduler is stopped.
+        """
+        request: InferenceRequest = InferenceRequest(
+            images, time.perf_counter() + self.__deadline)
+        with self.__condition:
+            if self.__stopped:
+                return [None] * len(images)
+            self.__pending[source_index].append(request)
+            self.__condition.notify_all()
+        request.done.wait()
+
+        return request.detections
+
+    def statistics(self) -> dict:
+        """"
+            :return dict
+
+            @brief Public class method which returns scheduling statistics
+            as named rows
+        """
+        return {"Scheduled batches": self.__batches_counter,
+                "Average batch size": round(
+                    self.__images_counter / max(1, self.__batches_counter),
+                    2),
+                "Missed deadlines": self.__missed_deadlines_counter}
+
+    def __pending_images(self) -> int:
+        """"
+            :return int
+
+            @brief Private class method which returns number of images
+            of all pending requests
+        """
+        return sum(len(request.images) for requests in self.__pending
+                   for request in requests)
+
+    def __wait_for_requests(self) -> bool:
+        """"
+            :return bool, False when scheduler is stopped
+
+            @brief Private class method in which scheduler thread waits for
+            pending requests. Deadline policy keeps waiting for requests of
+            other sources while the batch is not full and the earliest
+            deadline is not endangered by estimated forward pass time.
+        """
+        while not self.__stopped and not self.__pending_images():
+            self.__condition.wait()
+        if self.__policy != 'deadline':
+            return not self.__stopped
+
+        while not self.__stopped and \
+                self.__pending_images() < self.__max_batch_size:
+            slack: float = min(request.deadline for requests in self.__pending
+                               for request in requests) - \
+                self.__forward_time - time.perf_counter()
+            if slack <= 0:
+                break
+            self.__condition.wait(slack)
+
+        return not self.__stopped
+
+    def __collect_batch(self) -> list:
+        """"
+            :return list of InferenceRequest
+
+            @brief Private class method in which pending requests of the
+            next batch are taken out of source queues according to
+            scheduling policy. The first request is taken even when it
+            has more images than the maximum batch size.
+        """
+        if self.__policy == 'deadline':
+            candidates: list = sorted(
+                (request for requests in self.__pending
+                 for request in requests),
+                key=lambda request: request.deadline)
+        else:
+            # one request of every source in turn, starting with the
+            # source after the last served one
+            candidates: list = []
+            queues: list = [list(self.__pending[(self.__next_source + index)
+                                                % len(self.__pending)])
+                            for index in range(len(self.__pending))]
+            for position in range(max(len(requests) for requests in queues)):
+                candidates.extend(requests[position] for requests in queues
+                                  if position < len(requests))
+
+        batch: list = []
+        images: int = 0
+        for request in candidates:
+            if batch and images + len(request.images) > \
+                    self.__max_batch_size:
+                break
+            batch.append(request)
+            images += len(request.images)
+        for request in batch:
+            for index, requests in enumerate(self.__pending):
+                if request in requests:
+                    requests.remove(request)
+                    self.__next_source = (index + 1) % len(self.__pending)
+                    break
+
+        return batch
+
+    def __schedule(self) -> None:
+        """"
+            :return None
+
+            @brief Private class method run in scheduler thread in which
+            batches are collected and passed through the network and
+            detections are handed back to waiting sources
+        """
+        while True:
+            with self.__condition:
+                if not self.__wait_for_requests():
+                    break
+                batch: list = self.__collect_batch()
+
+            images: list = [image for request in batch
+                            for image in request.images]
+            start_time: float = time.perf_counter()
+            try:
+                detections: list = self.__detect_function(images)
+            except Exception:
+                logging.error("Error occurred during scheduled inference")
+                detections: list = [None] * len(images)
+            finish_time: float = time.perf_counter()
+            # exponential moving average of forward pass time
+            self.__forward_time = finish_time - start_time \
+                if not self.__batches_counter else \
+                0.8 * self.__forward_time + 0.2 * (finish_time - start_time)
+            self.__batches_counter += 1
+            self.__images_counter += len(images)
+
+            position: int = 0
+            for request in batch:
+                request.detections = \
+                    detections[position:position + len(request.images)]
+                position += len(request.images)
+                if finish_time > request.deadline:
+                    self.__missed_deadlines_counter += 1
+                request.done.set()
+
+        # requests left after stop are released without detections
+        with self.__condition:
+            for requests in self.__pending:
+                while requests:
+                    request: InferenceRequest = requests.popleft()
+                    request.detections = [None] * len(request.images)
+                    request.done.set()
@@ -0,0 +1,312 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import logging
+import time
+
+import cv2
+import numpy
+
+from image_and_video_prosessors.frame_sources import LatestFrameSource, \
+    create_frame_source, is_live_source, live_source_address
+from image_and_video_prosessors.image_processor import ImageProcessing
+from image_and_video_prosessors.region_of_interest import load_regions
+
+
+# pylint: disable=R0903
+class FrameDetections:
+    """"
+        @brief Class which holds filtered detections of a single frame
+        yielded by ObjectDetector.stream together with the frame
+    """
+
+    __slots__ = ('frame_number', 'capture_time', 'timestamp', 'image',
+                 'objects', 'class_names')
+
+    def __init__(self, frame_number: int, capture_time: float,
+                 image: numpy.ndarray, class_names: list):
+        """"
+            :param frame_number: int, number of frame in the source
+            counted from one, as in the report of object recognition ;
+            :param capture_time: float, time.perf_counter() time at which
+            frame was captured ;
+            :param image: numpy.ndarray, frame image, it is not drawn on ;
+            :param class_names: list, class labels indexed by class id
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # public attribute for number of frame in the source
+        self.frame_number: int = frame_number
+        # public attribute for time.perf_counter() capture time
+        self.capture_time: float = capture_time
+        # public attribute for wall clock capture time in seconds
+        # since the epoch
+        self.timestamp: float = time.time() - \
+            (time.perf_counter() - capture_time)
+        # public attribute to be used as frame image holder
+        self.image: numpy.ndarray = image
+        # public attribute to be used as filtered detections holder,
+        # structured array of DETECTION_DTYPE
+        self.objects: numpy.ndarray = None
+        # public attribute for class labels
+        self.class_names: list = class_names
+
+    def detections(self) -> list:
+        """"
+            :return list of dict
+
+            @brief Public class method which returns detections as JSON
+            serializable objects with class label, confidence and box
+            (start_x, start_y, end_x, end_y) in frame pixels
+        """
+        return [{"frame_number": self.frame_number,
+                 "timestamp": self.timestamp,
+                 "class": self.class_names[int(detection['class_id'])],
+                 "confidence": round(float(detection['confidence']), 4),
+                 "box": detection['box'].tolist()}
+                for detection in self.objects]
+
+
+# pylint: disable=R0903, W0703, I1101
+class ObjectDetector(ImageProcessing):
+    """"
+        @brief Class in which objects are only detected in images,
+        without video stream, report, histograms or annotated video.
+        Only the network and its command line arguments are loaded,
+        so short-lived batch jobs do not pay for modules of the full
+        object recognition workflow.
+    """
+
+    def __init__(self):
+        """"
+            @brief Class instantiation: setup of class attributes
+        """
+        ImageProcessing.__init__(self)
+        # private attribute which is True when model is loaded
+        self.__model_loaded: bool = False
+
+    def prepare(self, argv: list = None, **options) -> bool:
+        """"
+            :param argv: list, arguments in command line form, defaults
+            are used when neither they nor options are given, sys.argv
+            of the host application is never read ;
+            :param options: keyword options named as command line
+            arguments with underscores, e.g. confidence=0.5,
+            batch_size=4, tiles=(2, 2), no_blur=True
+            :return bool, True when model is loaded, False when it can
+            not be loaded or arguments are invalid
+
+            @brief Public class method in which arguments are parsed and
+            model is loaded and warmed up
+        """
+        argv = list(argv or [])
+        for name, value in options.items():
+            if value is None or value is False:
+                continue
+            argv.append('--' + name.replace('_', '-'))
+            if isinstance(value, (list, tuple)):
+                argv.extend(str(item) for item in value)
+            elif value is not True:
+                argv.append(str(value))
+        try:
+            self._prepare_arguments(argv)
+        except SystemExit:
+            # argument parser exits on invalid arguments
+            logging.error("Invalid detector arguments %s", argv)
+            return False
+        self.__model_loaded = self._load_model()
+        if self.__model_loaded:
+            self._warm_up_model(self.batch_size())
+
+        return self.__model_loaded
+
+    def batch_size(self) -> int:
+        """"
+            :return int
+
+            @brief Public class method which returns number of images
+            passed through the network at once
+        """
+        return max(1, self._arguments.get("batch_size", 1))
+
+    def class_name(self, class_id: int) -> str:
+        """"
+            :param class_id: int, class index of a detection
+            :return str
+
+            @brief Public class method which returns class label
+        """
+        return self._classes_of_interest[class_id]
+
+    def detect(self, images: list) -> list:
+        """"
+            :param images: list, images of type numpy.ndarray
+            :return list of numpy.ndarray of DETECTION_DTYPE
+
+            @brief Public class method in which images are passed through
+            the network in batches and their filtered detections are
+            returned, one array per image
+        """
+        if not self.__model_loaded:
+            logging.error("Model is not loaded")
+            return [None] * len(images)
+
+        detections: list = []
+        for start in range(0, len(images), self.batch_size()):
+            batch: list = images[start:start + self.batch_size()]
+            detections.extend(
+                self._filter_detections(image_detections, image.shape)
+                for image, image_detections
+                in zip(batch, self._detect_images(batch)))
+
+        return detections
+
+    def detect_files(self, paths: list) -> list:
+        """"
+            :param paths: list, paths of image files
+            :return list of numpy.ndarray of DETECTION_DTYPE
+
+            @brief Public class method in which image files are read and
+            their detections are returned, None is returned for files
+            which can not be read
+        """
+        images: list = []
+        for path in paths:
+            try:
+                images.append(cv2.imread(path))
+            except cv2.error:
+                images.append(None)
+            if images[-1] is None:
+                logging.warning("Image file %s can not be read", path)
+
+        readable: list = [image for image in images if image is not None]
+        detections = iter(self.detect(readable))
+
+        return [next(detections) if image is not None else None
+                for image in images]
+
+    def to_dict(self, detections: numpy.ndarray) -> list:
+        """"
+            :param detections: numpy.ndarray of DETECTION_DTYPE
+            :return list of dict
+
+            @brief Public class method in which detections are converted
+            into JSON serializable objects
+        """
+        return [{"class": self.class_name(int(detection['class_id'])),
+                 "confidence": round(float(detection['confidence']), 4),
+                 "box": detection['box'].tolist()}
+                for detection in detections]
+
+    def __detect_frames(self, frames: list, sinks: list) -> list:
+        """"
+            :param frames: list of FrameDetections, frames without
+            detections ;
+            :param sinks: list, objects with write(FrameDetections) method
+            :return list of FrameDetections
+
+            @brief Private class method in which frames are passed through
+            the network at once and handed to sinks with their detections
+        """
+        for frame, objects in zip(frames, self.detect(
+                [frame.image for frame in frames])):
+            frame.objects = objects
+            for sink in sinks:
+                sink.write(frame)
+
+        return frames
+
+    @staticmethod
+    def __read_frames(video_stream, live: bool):
+        """"
+            :param video_stream: object with read() method returning
+            frames, e.g. frame sources or imutils video streams ;
+            :param live: bool, True when missing frame means the source
+            is waited for, otherwise it means end of source
+            :return generator of tuples of frame and capture time
+
+            @brief Private static method which yields frames of video
+            stream with their capture times
+        """
+        while True:
+            frame: numpy.ndarray = video_stream.read()
+            if frame is None:
+                if live:
+                    continue
+                return
+            capture_time: float = getattr(video_stream, 'capture_time',
+                                          None)
+            yield frame, capture_time or time.perf_counter()
+
+    def stream(self, source, sinks: list = None, start_frame: int = 0,
+               end_frame: int = None):
+        """"
+            :param source: str or int camera index, network stream
+            address, path of video file, image directory or glob pattern,
+            an object with read() method returning frames or None at the
+            end, or an iterable of images ;
+            :param sinks: list, objects with write(FrameDetections) and
+            close() methods, e.g. from detection_sinks module, frames are
+            handed to them in order and they are closed at the end ;
+            :param start_frame: int, index of the first frame of video
+            file or image files, frames are numbered from start_frame + 1
+            as in the report of object recognition ;
+            :param end_frame: int, index after the last frame of video
+            file or image files
+            :return generator of FrameDetections
+
+            @brief Public class method which yields detections of every
+            frame of the source as soon as they are obtained. Nothing is
+            drawn, reported or saved unless sinks are attached. Live
+            sources keep only the latest frame and are read until the
+            generator is closed. Regions of --roi-file argument are used
+            for sources given by name.
+        """
+        if not self.__model_loaded:
+            logging.error("Model is not loaded")
+            return
+
+        sinks = list(sinks or [])
+        video_stream = None
+        if isinstance(source, (str, int)):
+            live: bool = is_live_source(str(source))
+            video_stream = LatestFrameSource(
+                live_source_address(str(source))).start() if live else \
+                create_frame_source(str(source), start_frame=start_frame,
+                                    end_frame=end_frame).start()
+            frames = ObjectDetector.__read_frames(video_stream, live)
+            if self._arguments.get("roi_file"):
+                self._set_regions_of_interest(
+                    load_regions(self._arguments["roi_file"], source))
+        elif hasattr(source, 'read'):
+            frames = ObjectDetector.__read_frames(source, False)
+        else:
+            frames = ((image, time.perf_counter()) for image in source)
+
+        try:
+            batch: list = []
+            for frame_number, (image, capture_time) in enumerate(
+                    frames, start_frame + 1):
+                batch.append(FrameDetections(frame_number, capture_time,
+                                             image,
+                                             self._classes_of_interest))
+                if len(batch) < self.batch_size():
+                    continue
+                for frame in self.__detect_frames(batch, sinks):
+                    yield frame
+                batch = []
+            if batch:
+                for frame in self.__detect_frames(batch, sinks):
+                    yield frame
+        finally:
+            if video_stream is not None:
+                video_stream.stop()
+            for sink in sinks:
+                try:
+                    sink.close()
+                except Exception:
+                    logging.error("Error occurred during closing sink")
@@ -5,16 +5,36 @@ date: 10.12.2019
 python version: 3.6
 openCV version: 4.7.12
 """
+import functools
 import logging
+import math
+import os
+import signal
+import threading
+import time
 
 import cv2
 import imutils
 import numpy
 
-from image_and_video_prosessors.image_processor import ImageProcessing
+from Caffe_model_handler.model_tuner import candidate_settings, \
+    save_tuning, tune_model
+from image_and_video_prosessors.annotation_renderer import \
+    AnnotationRenderer
+from image_and_video_prosessors.frame_record import FrameRecord
+from image_and_video_prosessors.frame_sources import READ_TIMEOUT, \
+    LatestFrameSource
+from image_and_video_prosessors.image_processor import DETECTION_DTYPE, \
+    ImageProcessing
+from image_and_video_prosessors.motion_gate import MotionGate
+from image_and_video_prosessors.object_tracker import ObjectTracker
+from image_and_video_prosessors.region_of_interest import load_regions
+from image_and_video_prosessors.video_recorder import VideoRecorder
 from image_and_video_prosessors.videostream_processor import VideoStreamHandler
+from object_recognition_processing.frame_pipeline import FramePipeline
+from object_recognition_processing.inference_scheduler import \
+    InferenceScheduler
 from report_handlers.csv_report_handler import ReportGenerator
-from report_handlers.histogram_handler import HistogramHandler
 
 
 # pylint: disable=R0903, W0703, I1101
@@ -25,175 +45,881 @@ class ObjectRecognition(VideoStreamHandler, ImageProcessing):
         matching
     """
 
-    def __init__(self):
+    def __init__(self, results_dir: str = 'results'):
         """"
+            :param results_dir: str, directory in which report, video,
+            histograms and stage latency are saved
+
             @brief Class instantiation: setup of class attributes
         """
         try:
             VideoStreamHandler.__init__(self)
             ImageProcessing.__init__(self)
+            self._results_dir = results_dir
             # private attribute for counting frames in
             # video sequence
             self.__frame_counter: int = 0
+            # private attribute for counting frames which passed the
+            # output stage
+            self.__output_frames_counter: int = 0
             # private attribute for counting detections
             # in video sequence
             self.__detections_counter: int = 0
-            # private attribute to be initialized as
-            # HistogramHandler object
-            self.__histogram_generator: HistogramHandler = None
+            # private attribute to be initialized as long-lived
+            # HistogramHandler object when histograms are stored
+            self.__histogram_generator = None
             #  private attribute initialized as
             # ReportGenerator object
-            self.__report_generator: ReportGenerator = ReportGenerator()
+            self.__report_generator: ReportGenerator = ReportGenerator(
+                results_dir=results_dir)
+            # private attribute to be used for saving video, it is
+            # created when frame processing starts
+            self.__video_recorder: VideoRecorder = None
+            # private attribute to be initialized as ResultServer object
+            # when results are served over HTTP
+            self.__result_server = None
+            # private attribute initialized as AnnotationRenderer object
+            # drawing detections into separate output frames
+            self.__renderer: AnnotationRenderer = AnnotationRenderer(
+                self._classes_of_interest)
+            # private attribute to be initialized as ObjectTracker object
+            # when detections are not obtained for every frame
+            self.__object_tracker: ObjectTracker = None
+            # private attribute for number of frames between two
+            # frames passed through the network
+            self.__detection_interval: int = 1
+            # private attribute for number of frames left until next
+            # frame passed through the network
+            self.__frames_until_detection: int = 0
+            # private attribute to be initialized as MotionGate object
+            # when static frames are not passed through the network
+            self.__motion_gate: MotionGate = None
+            # private attribute holding filtered detections of the
+            # previous frame
+            self.__previous_objects: numpy.ndarray = numpy.empty(
+                0, dtype=DETECTION_DTYPE)
+            # private attribute for counting frames passed
+            # through the network
+            self.__inferred_frames_counter: int = 0
+            # private attribute for counting static frames which
+            # reused previous detections
+            self.__gated_frames_counter: int = 0
+            # private attribute for counting frames dropped before
+            # inference because they exceeded latency budget
+            self.__stale_frames_counter: int = 0
+            # private attribute set when processing should stop, e.g.
+            # after SIGINT/SIGTERM signal
+            self.__stop_requested: threading.Event = threading.Event()
+            # private attribute for time when frame processing started
+            self.__processing_start_time: float = None
+            # private attribute holding durations of startup phases
+            # in seconds
+            self.__startup_times: dict = {}
+            # private attribute for function which passes list of frame
+            # images through the network, frames of several sources are
+            # passed through inference scheduler instead
+            self.__detect_batch = self._get_batch_detections
         except Exception:
             logging.error("Error occurred during VideoStreamHandler "
                           "object instantiation")
 
-    def __get_frame(self) -> numpy.ndarray:
+    def __is_stopping(self, stop_event: threading.Event = None) -> bool:
+        """"
+            :param stop_event: threading.Event, stop event of frame
+            pipeline, None in sequential mode
+            :return bool
+
+            @brief
+            Private class method which tells whether stop was requested
+            or frame pipeline is stopping
+        """
+        return self.__stop_requested.is_set() or \
+            (stop_event is not None and stop_event.is_set())
+
+    def __get_frame(self, stop_event: threading.Event = None) -> FrameRecord:
         """"
-            :return numpy.ndarray
+            :param stop_event: threading.Event, stop event of frame
+            pipeline, None in sequential mode
+            :return FrameRecord
 
             @brief
             Private method in which single frame is grabbed
-            from video stream.
+            from video stream. Grabbed frame is kept for annotation,
+            it is downsized only when --annotation-width is given,
+            network input is prepared from it later. Frame is not
+            numbered yet, None is returned when no frame was grabbed.
+            Source which timed out is read again until stop is requested.
         """
         try:
-            frame_img: numpy.ndarray = self._video_stream.read()
-            frame_resize: numpy.ndarray = imutils.resize(image=frame_img)
-            frame_img = ImageProcessing._filter_image(frame_resize)
-
-            return frame_img
+            with self._stage_timer.measure("grab"):
+                (frame_img, capture_time) = self._read_frame()
+                while frame_img is READ_TIMEOUT and \
+                        not self.__is_stopping(stop_event):
+                    (frame_img, capture_time) = self._read_frame()
+            if frame_img is None or frame_img is READ_TIMEOUT:
+                return None
+            release = self._frame_release()
+            annotation_width: int = self._arguments.get("annotation_width")
+            if annotation_width and annotation_width < frame_img.shape[1]:
+                frame_img = imutils.resize(image=frame_img,
+                                           width=annotation_width,
+                                           inter=cv2.INTER_AREA)
+                # frame of capture process is not needed anymore
+                if release is not None:
+                    release()
+                    release = None
+            elif self._shared_frames:
+                # camera thread returns the same frame until a new one
+                # is captured, boxes must not be drawn into it
+                frame_img = frame_img.copy()
+
+            return FrameRecord(0, frame_img, capture_time, release)
         except cv2.error:
             logging.error("Error occurred during getting frame")
             return None
 
-    def __filter_detections(self, detected_object: numpy.int32) -> None:
+    def __report_detections(self, record: FrameRecord) -> None:
         """"
-            :param detected_object: numpy.int32, object detected in frame
+            :param record: FrameRecord, processed frame and its filtered
+            detections
             :return None
 
-            @ brief Private class method in which for а detection is
-            get confidence value and based on it is created decision
-            box - region of interest in which is detected object and
-            information is added in report file
+            @ brief Private class method in which histograms of frame
+            with detections are stored and information about every
+            filtered detection is added in report file
         """
-        # creating histogram handler object
-        self.__histogram_generator = HistogramHandler()
-        # extract the confidence (i.e., probability) associated with
-        # the prediction
-        if self._detections is not None:
-            self._detection_confidence = self._detections[0, 0,
-                                                          detected_object, 2]
-        else:
-            logging.warning("No detections in frame")
-
-        # filter out weak detections by ensurisng the `confidence` is
-        # greater than the minimum confidence
-        if self._detection_confidence > self._arguments["confidence"]:
-            self.__detections_counter += 1
-            # extract the index of the class label from detections
-            # array, then compute the (x, y)-coordinates of
-            # the bounding box for the object
-            index: int = int(self._detections[0, 0, detected_object, 1])
-            box: numpy.ndarray = self._detections[0, 0, detected_object, 3:7] * \
-                                 numpy.array([self._image_width,
-                                              self._image_height,
-                                              self._image_width,
-                                              self._image_height])
-
-            # create prediction frame
-            self._create_prediction_frame(box, index)
-
-            # adding record about visualized annotation in report file
-            self.__report_generator.add_record(self.__frame_counter,
-                                               self._classes_of_interest[index],
-                                               self._detection_confidence, box)
-            self.__report_generator.close_file()
-            self.__histogram_generator. \
-                generate_rgb_histogram(self.image, self.__frame_counter)
+        # tracked boxes are not counted as detected objects
+        self.__detections_counter += int(numpy.count_nonzero(
+            ~record.objects['tracked']))
+        if not len(record.objects):
+            return
+
+        # storing RGB histograms of the frame
+        if self.__histogram_generator is not None:
+            with self._stage_timer.measure("histogram"):
+                self.__histogram_generator. \
+                    generate_rgb_histogram(record.image, record.frame_number)
+
+        # adding records about visualized annotations in report file,
+        # with track columns when objects are tracked
+        tracking: bool = self.__object_tracker is not None
+        with self._stage_timer.measure("report"):
+            self.__report_generator.add_records(
+                record.frame_number,
+                [self._classes_of_interest[index]
+                 for index in record.objects['class_id'].tolist()],
+                record.objects['confidence'], record.objects['box'],
+                record.objects['track_id'] if tracking else None,
+                record.objects['tracked'] if tracking else None)
+
+    def __setup_histograms(self) -> None:
+        """"
+            :return None
 
-    def __frame_processing(self) -> None:
+            @brief
+            Private class method in which histogram handler is created
+            unless --no-histograms argument is given, histogram modules
+            are imported only then
         """
+        if self._arguments.get("no_histograms", False):
+            return
+
+        from report_handlers.histogram_handler import HistogramHandler
+        self.__histogram_generator = HistogramHandler(
+            store_name=os.path.join(self._results_dir, 'histograms',
+                                    'histograms'))
+
+    def __setup_tracking(self) -> None:
+        """"
             :return None
 
             @brief
-            Private class method in which video stream is
-            saved to physical HDD memory while frames are
-            processed via calling __filter_detections
-            (self, detected_object: numpy.int32) private method.
-            Exit from realtime video stream mode is handled.
-        """
-        # private variable which is used for getting sample
-        # frame from video stream
-        __sample_frame: numpy.ndarray = self.__get_frame()
-
-        # private variable to be used for saving video
-        __video_writer: cv2.VideoWriter = cv2.VideoWriter(
-            'results/annotated_video.avi',
-            self._fourcc, 20.0, (__sample_frame.shape[1],
-                                 __sample_frame.shape[0]))
-
-        if self._detections is None:
-            logging.warning("No detections in frame")
-
-        while True:
-            # get frame from video stream
-            self.image = self.__get_frame()
-            if self.image is not None:
-                # get object detection classification
-                self._get_detections()
-                # update frame counter
-                self.__frame_counter += 1
-
-                # looping over the detections
-                for item in numpy.arange(0, self._detections.shape[2]):
-                    self.__filter_detections(item)
-
-                # save output frame in video sequence
-                __video_writer.write(self.image)
+            Private class method in which object tracker is created
+            when --detect-every argument is greater than one and
+            motion gate when --motion-gate argument is given
+        """
+        if self._arguments.get("motion_gate"):
+            self.__motion_gate = MotionGate(
+                self._arguments.get("motion_threshold", 0.01))
+        self.__detection_interval = max(
+            1, self._arguments.get("detect_every", 1))
+        if self.__detection_interval > 1:
+            self.__object_tracker = ObjectTracker()
+
+    def __select_detection_frames(self, batch: list) -> list:
+        """"
+            :param batch: list of FrameRecord, grabbed frames
+            :return list of FrameRecord
+
+            @brief
+            Private class method in which frames to be passed through
+            the network are selected, every detection interval frame.
+            Static frames are marked as gated when motion gate is used.
+        """
+        selected: list = []
+        for record in batch:
+            if self.__frames_until_detection <= 0:
+                if self.__motion_gate is not None and \
+                        self.__motion_gate.is_static(record.image):
+                    # detection stays due for the next frame
+                    record.gated = True
+                    continue
+                selected.append(record)
+                self.__frames_until_detection = self.__detection_interval
+            self.__frames_until_detection -= 1
+
+        return selected
+
+    def __adapt_detection_interval(self, inference_time: float) -> None:
+        """"
+            :param inference_time: float, inference time of a single
+            frame in seconds
+            :return None
+
+            @brief
+            Private class method in which detection interval is adapted
+            to load, so the average inference time per frame fits into
+            frame period of --target-fps. --detect-every argument is
+            the maximum interval.
+        """
+        if not self._arguments.get("adaptive_detection"):
+            return
+
+        interval: int = int(math.ceil(
+            inference_time * self._arguments.get("target_fps", 20.0)))
+        self.__detection_interval = min(
+            max(interval, 1), self._arguments.get("detect_every", 1))
+
+    def __grab_stage(self, stop_event: threading.Event = None) -> list:
+        """"
+            :param stop_event: threading.Event, stop event of frame
+            pipeline, None in sequential mode
+            :return list of FrameRecord
+
+            @brief
+            Private class method in which a batch of next frames is
+            grabbed and numbered. Batch is shorter when the stream has
+            no more frames and None is returned at the end of offline
+            source.
+        """
+        batch: list = []
+        while len(batch) < self._arguments.get("batch_size", 1):
+            record: FrameRecord = self.__get_frame(stop_event)
+            if record is None:
+                # offline sources are exhausted, cameras are waited for
+                if self._offline_source or batch or \
+                        self.__is_stopping(stop_event):
+                    break
+                continue
+
+            # update frame counter
+            self.__frame_counter += 1
+            record.frame_number = self.__frame_counter
+            batch.append(record)
+
+        return batch or None
+
+    def __drop_stale_frames(self, batch: list) -> list:
+        """"
+            :param batch: list of FrameRecord, grabbed frames
+            :return list of FrameRecord
 
+            @brief
+            Private class method in which frames of live sources captured
+            earlier than --latency-budget seconds ago are dropped, so they
+            are neither passed through the network nor saved. Frames of
+            offline sources are kept, their capture time is the time they
+            were decoded ahead, so queued frames only look stale.
+        """
+        latency_budget: float = self._arguments.get("latency_budget")
+        if latency_budget is None or self._offline_source:
+            return batch
+
+        oldest_capture_time: float = time.perf_counter() - latency_budget
+        fresh_batch: list = []
+        for record in batch:
+            if record.capture_time >= oldest_capture_time:
+                fresh_batch.append(record)
+            elif record.release is not None:
+                record.release()
+        self.__stale_frames_counter += len(batch) - len(fresh_batch)
+
+        return fresh_batch
+
+    def __inference_stage(self, batch: list) -> list:
+        """"
+            :param batch: list of FrameRecord, grabbed frames
+            :return list of FrameRecord
+
+            @brief
+            Private class method in which object detections for
+            the selected frames are obtained in a single forward pass
+            and filtered. Detections of the other frames are
+            propagated by the object tracker, static frames reuse
+            detections of the previous frame. Frames exceeding
+            latency budget are dropped first.
+        """
+        batch = self.__drop_stale_frames(batch)
+        detection_batch: list = self.__select_detection_frames(batch)
+        if detection_batch:
+            start_time: float = time.perf_counter()
+            detections: list = self._detect_images(
+                [record.image for record in detection_batch],
+                self.__detect_batch)
+            for record, frame_detections in zip(detection_batch, detections):
+                record.detections = frame_detections
+            self.__adapt_detection_interval(
+                (time.perf_counter() - start_time) / len(detection_batch))
+
+        self.__inferred_frames_counter += len(detection_batch)
+        for record in batch:
+            if record.gated:
+                # static frame reuses detections of the previous frame,
+                # they are marked as not detected in this frame
+                self.__gated_frames_counter += 1
+                record.objects = self.__previous_objects.copy()
+                record.objects['tracked'] = True
+            elif self.__object_tracker is None:
+                if record.detections is None:
+                    logging.warning("No detections in frame")
+                # filtering all detections at once
+                with self._stage_timer.measure("filtering"):
+                    record.objects = self._filter_detections(
+                        record.detections, record.image.shape)
+            elif record.detections is not None:
+                with self._stage_timer.measure("filtering"):
+                    record.objects = self._filter_detections(
+                        record.detections, record.image.shape)
+                with self._stage_timer.measure("tracking"):
+                    record.objects = self.__object_tracker.update(
+                        record.objects, record.image)
+            else:
+                with self._stage_timer.measure("tracking"):
+                    record.objects = self.__object_tracker.predict(
+                        record.image)
+            self.__previous_objects = record.objects
+
+        return batch
+
+    def __annotation_stage(self, batch: list) -> list:
+        """"
+            :param batch: list of FrameRecord, frames with their filtered
+            detections
+            :return list of FrameRecord
+
+            @brief
+            Private class method in which detections are reported and
+            drawn into annotated frames, frames are annotated only when
+            they are shown or saved
+        """
+        annotation_needed: bool = self._display_enabled or \
+            self.__video_recorder is not None or \
+            (self.__result_server is not None and
+             self.__result_server.video_clients() > 0)
+        for record in batch:
+            self.__report_detections(record)
+            if annotation_needed:
+                with self._stage_timer.measure("drawing"):
+                    record.annotated_image = self.__renderer.render(
+                        record.image, record.objects)
+
+        return batch
+
+    def __release_record(self, record: FrameRecord) -> None:
+        """"
+            :param record: FrameRecord, frame which is not used anymore
+            :return None
+
+            @brief
+            Private class method in which shared frame buffer and output
+            buffer of annotated frame are released, only once
+        """
+        if record.release is not None:
+            record.release()
+            record.release = None
+        if record.annotated_image is not None and \
+                record.annotated_image is not record.image:
+            self.__renderer.release(record.annotated_image)
+        record.annotated_image = None
+
+    def __release_batch(self, batch: list) -> None:
+        """"
+            :param batch: list of FrameRecord, frames dropped by frame
+            pipeline
+            :return None
+
+            @brief
+            Private class method in which buffers of dropped frames are
+            released
+        """
+        for record in batch:
+            self.__release_record(record)
+
+    def __output_stage(self, batch: list) -> bool:
+        """"
+            :param batch: list of FrameRecord, annotated frames
+            :return bool
+
+            @brief
+            Private class method in which annotated frames are queued
+            for saving in video sequence, served and shown. Offline
+            sources are not shown and neither are frames in headless
+            mode. False is returned when the 'Q' key is pressed, stop is
+            requested or frame or duration limit is reached, remaining
+            frames of the batch are released then.
+        """
+        for position, record in enumerate(batch):
+            key: int = -1
+            if self._display_enabled:
                 # show output frame
-                cv2.imshow("Recognized Objects", self.image)
-                key: int = cv2.waitKey(1) & 0xFF
+                with self._stage_timer.measure("display"):
+                    cv2.imshow("Recognized Objects", record.annotated_image)
+                    key = cv2.waitKey(1) & 0xFF
+
+            if self.__result_server is not None:
+                with self._stage_timer.measure("streaming"):
+                    self.__result_server.publish(
+                        record.frame_number, time.time() -
+                        (time.perf_counter() - record.capture_time),
+                        record.annotated_image, record.objects,
+                        self._classes_of_interest)
+
+            release = None
+            if record.release is not None or \
+                    record.annotated_image is not record.image:
+                release = functools.partial(self.__release_record, record)
+            if self.__video_recorder is not None:
+                # queue output frame for saving in video sequence, frame
+                # buffers are released by recorder after encoding
+                with self._stage_timer.measure("recording"):
+                    self.__video_recorder.write(record.annotated_image,
+                                                record.capture_time,
+                                                len(record.objects) > 0,
+                                                release)
+            elif release is not None:
+                release()
+
+            # if the 'Q' key was pressed, break from loop
+            if key == ord("q"):
+                self.__release_batch(batch[position + 1:])
+                return False
+
+            # updating the FPS counter
+            self._fps.update()
+            self.__output_frames_counter += 1
+            self._stage_timer.record("capture_to_output",
+                                     time.perf_counter() -
+                                     record.capture_time)
+
+            if self.__is_limit_reached():
+                self.__release_batch(batch[position + 1:])
+                return False
+
+        # exporting stage latency percentiles periodically
+        self._stage_timer.export_if_due()
+
+        return True
+
+    def __is_limit_reached(self) -> bool:
+        """"
+            :return bool
+
+            @brief
+            Private class method which tells whether stop was requested
+            or --max-frames or --max-duration limit is reached
+        """
+        max_frames: int = self._arguments.get("max_frames")
+        max_duration: float = self._arguments.get("max_duration")
+
+        return self.__stop_requested.is_set() or \
+            (max_frames is not None and
+             self.__output_frames_counter >= max_frames) or \
+            (max_duration is not None and
+             time.perf_counter() - self.__processing_start_time >=
+             max_duration)
+
+    def __request_stop(self, signal_number: int, _) -> None:
+        """"
+            :param signal_number: int, received signal
+            :return None
 
-                # if the 'Q' key was pressed, break from loop
-                if key == ord("q"):
+            @brief
+            Private class method used as signal handler, processing is
+            stopped after the current frame
+        """
+        logging.info("Signal %d received, stopping...", signal_number)
+        self.__stop_requested.set()
+
+    def __install_signal_handlers(self) -> dict:
+        """"
+            :return dict, previous signal handlers
+
+            @brief
+            Private class method in which SIGINT and SIGTERM handlers
+            requesting clean stop are installed. Signal handlers can be
+            installed only from the main thread.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return {}
+
+        return {signal_number: signal.signal(signal_number,
+                                             self.__request_stop)
+                for signal_number in (signal.SIGINT, signal.SIGTERM)}
+
+    def __start_result_server(self) -> None:
+        """"
+            :return None
+
+            @brief
+            Private class method in which result server is started when
+            --serve-port argument is given, server module is imported
+            only then
+        """
+        if self._arguments.get("serve_port") is None:
+            return
+
+        from image_and_video_prosessors.result_server import ResultServer
+        try:
+            self.__result_server = ResultServer(
+                self._arguments.get("serve_host", '127.0.0.1'),
+                self._arguments["serve_port"],
+                self._arguments.get("jpeg_quality", 80)).start()
+            logging.info("Results are served on %s",
+                         self.__result_server.url())
+        except OSError:
+            logging.error("Error occurred during starting result server")
+            self.__result_server = None
+
+    def __frame_processing(self) -> None:
+        """
+            :return None
+
+            @brief
+            Private class method in which video stream is
+            saved to physical HDD memory by video recorder while
+            frames are processed in batches via grab, inference,
+            annotation and output stages. Stages are run one after
+            another or, in pipelined mode, concurrently. Exit from
+            realtime video stream mode is handled, offline sources are
+            processed until their last frame.
+        """
+        self.__processing_start_time = time.perf_counter()
+        # frame rate of video file is kept, image files are saved with
+        # 20 FPS and frame rate of live sources is measured
+        fps: float = getattr(self._video_stream, 'fps', None)
+        if self._offline_source and not fps:
+            fps = 20.0
+        self.__video_recorder = None if self._arguments.get("no_video") \
+            else VideoRecorder(
+                self._results_dir, self._fourcc, fps,
+                segment_duration=self._arguments.get("segment_duration"),
+                segment_size=self._arguments.get("segment_size"),
+                detections_only=self._arguments.get("record_detections_only",
+                                                    False),
+                pre_roll=self._arguments.get("pre_roll", 2.0),
+                post_roll=self._arguments.get("post_roll", 2.0),
+                stage_timer=self._stage_timer).start()
+        self.__start_result_server()
+        if self._arguments.get("pipelined"):
+            pipeline: FramePipeline = FramePipeline(
+                self._arguments.get("queue_size", 4))
+            pipeline.add_stage("inference", self.__inference_stage)
+            pipeline.add_stage("annotation", self.__annotation_stage)
+            pipeline.run(self.__grab_stage, self.__output_stage,
+                         self.__release_batch)
+        else:
+            while True:
+                batch: list = self.__grab_stage()
+                if batch is None:
+                    break
+                batch = self.__annotation_stage(
+                    self.__inference_stage(batch))
+                if not self.__output_stage(batch):
                     break
 
-                # updating the FPS counter
-                self._fps.update()
+        # saving queued frames and releasing video writer stream
+        if self.__video_recorder is not None:
+            self.__video_recorder.close()
+        if self.__result_server is not None:
+            self.__result_server.stop()
+
+        if self._offline_source:
+            logging.info("Processed frames: %d", self.__frame_counter -
+                         self._arguments.get("start_frame", 0))
+
+    def __get_run_statistics(self) -> dict:
+        """"
+            :return dict
+
+            @brief
+            Private class method in which additional statistics for
+            report overview are collected
+        """
+        statistics: dict = {} if self.__video_recorder is None else \
+            self.__video_recorder.statistics()
+        if self.__result_server is not None:
+            statistics.update(self.__result_server.statistics())
+        if self.__motion_gate is not None:
+            statistics["Inferred frames"] = self.__inferred_frames_counter
+            statistics["Motion gated frames"] = self.__gated_frames_counter
+        if self._arguments.get("latency_budget") is not None and \
+                not self._offline_source:
+            if isinstance(self._video_stream, LatestFrameSource):
+                statistics["Dropped frames at capture"] = \
+                    self._video_stream.dropped_frames
+            statistics["Dropped stale frames"] = self.__stale_frames_counter
+        statistics.update(self._stage_timer.overview())
+
+        return statistics
+
+    def processed_frames(self) -> int:
+        """"
+            :return int
 
-        # releasing video writer stream
-        __video_writer.release()
+            @brief
+            Public class method which returns number of frames which
+            passed the output stage
+        """
+        return self.__output_frames_counter
 
-    def real_time_object_recognition(self) -> None:
+    def stop(self) -> None:
         """"
             :return None
 
-            @ brief
-            Public class method in which is implemented
-            object recognition workflow
+            @brief
+            Public class method in which processing is requested to
+            stop after the current frame
         """
-        # preparing report file and directory
-        self.__report_generator.create_results_dir()
-        self.__report_generator.create_report()
+        self.__stop_requested.set()
 
-        # prepare model
-        self._prepare_model()
+    def __load_model(self) -> None:
+        """"
+            :return None
+
+            @brief
+            Private class method in which model is loaded and loading
+            time is kept, it is run by model loader thread
+        """
+        start_time: float = time.perf_counter()
+        self._load_model()
+        self.__startup_times["model load"] = \
+            time.perf_counter() - start_time
+
+    def __finish_startup(self, model_loader: threading.Thread) -> None:
+        """"
+            :param model_loader: threading.Thread, thread loading model
+            :return None
+
+            @brief
+            Private class method in which model loading is waited for,
+            network is warmed up and startup time breakdown is logged
+        """
+        start_time: float = time.perf_counter()
+        model_loader.join()
+        self.__startup_times["model wait"] = \
+            time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        self._warm_up_model(max(1, self._arguments.get("batch_size", 1)))
+        self.__startup_times["warm-up"] = time.perf_counter() - start_time
+        self.__startup_times["total"] = \
+            time.perf_counter() - self.__startup_times.pop("start")
+
+        logging.info("Startup time: %s", ", ".join(
+            "{} {:.3f} s".format(phase, duration)
+            for phase, duration in self.__startup_times.items()))
+
+    def __autotune(self, source: str, model_loader: threading.Thread) -> None:
+        """"
+            :param source: str, source of sample frames ;
+            :param model_loader: threading.Thread, thread loading model
+            :return None
 
-        # starting video stream
-        self._start_video_stream()
+            @brief
+            Private class method in which sample frames are read from the
+            source and network settings available on this machine are
+            benchmarked on them, the fastest settings are saved in tuning
+            file used by later runs
+        """
+        self._start_video_stream(
+            source, True, False,
+            (self._arguments.get("start_frame", 0),
+             self._arguments.get("end_frame")))
+        model_loader.join()
+
+        frames: list = []
+        while len(frames) < self._arguments.get("autotune_frames", 30):
+            (frame, _) = self._read_frame()
+            if frame is None:
+                break
+            frames.append(frame.copy())
+        self._video_stream.stop()
+        if not frames:
+            logging.error("No sample frames for tuning were read")
+            return
+
+        (settings, timings) = tune_model(
+            self, frames, candidate_settings(
+                self._dnn_settings["input_size"]),
+            max(1, self._arguments.get("batch_size", 1)))
+        if settings is None:
+            logging.error("No usable network settings were found")
+            return
+
+        tuning_file: str = self._arguments["tuning_file"]
+        save_tuning(tuning_file, settings, timings, self._arguments["model"])
+        logging.info("Fastest network settings %s are saved in %s",
+                     settings, tuning_file)
+
+    def __process_source(self, source: str,
+                         model_loader: threading.Thread = None) -> None:
+        """"
+            :param source: str, source of video stream ;
+            :param model_loader: threading.Thread, thread loading model
+            while video stream is started, None when model is ready
+            :return None
+
+            @brief
+            Private class method in which frames of a single source are
+            processed and report, video and histograms are saved
+        """
+        self.__setup_tracking()
 
-        # call frame processing method
-        self.__frame_processing()
+        # preparing report file and directory
+        self.__report_generator.create_results_dir(
+            not self._arguments.get("no_histograms", False))
+        self.__report_generator.create_report(
+            self.__object_tracker is not None)
+        self.__setup_histograms()
+        if self._arguments.get("roi_file"):
+            self._set_regions_of_interest(
+                load_regions(self._arguments["roi_file"], source))
+
+        # starting video stream, frames of a part of offline source
+        # keep their numbers in the whole source
+        start_frame: int = self._arguments.get("start_frame", 0)
+        self.__frame_counter = start_frame
+        self.__output_frames_counter = 0
+        start_time: float = time.perf_counter()
+        self._start_video_stream(
+            source, self._arguments.get("headless", False),
+            self._arguments.get("latency_budget") is not None,
+            (start_frame, self._arguments.get("end_frame")),
+            self._arguments.get("capture_process", 0))
+        if model_loader is not None:
+            self.__startup_times["source open"] = \
+                time.perf_counter() - start_time
+            self.__finish_startup(model_loader)
+        self._start_fps_counter()
+
+        # call frame processing method, signals stop it cleanly
+        previous_handlers: dict = self.__install_signal_handlers()
+        try:
+            self.__frame_processing()
+        finally:
+            for signal_number, handler in previous_handlers.items():
+                signal.signal(signal_number, handler)
 
         # stopping video stream
         self._stop_video_stream_and_clean_up()
+        self._stage_timer.export()
 
         # add overview of detected objects in the report
         self.__report_generator.add_report_overview(
             self.__detections_counter,
             self._fps.elapsed(),
-            self._fps.fps())
+            self._fps.fps(),
+            self.__get_run_statistics())
 
-        # closing report file
+        # closing report file and histogram store
         self.__report_generator.close_file()
+        if self.__histogram_generator is not None:
+            self.__histogram_generator.close()
+
+    def __process_sources(self, sources: list) -> None:
+        """"
+            :param sources: list, sources of video streams
+            :return None
+
+            @brief
+            Private class method in which every source is processed in
+            its own thread by its own ObjectRecognition object, with own
+            report, video, histograms and FPS counter saved in
+            source_<index> subdirectory of results directory. Frames of
+            all sources are passed through the network of this object
+            by inference scheduler, which batches them across sources.
+            Frames are not shown, OpenCV windows are not thread-safe.
+        """
+        batch_size: int = max(1, self._arguments.get("batch_size", 1))
+        scheduler: InferenceScheduler = InferenceScheduler(
+            self._get_batch_detections, len(sources),
+            self._arguments.get("schedule", 'round-robin'),
+            batch_size * len(sources),
+            self._arguments.get("deadline", 0.1)).start()
+
+        channels: list = []
+        for index in range(len(sources)):
+            channel: ObjectRecognition = ObjectRecognition(
+                os.path.join(self._results_dir, 'source_{}'.format(index)))
+            channel._share_model(self)
+            channel._arguments["headless"] = True
+            if self._arguments.get("serve_port"):
+                # every source is served on its own port
+                channel._arguments["serve_port"] = \
+                    self._arguments["serve_port"] + index
+            channel.__detect_batch = functools.partial(scheduler.detect,
+                                                       index)
+            channels.append(channel)
+        threads: list = [threading.Thread(target=channel.__process_source,
+                                          args=(source,),
+                                          name="source-{}".format(index))
+                         for index, (channel, source)
+                         in enumerate(zip(channels, sources))]
+
+        # signals are received by main thread and forwarded to sources
+        previous_handlers: dict = self.__install_signal_handlers()
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.1)
+                    if self.__stop_requested.is_set():
+                        for channel in channels:
+                            channel.stop()
+        finally:
+            for signal_number, handler in previous_handlers.items():
+                signal.signal(signal_number, handler)
+            scheduler.stop()
+
+        self._stage_timer.export()
+        for name, value in scheduler.statistics().items():
+            logging.info("%s: %s", name, value)
+
+    def real_time_object_recognition(self, argv: list = None) -> None:
+        """"
+            :param argv: list, command line arguments, sys.argv is
+            used when they are not given
+            :return None
+
+            @ brief
+            Public class method in which is implemented
+            object recognition workflow
+        """
+        # prepare arguments, model is loaded while the video stream
+        # is started
+        self.__startup_times = {"start": time.perf_counter()}
+        self._prepare_arguments(argv)
+        model_loader: threading.Thread = threading.Thread(
+            target=self.__load_model, name="model-loader", daemon=True)
+        model_loader.start()
+
+        # several sources share the loaded model
+        sources: list = self._arguments.get("source") or [None]
+        if self._arguments.get("autotune"):
+            self.__autotune(sources[0], model_loader)
+        elif len(sources) > 1:
+            self.__finish_startup(model_loader)
+            self.__process_sources(sources)
+        else:
+            self.__process_source(sources[0], model_loader)
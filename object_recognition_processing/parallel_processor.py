@@ -0,0 +1,154 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import logging
+import multiprocessing
+import os
+import time
+
+from object_recognition_processing.object_recognition_processor import \
+    ObjectRecognition
+from report_handlers.csv_report_handler import ReportGenerator
+from report_handlers.histogram_store import HistogramStore
+
+
+def split_frame_ranges(frames: int, parts: int) -> list:
+    """"
+        :param frames: int, number of frames of the source ;
+        :param parts: int, number of parts
+        :return list of tuples, index of the first frame and index after
+        the last frame of every part
+
+        @brief Public function in which frames are split into contiguous
+        parts of nearly equal length. The last part is open ended, so
+        frames missing in the frame count of video header are processed
+        as well.
+    """
+    parts = max(1, min(parts, frames))
+    bounds: list = [frames * part // parts for part in range(parts + 1)]
+    ranges: list = list(zip(bounds[:-1], bounds[1:]))
+    ranges[-1] = (ranges[-1][0], None)
+
+    return ranges
+
+
+def process_frame_range(argv: list, frame_range: tuple, results_dir: str,
+                        threads: int) -> dict:
+    """"
+        :param argv: list, command line arguments of object recognition ;
+        :param frame_range: tuple, index of the first frame and index after
+        the last frame, None for the end of source ;
+        :param results_dir: str, directory results of the part are saved in ;
+        :param threads: int, number of OpenCV threads of the worker
+        :return dict
+
+        @brief Public function run in a worker process in which frames of
+        one part of the source are processed in headless mode with its own
+        loaded network
+    """
+    argv = argv + ['--headless', '--start-frame', str(frame_range[0])]
+    if '--threads' not in argv:
+        # workers share CPUs, tuned thread count is not used
+        argv += ['--threads', str(threads)]
+    if frame_range[1] is not None:
+        argv += ['--end-frame', str(frame_range[1])]
+
+    recognition: ObjectRecognition = ObjectRecognition(results_dir)
+    recognition.real_time_object_recognition(argv)
+
+    return {"frames": recognition.processed_frames(),
+            "fps": round(recognition._fps.fps(), 3)}
+
+
+def merge_results(part_dirs: list, results_dir: str, elapsed_time: float,
+                  frames: int, statistics: dict = None) -> None:
+    """"
+        :param part_dirs: list, results directories of parts in frame
+        order ;
+        :param results_dir: str, directory merged results are saved in ;
+        :param elapsed_time: float, processing time of all parts ;
+        :param frames: int, number of processed frames ;
+        :param statistics: dict, additional named statistics of the run
+        :return None
+
+        @brief Public function in which annotation reports and histograms
+        of the parts are merged in frame order. Track IDs of every part
+        follow the track IDs of the previous parts.
+    """
+    report_file_names: list = [os.path.join(part_dir, 'annotation_report')
+                               for part_dir in part_dirs]
+    tracking: bool = False
+    if os.path.isfile(report_file_names[0]):
+        with open(report_file_names[0]) as report_file:
+            tracking = 'track_id' in report_file.readline() + \
+                report_file.readline()
+
+    report_generator: ReportGenerator = ReportGenerator(
+        results_dir=results_dir)
+    report_generator.create_results_dir()
+    report_generator.create_report(tracking)
+    detections_cnt: int = 0
+    track_id_offset: int = 0
+    for report_file_name in report_file_names:
+        (part_detections, max_track_id) = report_generator.add_report_rows(
+            report_file_name, track_id_offset)
+        detections_cnt += part_detections
+        track_id_offset = max(track_id_offset, max_track_id + 1)
+    report_generator.add_report_overview(
+        detections_cnt, elapsed_time, frames / max(elapsed_time, 1e-9),
+        statistics)
+    report_generator.close_file()
+
+    HistogramStore.merge(
+        [os.path.join(part_dir, 'histograms', 'histograms.npz')
+         for part_dir in part_dirs],
+        os.path.join(results_dir, 'histograms', 'histograms.npz'))
+
+
+def process_in_parallel(source: str, frames: int, workers: int,
+                        argv: list, results_dir: str = 'results') -> dict:
+    """"
+        :param source: str, path of video file, image directory or glob
+        pattern of image files ;
+        :param frames: int, number of frames of the source ;
+        :param workers: int, number of worker processes ;
+        :param argv: list, additional command line arguments of object
+        recognition ;
+        :param results_dir: str, directory results are saved in
+        :return dict
+
+        @brief Public function in which source is split into frame ranges
+        processed by a pool of worker processes, every part is saved in
+        part_<index> subdirectory of results directory and reports and
+        histograms are merged afterwards. Annotated video stays split
+        into parts.
+    """
+    frame_ranges: list = split_frame_ranges(frames, workers)
+    part_dirs: list = [os.path.join(results_dir, 'part_{}'.format(index))
+                       for index in range(len(frame_ranges))]
+    threads: int = max(1, (os.cpu_count() or 1) // len(frame_ranges))
+    logging.info("Processing %d frames in %d parts...", frames,
+                 len(frame_ranges))
+
+    start_time: float = time.perf_counter()
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(len(frame_ranges)) as pool:
+        parts: list = pool.starmap(
+            process_frame_range,
+            [(['-s', source] + argv, frame_range, part_dir, threads)
+             for frame_range, part_dir in zip(frame_ranges, part_dirs)])
+    elapsed_time: float = time.perf_counter() - start_time
+
+    processed_frames: int = sum(part["frames"] for part in parts)
+    merge_results(part_dirs, results_dir, elapsed_time, processed_frames,
+                  {"Workers": len(frame_ranges),
+                   "Processed frames": processed_frames})
+
+    return {"frames": processed_frames,
+            "elapsed_s": round(elapsed_time, 3),
+            "fps": round(processed_frames / max(elapsed_time, 1e-9), 3),
+            "parts": parts}
@@ -0,0 +1,56 @@
+"""
+author: Monika Marinova
+version: 1.0
+date:
+python version: 3.6
+openCV version: 4.7.12
+"""
+import argparse
+import logging
+import os
+import sys
+
+from image_and_video_prosessors.frame_sources import count_frames, \
+    is_live_source
+from object_recognition_processing.parallel_processor import \
+    process_in_parallel
+
+
+def parallel_recognition_main() -> int:
+    """"
+        :return int, exit code
+
+        @ brief
+        Public method in which long video file or image files are split
+        into frame ranges processed by several worker processes, each
+        with its own loaded model. Arguments which are not listed here
+        are passed to object recognition of every worker.
+    """
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    arg_parser.add_argument('-s', '--source', required=True,
+                            help="video file, image directory or glob "
+                                 "pattern of image files")
+    arg_parser.add_argument('-w', '--workers', type=int,
+                            default=os.cpu_count() or 1,
+                            help="number of worker processes")
+    (arguments, recognition_argv) = arg_parser.parse_known_args()
+
+    if is_live_source(arguments.source):
+        logging.error("Live sources can not be processed in parallel")
+        return 1
+    frames: int = count_frames(arguments.source)
+    if not frames:
+        logging.error("Source %s has no frames", arguments.source)
+        return 1
+
+    results: dict = process_in_parallel(arguments.source, frames,
+                                        arguments.workers, recognition_argv)
+    logging.info("Processed frames: %d", results["frames"])
+    logging.info("Elapsed time: {:.2f}".format(results["elapsed_s"]))
+    logging.info("Approximate FPS: {:.2f}".format(results["fps"]))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(parallel_recognition_main())
@@ -0,0 +1,49 @@
+"""
+author: Monika Marinova
+version: 1.0
+date:
+python version: 3.6
+openCV version: 4.7.12
+"""
+import argparse
+import logging
+import os
+
+from report_handlers.histogram_plotter import HistogramPlotter
+
+
+def render_histograms_main() -> None:
+    """"
+        :return None
+
+        @ brief
+        Public method in which RGB histograms stored during object
+        recognition run are rendered offline as png plots.
+    """
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    arg_parser.add_argument('-i', '--store',
+                            default=os.path.join('results', 'histograms',
+                                                 'histograms.npz'),
+                            help="path to histogram store archive")
+    arg_parser.add_argument('-o', '--output',
+                            default=os.path.join('results', 'histograms'),
+                            help="directory for rendered png plots")
+    arg_parser.add_argument('-f', '--frames', type=int, nargs='+',
+                            help="frame numbers to be rendered, all "
+                                 "stored frames are rendered by default")
+    arg_parser.add_argument('-b', '--bins', type=int, default=16,
+                            help="bins per channel")
+    arguments: dict = vars(arg_parser.parse_args())
+
+    histogram_plotter = HistogramPlotter(bins=arguments["bins"])
+    try:
+        rendered: int = histogram_plotter.render_store(arguments["store"],
+                                                       arguments["output"],
+                                                       arguments["frames"])
+        logging.info("Rendered histogram plots: %d", rendered)
+    finally:
+        histogram_plotter.close()
+
+
+if __name__ == "__main__":
+    render_histograms_main()
@@ -8,8 +8,8 @@ openCV version: 4.7.12
 import io
 import logging
 import os
+import threading
 
-import imutils.video
 import numpy
 
 
@@ -18,26 +18,58 @@ class ReportGenerator:
     """"
         @brief Class in which is implemented logic for
         creating results and histograms directories, run
-        report text file is generated
+        report text file is generated. Report file is kept open
+        for the whole run and records are buffered in memory and
+        written by a background thread.
     """
 
-    def __init__(self):
+    def __init__(self, flush_size: int = 256, flush_interval: float = 1.0,
+                 results_dir: str = 'results'):
         """"
+            :param flush_size: int, number of buffered records which
+            triggers writing into report file ;
+            :param flush_interval: float, maximum time in seconds records
+            are kept in memory ;
+            :param results_dir: str, results directory relative to the
+            project directory
+
             @brief Class instantiation: setup of class attributes
         """
         try:
             # private class attribute project directory path holder
             self.__project_root_dir: str = os.getcwd()
             # private class attribute results directory path holder
-            self.__results_dir: str = self.__project_root_dir + '\\results'
+            self.__results_dir: str = os.path.join(
+                self.__project_root_dir, results_dir)
+            # private class attribute report file name holder
+            self.__report_file_name: str = os.path.join(
+                results_dir, 'annotation_report')
             # private class attribute to be used as report file holder
             self.__report_file: io.TextIOWrapper = None
+            # private class attribute for records waiting to be written
+            self.__records_buffer: list = []
+            # private class attribute for buffer size flush threshold
+            self.__flush_size: int = max(1, flush_size)
+            # private class attribute for time flush threshold
+            self.__flush_interval: float = flush_interval
+            # private class attribute guarding records buffer and
+            # waking up the flush thread
+            self.__buffer_condition: threading.Condition = \
+                threading.Condition()
+            # private class attribute serializing writes into report file
+            self.__write_lock: threading.Lock = threading.Lock()
+            # private class attribute to be used as flush thread holder
+            self.__flush_thread: threading.Thread = None
+            # private class attribute used for stopping flush thread
+            self.__stop_flushing: bool = False
         except Exception:
             logging.error("Error occurred during ReportGenerator "
                           "object instantiation")
 
-    def create_results_dir(self) -> None:
+    def create_results_dir(self, histograms: bool = True) -> None:
         """"
+            :param histograms: bool, True when histograms directory is
+            created as well
             :return None
 
             @brief Public class method in which work directory is changed
@@ -47,9 +79,9 @@ class ReportGenerator:
             # changing work directory
             os.chdir(self.__project_root_dir)
             # create results directory if it is not existing
-            if not os.path.isdir('results'):
-                os.mkdir('results')
-            self.__create_histogram_dir()
+            os.makedirs(self.__results_dir, exist_ok=True)
+            if histograms:
+                self.__create_histogram_dir()
         except PermissionError:
             logging.error("Permission error occurred during "
                           "creating results directory")
@@ -61,43 +93,181 @@ class ReportGenerator:
             @brief Private class method for creating
             histograms plots directory
         """
-        os.chdir(self.__results_dir)
+        # work directory is not changed, reports of several sources
+        # are created concurrently
+        histograms_dir: str = os.path.join(self.__results_dir, 'histograms')
         try:
-            if not os.path.isdir('histograms'):
-                os.mkdir('histograms')
+            if not os.path.isdir(histograms_dir):
+                os.mkdir(histograms_dir)
         except PermissionError:
             logging.error("Permission error occurred during "
                           "creating histograms directory")
 
-        os.chdir(self.__project_root_dir)
-
-    def create_report(self) -> None:
+    def create_report(self, tracking: bool = False) -> None:
         """"
+            :param tracking: bool, True when rows have track ID and
+            origin columns
             :return None
 
             @brief Public class method in which report file is created,
-            header row is writen in it
+            header row is writen in it and the background flush thread
+            is started
         """
-        # setting header row and file_name formats
+        # setting header row format
         header_row: str = 'Report_format: \n' \
                           'frame_number;object_type;detection' \
                           '_confidence' \
-                          ';region_of_interest;coordinates \n \n'
-        file_name: str = 'results\\annotation_report'
+                          ';region_of_interest;coordinates'
+        if tracking:
+            header_row += ';track_id;origin'
+        header_row += ' \n \n'
         try:
-            # open report file, mode: write only
-            with open(file_name, 'w') as self.__report_file:
-                # write first row - header row
-                self.__report_file.write(header_row)
+            # open report file, mode: write only, it stays open
+            # until close_file is called
+            self.__report_file = open(self.__report_file_name, 'w')
+            # write first row - header row
+            self.__report_file.write(header_row)
         except PermissionError:
             logging.error("Permission error occurred during "
                           "creating report file")
         except IOError:
             logging.error("IOError occurred during writing into report file")
 
+        self.__start_flush_thread()
+
+    def __start_flush_thread(self) -> None:
+        """"
+            :return None
+
+            @brief Private class method in which background thread
+            writing buffered records is started
+        """
+        if self.__flush_thread is not None:
+            return
+
+        self.__stop_flushing = False
+        self.__flush_thread = threading.Thread(target=self.__flush_worker,
+                                               name="report-flush",
+                                               daemon=True)
+        self.__flush_thread.start()
+
+    def __stop_flush_thread(self) -> None:
+        """"
+            :return None
+
+            @brief Private class method in which background flush
+            thread is stopped
+        """
+        if self.__flush_thread is None:
+            return
+
+        with self.__buffer_condition:
+            self.__stop_flushing = True
+            self.__buffer_condition.notify()
+        self.__flush_thread.join()
+        self.__flush_thread = None
+
+    def __flush_worker(self) -> None:
+        """"
+            :return None
+
+            @brief Private class method run by the flush thread, records
+            are written when buffer size or time threshold is reached
+        """
+        while True:
+            with self.__buffer_condition:
+                if not self.__stop_flushing and \
+                        len(self.__records_buffer) < self.__flush_size:
+                    self.__buffer_condition.wait(self.__flush_interval)
+                if self.__stop_flushing:
+                    return
+            self.flush()
+
+    def flush(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which all buffered records
+            are written into report file
+        """
+        with self.__buffer_condition:
+            rows: list = self.__records_buffer
+            self.__records_buffer = []
+
+        if rows:
+            self.__write_rows(rows)
+
+    def __write_rows(self, rows: list) -> None:
+        """"
+            :param rows: list, formatted report rows
+            :return None
+
+            @brief Private class method in which rows are written into
+            the open report file
+        """
+        try:
+            with self.__write_lock:
+                # report file is opened for appending when report was
+                # not created during this run
+                if self.__report_file is None or self.__report_file.closed:
+                    self.__report_file = open(self.__report_file_name, 'a')
+                self.__report_file.write(''.join(rows))
+                self.__report_file.flush()
+        except PermissionError:
+            logging.error("Permission error occurred during "
+                          "creating report file")
+        except IOError:
+            logging.error("IOError occurred during writing into report file")
+
+    def __buffer_rows(self, rows: list) -> None:
+        """"
+            :param rows: list, formatted report rows
+            :return None
+
+            @brief Private class method in which rows are added to the
+            buffer and flush thread is woken up when it is full
+        """
+        with self.__buffer_condition:
+            self.__records_buffer.extend(rows)
+            if len(self.__records_buffer) >= self.__flush_size:
+                self.__buffer_condition.notify()
+
+        # without flush thread records are written immediately
+        if self.__flush_thread is None:
+            self.flush()
+
+    @staticmethod
+    def __format_row(frame_number: int, obj_type: str,
+                     detection_confidence: float, coordinates: list,
+                     track_id: int = None, tracked: bool = None) -> str:
+        """"
+            :param frame_number: int, frame number ;
+            :param obj_type: str, object classification type ;
+            :param detection_confidence: float, object classification
+            accuracy between 0 and 1 ;
+            :param coordinates: list, four coordinates of region of interest ;
+            :param track_id: int, track ID of the object ;
+            :param tracked: bool, True when box was tracked, False when
+            it was detected
+            :return str
+
+            @brief Private static method in which a report row is formatted,
+            track columns are added only when track ID is given. Confidence
+            is written with float32 precision of network output.
+        """
+        row: str = '{:02d};{};{};[{} {} {} {}]'.format(
+            frame_number, obj_type, str(numpy.float32(detection_confidence)),
+            *coordinates)
+        if track_id is not None:
+            row += ';{};{}'.format(track_id,
+                                   'tracked' if tracked else 'detected')
+
+        return row + '\n'
+
     def add_record(self, frame_number: int, obj_type: str,
                    detection_confidence: float,
-                   coordinates_arr: numpy.ndarray) -> None:
+                   coordinates_arr: numpy.ndarray, track_id: int = None,
+                   tracked: bool = None) -> None:
         """"
             :param frame_number: int, frame number
             :param obj_type: str, object classification type
@@ -105,79 +275,137 @@ class ReportGenerator:
             between 0 and 1
             :param coordinates_arr: numpy.ndarray, array of four coordinates
             which are region of interest for the detected object
+            :param track_id: int, track ID of the object, not reported
+            when it is not given
+            :param tracked: bool, True when box was tracked, False when
+            it was detected
 
             :return None
 
             @brief Public class method in which row with information about
             one detected object is added
         """
-        # setting row record format and file name
-        if frame_number <= 9:
-            frame_number = '0' + str(frame_number)
+        self.__buffer_rows([ReportGenerator.__format_row(
+            frame_number, obj_type, float(detection_confidence),
+            numpy.asarray(coordinates_arr).tolist(), track_id, tracked)])
+
+    def add_records(self, frame_number: int, obj_types: list,
+                    detection_confidences: numpy.ndarray,
+                    coordinates_arr: numpy.ndarray,
+                    track_ids: numpy.ndarray = None,
+                    tracked: numpy.ndarray = None) -> None:
+        """"
+            :param frame_number: int, frame number
+            :param obj_types: list, object classification types
+            :param detection_confidences: numpy.ndarray, object
+            classification accuracies between 0 and 1
+            :param coordinates_arr: numpy.ndarray, N by 4 array of regions
+            of interest for the detected objects
+            :param track_ids: numpy.ndarray, track IDs of the objects, not
+            reported when they are not given
+            :param tracked: numpy.ndarray, True for tracked boxes, False
+            for detected ones
+
+            :return None
 
-        row: str = str(frame_number) + ';' + obj_type + ';' + \
-              str(detection_confidence) + ';' + \
-              str(coordinates_arr) + '\n'
+            @brief Public class method in which rows with information about
+            all objects detected in one frame are added
+        """
+        count: int = len(obj_types)
+        track_ids_list: list = [None] * count if track_ids is None \
+            else track_ids.tolist()
+        tracked_list: list = [None] * count if tracked is None \
+            else tracked.tolist()
+        self.__buffer_rows([ReportGenerator.__format_row(*row) for row in zip(
+            [frame_number] * count, obj_types,
+            detection_confidences.tolist(), coordinates_arr.tolist(),
+            track_ids_list, tracked_list)])
 
-        file_name: str = 'results\\annotation_report'
+    def add_report_rows(self, report_file_name: str,
+                        track_id_offset: int = 0) -> tuple:
+        """"
+            :param report_file_name: str, path of another report file ;
+            :param track_id_offset: int, value added to track IDs of
+            the rows
+            :return tuple of int number of detected objects and int
+            highest track ID, -1 without track IDs
 
+            @brief Public class method in which object rows of another
+            report, e.g. a report of a part of the same video, are added
+            in their order. Header and overview rows are skipped.
+        """
+        rows: list = []
+        detections_cnt: int = 0
+        max_track_id: int = -1
         try:
-            # open report file, mode: append text
-            with open(file_name, 'a') as self.__report_file:
-                # write a row
-                self.__report_file.write(row)
-        except PermissionError:
-            logging.error("Permission error occurred during "
-                          "creating report file")
+            with open(report_file_name) as report_file:
+                for row in report_file:
+                    columns: list = row.rstrip('\n').split(';')
+                    if len(columns) < 4 or not columns[0].isdigit():
+                        continue
+                    if len(columns) > 5:
+                        track_id: int = int(columns[4]) + track_id_offset
+                        max_track_id = max(max_track_id, track_id)
+                        columns[4] = str(track_id)
+                    if len(columns) <= 5 or columns[5] != 'tracked':
+                        detections_cnt += 1
+                    rows.append(';'.join(columns) + '\n')
         except IOError:
-            logging.error("IOError occurred during writing into report file")
+            logging.error("IOError occurred during reading report file")
+
+        self.__buffer_rows(rows)
+
+        return detections_cnt, max_track_id
 
     def add_report_overview(self, detections_cnt: int,
-                            elapsed_time: imutils.video.fps.FPS,
-                            approximate_fps: imutils.video.fps.FPS) \
-            -> None:
+                            elapsed_time: float,
+                            approximate_fps: float,
+                            statistics: dict = None) -> None:
         """"
              :param detections_cnt: int, total count of detected objects
              during recording
-             :param elapsed_time: imutils.video.fps.FPS, total time
+             :param elapsed_time: float, total time
              for recording
-             :param approximate_fps: imutils.video.fps.FPS, average frames
+             :param approximate_fps: float, average frames
              per second rate
+             :param statistics: dict, additional named run statistics
+             written as rows after the other overview rows
 
              :return None
 
              @brief Public class method in which rows with information
              about total count of detected objects during recording,
              total time for recording and average frames
-             per second rate in the end of report file
+             per second rate in the end of report file. Flush thread is
+             stopped and all buffered records are written before.
          """
-        # setting records format and file name
+        # setting records format
         detections_count_row: str = "Number of detected object: " + \
                                     str(detections_cnt) + '\n'
         elapsed_time_row: str = "Elapsed time: " + \
                                 str(elapsed_time) + '\n'
         approximate_fps_row: str = "Approximate FPS: " + \
                                    str(approximate_fps) + '\n'
-        file_name: str = 'results\\annotation_report'
 
-        try:
-            # open report file, mode: append text
-            with open(file_name, 'a') as self.__report_file:
-                # writing over view rows
-                self.__report_file.write(detections_count_row)
-                self.__report_file.write(elapsed_time_row)
-                self.__report_file.write(approximate_fps_row)
-        except PermissionError:
-            logging.error("Permission error occurred during "
-                          "creating report file")
-        except IOError:
-            logging.error("IOError occurred during writing into report file")
+        # final flush of buffered records
+        self.__stop_flush_thread()
+        self.flush()
+
+        # writing over view rows
+        self.__write_rows([detections_count_row, elapsed_time_row,
+                           approximate_fps_row] +
+                          [name + ": " + str(value) + '\n'
+                           for name, value in (statistics or {}).items()])
 
     def close_file(self) -> None:
         """"
             :return None
 
-            @brief Public class method for closing
-            private file
+            @brief Public class method in which buffered records are
+            written and private file is closed
         """
-        self.__report_file.close()
+        self.__stop_flush_thread()
+        self.flush()
+        with self.__write_lock:
+            if self.__report_file is not None:
+                self.__report_file.close()
@@ -0,0 +1,148 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import logging
+import os
+
+import matplotlib.axes
+import matplotlib.figure
+import matplotlib.pyplot
+import numpy
+
+from report_handlers.histogram_store import HistogramStore
+
+
+# pylint: disable=R0903, W0703
+class HistogramPlotter:
+    """"
+        @ brief Class in which is implemented logic for
+        rendering stored RGB histograms as png plots. A single
+        figure with three plot lines is reused for all frames.
+    """
+
+    def __init__(self, bins=16, line_width=3, alpha=0.5):
+        """"
+             @brief Class instantiation: setup of class attributes
+         """
+        # private attribute for bins per channel
+        self.__bins: int = bins
+        # private attribute for plotted line width
+        self.__line_width: int = line_width
+        # private attribute for line transparency
+        self.__alpha: float = alpha
+        # private attributes for figure
+        self.__figure: matplotlib.figure.Figure = None
+        # private attributes for axis
+        self.__axis: matplotlib.axes.Axes = None
+        # private attribute for red, green and blue plot lines
+        self.__lines: tuple = None
+        try:
+            self.__figure, self.__axis = matplotlib.pyplot.subplots()
+            self.__set_histogram_labels()
+            self.__set_axis_limits()
+            self.__lines = self.__initialize_plot_lines()
+        except RuntimeWarning:
+            logging.error("Runtime warning occurred during instantiation of "
+                          "HistogramPlotter object.")
+
+    def __set_histogram_labels(self) -> None:
+        """"
+            :return None
+
+            @brief Private class method in which histogram
+            title and axis labels are set
+        """
+        try:
+            # setting histogram name
+            self.__axis.set_title("RGB Histogram")
+            # setting axis labels
+            self.__axis.set_xlabel('Bin')
+            self.__axis.set_ylabel('Frequency')
+        except Exception:
+            logging.error("Error occurred during setting histogram labels.")
+
+    def __set_axis_limits(self) -> None:
+        """"
+            :return None
+
+            @brief Private class method in which axis
+            limits are set
+        """
+        try:
+            # setting x axis limit
+            self.__axis.set_xlim(0, self.__bins - 1)
+            # setting y axis limit
+            self.__axis.set_ylim(0, 1)
+        except Exception:
+            logging.error("Error occurred during setting axis limits.")
+
+    def __initialize_plot_lines(self) -> tuple:
+        """"
+            :return tuple of 2D Lines
+
+            @brief Private class method in which plot
+             lines are initialized
+        """
+        lines: list = []
+        for color in ('r', 'g', 'b'):
+            line, = self.__axis.plot(numpy.arange(self.__bins),
+                                     numpy.zeros((self.__bins,)),
+                                     c=color, lw=self.__line_width,
+                                     alpha=self.__alpha)
+            lines.append(line)
+
+        return tuple(lines)
+
+    def save_plot(self, histograms: numpy.ndarray, plot_name: str) -> None:
+        """"
+            :param histograms: numpy.ndarray, R, G and B histograms of
+            shape (3, bins) ;
+            :param plot_name: str, path of png image
+            :return None
+
+            @ brief Public class method in which plot lines data are set
+            and figure is saved as png image
+        """
+        try:
+            for line, histogram in zip(self.__lines, histograms):
+                line.set_ydata(histogram)
+            self.__figure.savefig(plot_name)
+        except IOError:
+            logging.error("Error occurred during saving histogram")
+
+    def render_store(self, archive_file_name: str, output_dir: str,
+                     frame_numbers: list = None) -> int:
+        """"
+            :param archive_file_name: str, path of histogram store archive ;
+            :param output_dir: str, directory for png images ;
+            :param frame_numbers: list, frames to be rendered, all stored
+            frames are rendered when it is not given
+            :return int, number of rendered plots
+
+            @brief Public class method in which stored histograms are
+            rendered as png images
+        """
+        (stored_frames, histograms) = HistogramStore.load(archive_file_name)
+        rendered: int = 0
+        for frame_number, frame_histograms in zip(stored_frames.tolist(),
+                                                  histograms):
+            if frame_numbers and frame_number not in frame_numbers:
+                continue
+            self.save_plot(frame_histograms, os.path.join(
+                output_dir,
+                'frame_' + str(frame_number) + '_histogram_plot.png'))
+            rendered += 1
+
+        return rendered
+
+    def close(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which figure is closed
+        """
+        matplotlib.pyplot.close(self.__figure)
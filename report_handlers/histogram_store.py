@@ -0,0 +1,141 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import io
+import logging
+import os
+
+import numpy
+
+
+# pylint: disable=R0903, W0703
+class HistogramStore:
+    """"
+        @brief Class in which is implemented logic for storing RGB
+        histograms keyed by frame number. During recording histograms
+        are appended as raw records to a binary file, which is converted
+        into a single compressed NumPy archive when the store is closed.
+    """
+
+    def __init__(self, store_name: str = os.path.join(
+            'results', 'histograms', 'histograms'),
+                 bins: int = 16):
+        """"
+            :param store_name: str, path of the store without extension ;
+            :param bins: int, bins per channel
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # private attribute for raw records file name
+        self.__raw_file_name: str = store_name + '.raw'
+        # private attribute for compressed archive file name
+        self.__archive_file_name: str = store_name + '.npz'
+        # private attribute for type of a single stored record
+        self.__record_dtype: numpy.dtype = HistogramStore.record_dtype(bins)
+        # private attribute for a reusable single record
+        self.__record: numpy.ndarray = numpy.zeros(1, self.__record_dtype)
+        # private attribute to be used as raw file holder
+        self.__raw_file: io.BufferedWriter = None
+
+    @staticmethod
+    def record_dtype(bins: int) -> numpy.dtype:
+        """"
+            :param bins: int, bins per channel
+            :return numpy.dtype
+
+            @brief Public static method which returns type of stored
+            record - frame number and R, G, B histograms
+        """
+        return numpy.dtype([('frame_number', numpy.int64),
+                            ('histogram', numpy.float32, (3, bins))])
+
+    def append(self, frame_number: int, histograms: tuple) -> None:
+        """"
+            :param frame_number: int, number of captured frame ;
+            :param histograms: tuple, R, G and B histograms
+            :return None
+
+            @brief Public class method in which histograms of one frame
+            are appended to the raw records file
+        """
+        try:
+            if self.__raw_file is None:
+                self.__raw_file = open(self.__raw_file_name, 'wb')
+
+            self.__record['frame_number'] = frame_number
+            for channel, histogram in enumerate(histograms):
+                self.__record['histogram'][0, channel] = histogram.ravel()
+            self.__raw_file.write(self.__record.tobytes())
+        except IOError:
+            logging.error("Error occurred during saving histogram")
+
+    def close(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which raw records are
+            converted into compressed archive and raw file is removed
+        """
+        if self.__raw_file is None:
+            return
+
+        try:
+            self.__raw_file.close()
+            records: numpy.ndarray = numpy.fromfile(self.__raw_file_name,
+                                                    dtype=self.__record_dtype)
+            numpy.savez_compressed(self.__archive_file_name,
+                                   frame_numbers=records['frame_number'],
+                                   histograms=records['histogram'])
+            os.remove(self.__raw_file_name)
+        except (IOError, OSError):
+            logging.error("Error occurred during saving histogram store")
+        finally:
+            self.__raw_file = None
+
+    @staticmethod
+    def load(archive_file_name: str) -> tuple:
+        """"
+            :param archive_file_name: str, path of compressed archive
+            :return tuple of frame numbers and histograms arrays
+
+            @brief Public static method in which stored histograms
+            are loaded
+        """
+        with numpy.load(archive_file_name) as archive:
+            return archive['frame_numbers'], archive['histograms']
+
+    @staticmethod
+    def merge(archive_file_names: list, merged_file_name: str) -> int:
+        """"
+            :param archive_file_names: list, paths of compressed archives ;
+            :param merged_file_name: str, path of merged archive
+            :return int, number of merged histograms
+
+            @brief Public static method in which histograms of several
+            archives, e.g. of parts of the same video, are merged into
+            one archive ordered by frame number. Missing archives are
+            skipped.
+        """
+        frame_numbers: list = []
+        histograms: list = []
+        for archive_file_name in archive_file_names:
+            if not os.path.isfile(archive_file_name):
+                continue
+            (archive_frames, archive_histograms) = \
+                HistogramStore.load(archive_file_name)
+            frame_numbers.append(archive_frames)
+            histograms.append(archive_histograms)
+        if not frame_numbers:
+            return 0
+
+        merged_frames: numpy.ndarray = numpy.concatenate(frame_numbers)
+        order: numpy.ndarray = numpy.argsort(merged_frames, kind='stable')
+        numpy.savez_compressed(merged_file_name,
+                               frame_numbers=merged_frames[order],
+                               histograms=numpy.concatenate(histograms)[order])
+
+        return len(order)
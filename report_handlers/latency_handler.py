@@ -0,0 +1,153 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy
+
+
+# pylint: disable=R0903, W0703
+class StageTimer:
+    """"
+        @brief Class in which is implemented logic for measuring latency
+        of processing stages. Latest samples of every stage are kept in
+        a rolling window, from which percentiles are calculated and
+        periodically exported as JSON lines.
+    """
+
+    def __init__(self, file_name: str = os.path.join(
+            'results', 'stage_latency.jsonl'),
+                 window_size: int = 1000, export_interval: float = 5.0):
+        """"
+            :param file_name: str, path of exported JSON lines file ;
+            :param window_size: int, number of latest samples per stage ;
+            :param export_interval: float, time between two exports in
+            seconds, nothing is exported when it is not positive
+
+            @brief Class instantiation: setup of class attributes
+        """
+        # private attribute for exported file name
+        self.__file_name: str = file_name
+        # private attribute for rolling window size
+        self.__window_size: int = max(1, window_size)
+        # private attribute for export interval
+        self.__export_interval: float = export_interval
+        # private attribute holding stage name -> samples window
+        self.__samples: dict = {}
+        # private attribute holding stage name -> number of samples
+        self.__counts: dict = {}
+        # private attribute guarding samples windows
+        self.__lock: threading.Lock = threading.Lock()
+        # private attribute for time of last export
+        self.__last_export_time: float = time.perf_counter()
+        # private attribute which is True after the first export,
+        # exported file of a previous run is overwritten before it
+        self.__exported: bool = False
+
+    def record(self, stage: str, seconds: float) -> None:
+        """"
+            :param stage: str, stage name ;
+            :param seconds: float, measured stage latency
+            :return None
+
+            @brief Public class method in which latency sample is added
+            to the rolling window of the stage
+        """
+        with self.__lock:
+            samples: numpy.ndarray = self.__samples.get(stage)
+            if samples is None:
+                samples = numpy.zeros(self.__window_size, dtype=numpy.float64)
+                self.__samples[stage] = samples
+                self.__counts[stage] = 0
+            samples[self.__counts[stage] % self.__window_size] = seconds
+            self.__counts[stage] += 1
+
+    @contextlib.contextmanager
+    def measure(self, stage: str):
+        """"
+            :param stage: str, stage name
+            :return context manager
+
+            @brief Public class method which measures latency of the code
+            run inside the with statement
+        """
+        start_time: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start_time)
+
+    def summary(self) -> dict:
+        """"
+            :return dict
+
+            @brief Public class method which returns number of samples and
+            p50, p95, p99 and maximum latency in milliseconds of every
+            stage, calculated over the rolling window
+        """
+        with self.__lock:
+            windows: dict = {stage: samples[:min(self.__counts[stage],
+                                                 self.__window_size)].copy()
+                             for stage, samples in self.__samples.items()}
+            counts: dict = dict(self.__counts)
+
+        summary: dict = {}
+        for stage, samples in windows.items():
+            (p50, p95, p99) = numpy.percentile(samples, (50, 95, 99)) * 1000
+            summary[stage] = {"count": counts[stage],
+                              "p50_ms": round(float(p50), 3),
+                              "p95_ms": round(float(p95), 3),
+                              "p99_ms": round(float(p99), 3),
+                              "max_ms": round(float(samples.max()) * 1000, 3)}
+
+        return summary
+
+    def export(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which current summary is
+            appended as JSON line to the exported file
+        """
+        self.__last_export_time = time.perf_counter()
+        line: str = json.dumps({"timestamp": time.time(),
+                                "stages": self.summary()})
+        try:
+            with open(self.__file_name,
+                      'a' if self.__exported else 'w') as export_file:
+                export_file.write(line + '\n')
+            self.__exported = True
+        except IOError:
+            logging.error("IOError occurred during exporting stage latency")
+
+    def export_if_due(self) -> None:
+        """"
+            :return None
+
+            @brief Public class method in which summary is exported when
+            export interval elapsed since the last export
+        """
+        if 0 < self.__export_interval <= \
+                time.perf_counter() - self.__last_export_time:
+            self.export()
+
+    def overview(self) -> dict:
+        """"
+            :return dict
+
+            @brief Public class method which returns summary formatted
+            as named rows for the report overview
+        """
+        return {"Latency " + stage + " [ms]":
+                "p50={p50_ms} p95={p95_ms} p99={p99_ms} max={max_ms}"
+                .format(**values)
+                for stage, values in self.summary().items()}
@@ -0,0 +1,13 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import os
+import sys
+
+# packages of the project are imported from its root directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
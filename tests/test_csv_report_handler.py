@@ -0,0 +1,77 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import threading
+import time
+
+import numpy
+
+from report_handlers.csv_report_handler import ReportGenerator
+
+
+def report_rows(tmp_path) -> list:
+    """"
+        :return list
+
+        @brief Function which returns lines of the written report
+    """
+    with open(str(tmp_path / 'results' / 'annotation_report')) as report:
+        return report.read().splitlines()
+
+
+def test_buffered_records_are_flushed_before_overview(tmp_path,
+                                                      monkeypatch):
+    """"
+        @brief Records which reached neither size nor time threshold are
+        written by the final flush, before overview rows, and the flush
+        thread is stopped without waiting for its interval
+    """
+    monkeypatch.chdir(tmp_path)
+    report_generator: ReportGenerator = ReportGenerator(
+        flush_size=1000, flush_interval=60.0)
+    report_generator.create_results_dir(histograms=False)
+    report_generator.create_report()
+    for frame_number in range(1, 6):
+        report_generator.add_records(
+            frame_number, ['person', 'cat'],
+            numpy.array([0.38336423, 0.5], dtype=numpy.float32),
+            numpy.array([[1, 2, 3, 4], [5, 6, 7, 8]], dtype=numpy.int32))
+
+    # nothing is written before a threshold is reached
+    assert not any(row.startswith('01;') for row in report_rows(tmp_path))
+
+    start_time: float = time.perf_counter()
+    report_generator.add_report_overview(10, 1.5, 20.0, {"Frames": 5})
+    report_generator.close_file()
+
+    assert time.perf_counter() - start_time < 5.0
+    assert not any(thread.name == "report-flush"
+                   for thread in threading.enumerate())
+    rows: list = report_rows(tmp_path)
+    assert rows[3:5] == ['01;person;0.38336423;[1 2 3 4]',
+                         '01;cat;0.5;[5 6 7 8]']
+    assert len(rows) == 3 + 10 + 4
+    assert rows[-4:] == ["Number of detected object: 10",
+                         "Elapsed time: 1.5", "Approximate FPS: 20.0",
+                         "Frames: 5"]
+
+
+def test_records_are_flushed_when_file_is_closed(tmp_path, monkeypatch):
+    """"
+        @brief Records added after the overview are written when the
+        report file is closed
+    """
+    monkeypatch.chdir(tmp_path)
+    report_generator: ReportGenerator = ReportGenerator(
+        flush_size=1000, flush_interval=60.0)
+    report_generator.create_results_dir(histograms=False)
+    report_generator.create_report()
+    report_generator.add_record(7, 'dog', numpy.float32(0.75),
+                                numpy.array([1, 2, 3, 4]))
+    report_generator.close_file()
+
+    assert report_rows(tmp_path)[-1] == '07;dog;0.75;[1 2 3 4]'
@@ -0,0 +1,124 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import threading
+
+from object_recognition_processing.frame_pipeline import FramePipeline
+
+
+def pipeline_threads() -> list:
+    """"
+        :return list
+
+        @brief Function which returns running pipeline worker threads
+    """
+    return [thread for thread in threading.enumerate()
+            if thread.name.startswith("pipeline-")]
+
+
+def batch_source(batches: int):
+    """"
+        :param batches: int, number of produced batches
+        :return callable
+
+        @brief Function which returns pipeline source producing numbered
+        batches and the list of all produced batches
+    """
+    produced: list = []
+
+    def source(_) -> list:
+        if len(produced) >= batches:
+            return None
+        produced.append([len(produced)])
+        return produced[-1]
+
+    return source, produced
+
+
+def test_batches_pass_stages_in_order():
+    """"
+        @brief Batches pass all stages in their original order and all
+        workers have exited when run returns
+    """
+    (source, _) = batch_source(20)
+    sunk: list = []
+    pipeline: FramePipeline = FramePipeline(queue_size=2)
+    pipeline.add_stage("double", lambda batch: [item * 2 for item in batch])
+    pipeline.add_stage("increment", lambda batch: [item + 1
+                                                   for item in batch])
+    pipeline.run(source, sunk.append)
+
+    assert sunk == [[number * 2 + 1] for number in range(20)]
+    assert not pipeline_threads()
+
+
+def test_failing_stage_releases_batch():
+    """"
+        @brief Batch dropped by a failing stage is released, the other
+        batches are processed
+    """
+    (source, _) = batch_source(5)
+    sunk: list = []
+    released: list = []
+
+    def stage(batch: list) -> list:
+        if batch == [2]:
+            raise ValueError("broken frame")
+        return batch
+
+    pipeline: FramePipeline = FramePipeline()
+    pipeline.add_stage("inference", stage)
+    pipeline.run(source, sunk.append, released.append)
+
+    assert sunk == [[0], [1], [3], [4]]
+    assert released == [[2]]
+
+
+def test_stop_releases_queued_batches():
+    """"
+        @brief When sink stops the pipeline, every produced batch is
+        either consumed by the sink or released
+    """
+    (source, produced) = batch_source(1000)
+    sunk: list = []
+    released: list = []
+    pipeline: FramePipeline = FramePipeline(queue_size=4)
+    pipeline.add_stage("inference", lambda batch: batch)
+    pipeline.add_stage("annotation", lambda batch: batch)
+    pipeline.run(source, lambda batch: sunk.append(batch) or len(sunk) < 3,
+                 released.extend)
+
+    assert not pipeline_threads()
+    assert len(sunk) == 3
+    assert sorted(item for batch in sunk for item in batch) + \
+        sorted(released) == [number for (number,) in produced]
+
+
+def test_stop_event_ends_waiting_source():
+    """"
+        @brief Source waiting for frames receives stop event of the
+        pipeline, so stopping does not hang when no frames come
+    """
+    calls: list = []
+
+    def source(stop_event: threading.Event) -> list:
+        calls.append(stop_event)
+        if len(calls) == 1:
+            return [0]
+        # camera without frames, waiting until pipeline stops
+        stop_event.wait()
+        return None
+
+    pipeline: FramePipeline = FramePipeline()
+    runner: threading.Thread = threading.Thread(
+        target=pipeline.run, args=(source, lambda batch: False),
+        daemon=True)
+    runner.start()
+    runner.join(timeout=5.0)
+
+    assert not runner.is_alive()
+    assert not pipeline_threads()
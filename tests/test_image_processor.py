@@ -0,0 +1,147 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import numpy
+import pytest
+
+from image_and_video_prosessors.image_processor import ImageProcessing
+
+
+# pylint: disable=R0903
+class BatchNetwork:
+    """"
+        @brief Stand-in network returning given rows for every forward
+        pass, as SSD networks do for a batch blob
+    """
+
+    def __init__(self, rows: list):
+        """"
+            :param rows: list, detection rows of 7 values
+
+            @brief Class instantiation: setup of class attributes
+        """
+        self.rows: numpy.ndarray = numpy.array(rows, dtype=numpy.float32)
+        self.blob_shape: tuple = None
+
+    def setInput(self, blob: numpy.ndarray) -> None:
+        """"
+            :param blob: numpy.ndarray, network input
+
+            @brief Method in which shape of network input is kept
+        """
+        self.blob_shape = blob.shape
+
+    def forward(self) -> numpy.ndarray:
+        """"
+            @brief Method which returns rows in (1, 1, N, 7) shape
+        """
+        return self.rows.reshape(1, 1, -1, 7)
+
+
+def prepared_model(tmp_path, monkeypatch, *argv) -> ImageProcessing:
+    """"
+        :param argv: command line arguments
+        :return ImageProcessing
+
+        @brief Function which returns model with parsed arguments and
+        without loaded network
+    """
+    monkeypatch.chdir(tmp_path)
+    model: ImageProcessing = ImageProcessing()
+    model._prepare_arguments(list(argv))
+
+    return model
+
+
+def blob_detections(crops: list) -> list:
+    """"
+        :param crops: list, crop images
+        :return list of numpy.ndarray
+
+        @brief Stand-in detection function which finds the white
+        rectangle of every crop and reports it as a person with
+        confidence 0.9 and as a cat with confidence 0.6, confidence is
+        lower in crops smaller than the whole frame
+    """
+    detections: list = []
+    for position, crop in enumerate(crops):
+        (rows, columns) = numpy.nonzero(crop[:, :, 0])
+        if not len(rows):
+            detections.append(numpy.empty((1, 1, 0, 7), numpy.float32))
+            continue
+        (height, width) = crop.shape[:2]
+        box: list = [columns.min() / width, rows.min() / height,
+                     (columns.max() + 1) / width, (rows.max() + 1) / height]
+        penalty: float = 0.0 if position == 0 else 0.1
+        detections.append(numpy.array(
+            [[0, 15, 0.9 - penalty] + box, [0, 8, 0.6 - penalty] + box],
+            dtype=numpy.float32).reshape(1, 1, 2, 7))
+
+    return detections
+
+
+def test_batch_output_is_split_by_image_id(tmp_path, monkeypatch):
+    """"
+        @brief Rows of a batched forward pass are returned per image in
+        their original order, image without rows gets an empty array
+    """
+    model: ImageProcessing = prepared_model(tmp_path, monkeypatch)
+    model._net = BatchNetwork([[1, 15, 0.9, 0.1, 0.1, 0.2, 0.2],
+                               [0, 8, 0.8, 0.3, 0.3, 0.4, 0.4],
+                               [1, 7, 0.7, 0.5, 0.5, 0.6, 0.6],
+                               [0, 12, 0.6, 0.7, 0.7, 0.8, 0.8]])
+    images: list = [numpy.zeros((60, 80, 3), dtype=numpy.uint8)
+                    for _ in range(3)]
+
+    detections: list = model._get_batch_detections(images)
+
+    assert model._net.blob_shape[0] == 3
+    assert [item.shape for item in detections] == \
+        [(1, 1, 2, 7), (1, 1, 2, 7), (1, 1, 0, 7)]
+    assert detections[0][0, 0, :, 1].tolist() == [8, 12]
+    assert detections[1][0, 0, :, 1].tolist() == [15, 7]
+
+
+@pytest.mark.parametrize("tiles", [("2", "1"), ("2", "2")])
+def test_tiles_are_merged_per_class(tmp_path, monkeypatch, tiles):
+    """"
+        @brief Object found in the whole frame and in overlapping tiles
+        is reported once per class with the best confidence, boxes of
+        different classes at the same place are not suppressed
+    """
+    model: ImageProcessing = prepared_model(
+        tmp_path, monkeypatch, '--tiles', *tiles, '--confidence', '0.3')
+    image: numpy.ndarray = numpy.zeros((100, 200, 3), dtype=numpy.uint8)
+    # object lies in the overlap of the tiles
+    image[45:55, 95:105] = 255
+
+    (detections,) = model._get_region_detections([image], blob_detections)
+    rows: numpy.ndarray = detections.reshape(-1, 7)
+
+    assert sorted(rows[:, 1].tolist()) == [8, 15]
+    assert sorted(rows[:, 2].tolist()) == pytest.approx([0.6, 0.9])
+    boxes: numpy.ndarray = rows[:, 3:7] * [200, 100, 200, 100]
+    assert boxes == pytest.approx(numpy.array([[95, 45, 105, 55]] * 2),
+                                  abs=1.0)
+
+
+def test_distinct_objects_of_a_class_are_kept(tmp_path, monkeypatch):
+    """"
+        @brief Two separate objects of the same class found in different
+        tiles are both kept
+    """
+    model: ImageProcessing = prepared_model(
+        tmp_path, monkeypatch, '--tiles', '2', '1', '--confidence', '0.3')
+    rows: numpy.ndarray = numpy.array(
+        [[0, 15, 0.9, 0.05, 0.1, 0.15, 0.5],
+         [0, 15, 0.8, 0.80, 0.1, 0.95, 0.5],
+         [0, 15, 0.7, 0.06, 0.1, 0.16, 0.5]], dtype=numpy.float32)
+
+    kept: numpy.ndarray = model._ImageProcessing__suppress_duplicates(
+        rows, (100, 200, 3))
+
+    assert kept[:, 2].tolist() == pytest.approx([0.9, 0.8])
@@ -0,0 +1,88 @@
+"""
+author: Monika Marinova
+version: 1.0
+date: 10.12.2019
+python version: 3.6
+openCV version: 4.7.12
+"""
+import cv2
+import numpy
+import pytest
+
+from image_and_video_prosessors.shared_frame_ring import \
+    CaptureProcessSource, SharedFrameRing
+
+
+@pytest.fixture
+def ring():
+    """"
+        @brief Fixture of a ring with three slots of a small frame
+    """
+    frame_ring: SharedFrameRing = SharedFrameRing(3, 4 * 6 * 3)
+    yield frame_ring
+    frame_ring.close()
+
+
+def test_slots_are_exhausted_and_reused(ring: SharedFrameRing):
+    """"
+        @brief Every slot is acquired once, no slot is free until one
+        is released, the released slot is acquired again
+    """
+    slots: list = [ring.acquire(timeout=1.0) for _ in range(3)]
+
+    assert sorted(slots) == [0, 1, 2]
+    assert ring.acquire(timeout=0.05) is None
+
+    frame: numpy.ndarray = numpy.full((4, 6, 3), 7, dtype=numpy.uint8)
+    ring.write(slots[1], frame, 1, 0.5)
+    ring.release(slots[1])
+
+    assert ring.acquire(timeout=1.0) == slots[1]
+    assert ring.acquire(timeout=0.05) is None
+
+
+def test_slot_is_free_after_last_reader(ring: SharedFrameRing):
+    """"
+        @brief Slot written for two readers is free only after both
+        released it, frame and metadata are read back unchanged
+    """
+    slots: list = [ring.acquire(timeout=1.0) for _ in range(3)]
+    frame: numpy.ndarray = numpy.arange(4 * 6 * 3, dtype=numpy.uint8) \
+        .reshape(4, 6, 3)
+    ring.write(slots[0], frame, 42, 1.25, readers=2)
+
+    assert numpy.array_equal(ring.frame(slots[0]), frame)
+    assert ring.metadata(slots[0]) == (42, 1.25)
+
+    ring.release(slots[0])
+    assert ring.acquire(timeout=0.05) is None
+    ring.release(slots[0])
+    assert ring.acquire(timeout=1.0) == slots[0]
+
+
+def test_capture_process_reads_all_frames(tmp_path):
+    """"
+        @brief Frames decoded by capture process are read in order, their
+        slots are released and end of source is reported once
+    """
+    for index in range(6):
+        cv2.imwrite(str(tmp_path / "{:02d}.png".format(index)),
+                    numpy.full((8, 10, 3), index, dtype=numpy.uint8))
+
+    source: CaptureProcessSource = CaptureProcessSource(
+        str(tmp_path), 8 * 10 * 3, slots=2).start()
+    values: list = []
+    try:
+        while True:
+            frame = source.read()
+            if frame is None:
+                break
+            if not isinstance(frame, numpy.ndarray):
+                # capture process is still starting
+                continue
+            values.append(int(frame[0, 0, 0]))
+            source.frame_release()()
+    finally:
+        source.stop()
+
+    assert values == list(range(6))